@@ -1,12 +1,18 @@
 from app.bootstrap.container import AppContainer, build_container
 from app.bootstrap.logging import configure_logging, install_asyncio_exception_handler
+from app.bootstrap.redis_check import redis_is_reachable
+from app.bootstrap.scheduler import DailyTrigger, IntervalTrigger, Scheduler
 from app.bootstrap.settings import AppSettings, load_settings
 
 __all__ = [
     "AppContainer",
     "AppSettings",
+    "DailyTrigger",
+    "IntervalTrigger",
+    "Scheduler",
     "build_container",
     "configure_logging",
     "install_asyncio_exception_handler",
     "load_settings",
+    "redis_is_reachable",
 ]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from redis.asyncio import Redis
+
+
+async def redis_is_reachable(redis_url: str) -> bool:
+    """Ping Redis once; used before starting workers that cannot run without it."""
+    redis = Redis.from_url(redis_url)
+    try:
+        await redis.ping()
+        return True
+    except Exception:
+        return False
+    finally:
+        await redis.aclose()
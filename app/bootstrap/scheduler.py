@@ -0,0 +1,265 @@
+"""Single-task async scheduler for the periodic jobs of one process."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import Awaitable, Callable, Protocol
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for one sleep, so clock jumps and runs recorded by another
+# process are noticed without waiting for a far-away fire time.
+MAX_SLEEP_SECONDS = 300.0
+
+
+class JobStore(Protocol):
+    async def get_last_run(self, job_name: str) -> datetime | None: ...
+
+    async def set_last_run(self, job_name: str, run_at: datetime) -> None: ...
+
+
+class Leadership(Protocol):
+    def campaign(self, name: str) -> None: ...
+
+    def is_leader(self, name: str) -> bool: ...
+
+
+@dataclass(frozen=True)
+class IntervalTrigger:
+    seconds: float
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def initial_due(self, now: datetime, misfire_grace_seconds: float | None) -> datetime:
+        return now
+
+
+@dataclass(frozen=True)
+class DailyTrigger:
+    hour: int
+    minute: int = 0
+    tz: tzinfo = timezone.utc
+
+    def next_after(self, moment: datetime) -> datetime:
+        local = moment.astimezone(self.tz)
+        fire_at = time(self.hour, self.minute)
+        candidate = datetime.combine(local.date(), fire_at, tzinfo=self.tz)
+        if candidate <= local:
+            candidate = datetime.combine(local.date() + timedelta(days=1), fire_at, tzinfo=self.tz)
+        return candidate
+
+    def initial_due(self, now: datetime, misfire_grace_seconds: float | None) -> datetime:
+        # Without history a fire time still inside the grace window counts as missed.
+        return self.next_after(now - timedelta(seconds=misfire_grace_seconds or 0))
+
+
+Trigger = IntervalTrigger | DailyTrigger
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], Awaitable[object]]
+    trigger: Trigger
+    jitter_seconds: float = 0.0
+    # Overdue runs older than this are skipped instead of run late; None runs them anyway.
+    misfire_grace_seconds: float | None = None
+    due_at: datetime | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class Scheduler:
+    """Run registered jobs from one background task.
+
+    The last run of every job is kept in ``store``, so a restart neither
+    repeats a daily job that already ran nor forgets one that was missed.
+    Missed fire times are coalesced into a single run. A job is never run
+    concurrently with itself, and its last run is re-read from the store
+    right before it starts, so processes sharing a job name and a store do
+    not both run the same fire time.
+
+    With ``leadership`` every job is run only by the process currently
+    leading it. Call :meth:`wake` when leadership changes, so a new leader
+    picks up overdue runs at once.
+    """
+
+    def __init__(
+        self,
+        store: JobStore | None = None,
+        *,
+        leadership: Leadership | None = None,
+        now: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.store = store
+        self.leadership = leadership
+        self._now = now
+        self._sleep = sleep
+        self._jobs: dict[str, ScheduledJob] = {}
+        self._last_runs: dict[str, datetime] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def jobs(self) -> list[ScheduledJob]:
+        return list(self._jobs.values())
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[object]],
+        trigger: Trigger,
+        *,
+        jitter_seconds: float = 0.0,
+        misfire_grace_seconds: float | None = None,
+    ) -> ScheduledJob:
+        if name in self._jobs:
+            raise ValueError(f"Задача {name!r} уже зарегистрирована")
+        job = ScheduledJob(
+            name=name,
+            func=func,
+            trigger=trigger,
+            jitter_seconds=jitter_seconds,
+            misfire_grace_seconds=misfire_grace_seconds,
+        )
+        self._jobs[name] = job
+        if self.leadership is not None:
+            self.leadership.campaign(name)
+        self.wake()
+        return job
+
+    def wake(self) -> None:
+        """Re-check due jobs now, e.g. after this process became a leader."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.exception("Ошибка при остановке задачи планировщика")
+
+    async def run_forever(self) -> None:
+        self._wakeup = asyncio.Event()
+        while True:
+            # Cleared first, so a job finishing while pending jobs start still wakes us.
+            self._wakeup.clear()
+            await self.run_pending()
+            sleeper = asyncio.ensure_future(self._sleep(self._seconds_until_next()))
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait({sleeper, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                sleeper.cancel()
+                waiter.cancel()
+
+    async def run_pending(self) -> None:
+        """Start every job that is due now."""
+        now = self._now()
+        for job in self._jobs.values():
+            if job.task is not None and not job.task.done():
+                continue
+            if not self._is_leading(job):
+                # A follower forgets the due time; it is re-read from the store on takeover.
+                job.due_at = None
+                continue
+            if job.due_at is None:
+                job.due_at = await self._compute_due(job, now)
+            if job.due_at <= now:
+                job.task = asyncio.create_task(self._run_job(job))
+
+    def _seconds_until_next(self) -> float:
+        now = self._now()
+        pending = [
+            job.due_at
+            for job in self._jobs.values()
+            if job.due_at is not None and (job.task is None or job.task.done()) and self._is_leading(job)
+        ]
+        if not pending:
+            return MAX_SLEEP_SECONDS
+        return max(0.0, min(MAX_SLEEP_SECONDS, (min(pending) - now).total_seconds()))
+
+    async def _compute_due(self, job: ScheduledJob, now: datetime) -> datetime:
+        last_run = await self._get_last_run(job.name)
+        if last_run is None:
+            due = job.trigger.initial_due(now, job.misfire_grace_seconds)
+        else:
+            due = job.trigger.next_after(last_run)
+        if job.misfire_grace_seconds is not None and (now - due).total_seconds() > job.misfire_grace_seconds:
+            logger.info("Задача %s пропущена: время запуска %s истекло", job.name, due.isoformat())
+            due = job.trigger.next_after(now)
+        if job.jitter_seconds > 0:
+            due += timedelta(seconds=random.uniform(0, job.jitter_seconds))
+        return due
+
+    async def _run_job(self, job: ScheduledJob) -> None:
+        try:
+            # Another process may have run this job since its due time was computed.
+            last_run = await self._get_last_run(job.name)
+            now = self._now()
+            if last_run is not None and job.trigger.next_after(last_run) > now:
+                return
+            if not self._is_leading(job):
+                return
+            try:
+                await job.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Ошибка задачи планировщика %s", job.name)
+            await self._set_last_run(job.name, now)
+        finally:
+            job.due_at = None
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def _is_leading(self, job: ScheduledJob) -> bool:
+        return self.leadership is None or self.leadership.is_leader(job.name)
+
+    async def _get_last_run(self, job_name: str) -> datetime | None:
+        if self.store is None:
+            return self._last_runs.get(job_name)
+        try:
+            return await self.store.get_last_run(job_name)
+        except Exception:
+            logger.exception("Не удалось прочитать время последнего запуска %s", job_name)
+            return self._last_runs.get(job_name)
+
+    async def _set_last_run(self, job_name: str, run_at: datetime) -> None:
+        self._last_runs[job_name] = run_at
+        if self.store is None:
+            return
+        try:
+            await self.store.set_last_run(job_name, run_at)
+        except Exception:
+            logger.exception("Не удалось сохранить время последнего запуска %s", job_name)
+
+
+__all__ = [
+    "DailyTrigger",
+    "IntervalTrigger",
+    "JobStore",
+    "Leadership",
+    "ScheduledJob",
+    "Scheduler",
+]
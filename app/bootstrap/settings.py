@@ -17,6 +17,8 @@ class AppSettings:
     google_credentials_file: str
     google_token_file: str
     database_url: str
+    database_pool_size: int
+    database_busy_timeout_ms: int
     admin_username: str
     admin_password: str
     admin_ids_tg: str
@@ -36,6 +38,8 @@ def load_settings() -> AppSettings:
         google_credentials_file=legacy_config.GOOGLE_CREDENTIALS_FILE,
         google_token_file=legacy_config.GOOGLE_TOKEN_FILE,
         database_url=legacy_config.DATABASE_URL,
+        database_pool_size=legacy_config.DATABASE_POOL_SIZE,
+        database_busy_timeout_ms=legacy_config.DATABASE_BUSY_TIMEOUT_MS,
         admin_username=legacy_config.ADMIN_USERNAME,
         admin_password=legacy_config.ADMIN_PASSWORD,
         admin_ids_tg=legacy_config.ADMIN_IDS_TG,
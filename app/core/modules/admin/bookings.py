@@ -141,6 +141,7 @@ async def load_admin_booking_detail(
     extract_contact_details,
     normalize_phone,
     client_repo,
+    get_booking_contact=None,
 ) -> AdminBookingDetailResult:
     if not is_calendar_available():
         return AdminBookingDetailResult(
@@ -179,7 +180,14 @@ async def load_admin_booking_detail(
     except Exception:
         pass
 
-    contact = extract_contact_details(description)
+    contact = None
+    if get_booking_contact is not None:
+        try:
+            contact = await get_booking_contact(event_id)
+        except Exception:
+            contact = None
+    if contact is None:
+        contact = extract_contact_details(description)
 
     chat_target_user_id = contact.get("telegram_id")
     if not chat_target_user_id:
@@ -226,27 +234,14 @@ async def load_admin_booking_detail(
     )
 
 
-async def cancel_admin_booking_event(*, event_id: str, is_calendar_available, list_events, delete_event) -> str:
+async def cancel_admin_booking_event(*, event_id: str, is_calendar_available, list_linked_event_ids, delete_event) -> str:
     if not is_calendar_available():
         return "calendar_unavailable"
 
-    now = datetime.now()
-    period_start = now - timedelta(days=30)
-    period_end = now + timedelta(days=365)
-
     try:
         try:
-            all_events = await list_events(period_start, period_end, max_results=250)
-            marker = f"Связано с событием: {event_id}"
-            linked_events = [
-                event for event in all_events
-                if marker in (event.get("description") or "")
-                and "Service ID: 9" in (event.get("description") or "")
-            ]
-            for linked in linked_events:
-                linked_id = linked.get("id")
-                if linked_id:
-                    await delete_event(linked_id)
+            for linked_id in await list_linked_event_ids(event_id):
+                await delete_event(linked_id)
         except Exception:
             pass
 
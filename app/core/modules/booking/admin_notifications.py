@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import html
+import re
 from dataclasses import dataclass
+from datetime import datetime
 
 from config import VK_GROUP_ID
 from app.core.modules.booking.presentation import (
@@ -27,6 +30,11 @@ class VkAdminNotification:
     text: str
 
 
+@dataclass
+class TelegramAdminAlert:
+    text: str
+
+
 def build_telegram_booking_admin_notification(
     *,
     summary: dict,
@@ -89,3 +97,30 @@ def build_vk_booking_admin_notification(
             contact_line=contact_line,
         ),
     )
+
+
+def build_failed_booking_admin_notifications(
+    *,
+    title: str,
+    start_time: datetime,
+    end_time: datetime,
+    description: str,
+    error: str,
+) -> tuple[TelegramAdminAlert, VkAdminNotification]:
+    """Alert for a confirmed booking that never reached the calendar; its slot is already released."""
+    details = re.sub(r"<[^>]+>", "", description or "").strip()
+    lines = [
+        "Бронь не попала в календарь, слот снова свободен.",
+        "Клиенту бронь уже подтверждена — свяжитесь с ним.",
+        "",
+        f"Событие: {title}",
+        f"Время: {start_time:%d.%m.%Y %H:%M}–{end_time:%H:%M}",
+        f"Ошибка: {error}",
+    ]
+    if details:
+        lines += ["", details]
+    text = "\n".join(lines)
+    return (
+        TelegramAdminAlert(text=f"⚠️ <b>{html.escape(lines[0])}</b>\n" + html.escape("\n".join(lines[1:]))),
+        VkAdminNotification(text=f"⚠️ {text}"),
+    )
@@ -1,17 +1,19 @@
-﻿from datetime import date, datetime, timedelta
+﻿from datetime import date, datetime, time, timedelta
 
 try:
-    from app.integrations.local.calendar.service import GoogleCalendarService
-    from app.integrations.local.calendar.freebusy import compute_free_slots
+    from app.integrations.local.calendar.service import GoogleCalendarService, get_calendar_service
     from zoneinfo import ZoneInfo
     CALENDAR_AVAILABLE = True
 except ImportError:
     GoogleCalendarService = None
-    compute_free_slots = None
+    get_calendar_service = None
     ZoneInfo = None
     CALENDAR_AVAILABLE = False
 
 
+SLOT_HELD_MESSAGE = "Это время уже выбрано другим клиентом. Пожалуйста, выберите другое."
+
+
 def build_default_time_slots(duration_minutes: int = 60, all_day: bool = False) -> list[dict]:
     time_slots = []
     hour = 9
@@ -38,77 +40,77 @@ def build_default_time_slots(duration_minutes: int = 60, all_day: bool = False)
     return time_slots
 
 
+def _without_held(
+    slots: list[tuple[datetime, datetime]],
+    holds: list[tuple[datetime, datetime]],
+) -> list[tuple[datetime, datetime]]:
+    return [
+        (slot_start, slot_end)
+        for slot_start, slot_end in slots
+        if not any(slot_start < hold_end and slot_end > hold_start for hold_start, hold_end in holds)
+    ]
+
+
+def _parse_booking_interval(booking_data: dict, default_duration_minutes: int) -> tuple[datetime, int] | None:
+    if not booking_data.get("date") or not booking_data.get("time"):
+        return None
+    selected_date = datetime.strptime(booking_data["date"], "%Y-%m-%d").date()
+    start_str = booking_data["time"].split(" - ")[0].strip()
+    start_dt = datetime.combine(selected_date, datetime.strptime(start_str, "%H:%M").time())
+    return start_dt, int(booking_data.get("duration") or default_duration_minutes)
+
+
+def _free_slots_for_day(
+    busy_index,
+    target_date: date,
+    tz,
+    duration_minutes: int,
+    all_day: bool,
+) -> list[tuple[datetime, datetime]]:
+    work_start = datetime.strptime("09:00", "%H:%M").time()
+    work_end = datetime.strptime("21:00", "%H:%M").time()
+    day_start = datetime.combine(target_date, work_start, tzinfo=tz)
+    day_end = datetime.combine(target_date, work_end, tzinfo=tz)
+    slot_minutes = max(60, int(duration_minutes or 60))
+    step_minutes = 60
+    min_slot_minutes = 60
+
+    return busy_index.free_slots(
+        day_start,
+        day_end,
+        slot_minutes=min_slot_minutes if all_day else slot_minutes,
+        step_minutes=step_minutes,
+        all_day=all_day,
+    )
+
+
 async def get_time_slots_for_date(
     target_date: date,
     service_id: int,
     service_name: str | None,
     duration_minutes: int = 60,
     all_day: bool = False,
+    holder: str | None = None,
 ) -> tuple[list[dict], bool, str | None]:
     if CALENDAR_AVAILABLE and GoogleCalendarService:
         try:
-            calendar_service = GoogleCalendarService()
-            work_start = datetime.strptime("09:00", "%H:%M").time()
-            work_end = datetime.strptime("21:00", "%H:%M").time()
-            day_start = datetime.combine(target_date, work_start)
-            day_end = datetime.combine(target_date, work_end)
-            events = await calendar_service.list_events(day_start, day_end)
-
-            busy = []
-            for event in events:
-                start = event.get("start")
-                end = event.get("end")
-                if not start or not end:
-                    continue
-                if start.tzinfo is None:
-                    start = start.replace(tzinfo=ZoneInfo(calendar_service.time_zone))
-                if end.tzinfo is None:
-                    end = end.replace(tzinfo=ZoneInfo(calendar_service.time_zone))
-                busy.append((start, end))
-
+            calendar_service = get_calendar_service()
+            busy_index = await calendar_service.get_busy_index()
             tz = ZoneInfo(calendar_service.time_zone)
-            day_start = datetime.combine(target_date, work_start, tzinfo=tz)
-            day_end = datetime.combine(target_date, work_end, tzinfo=tz)
-            slot_minutes = max(60, int(duration_minutes or 60))
-            step_minutes = 60
-            min_slot_minutes = 60
-
-            def _overlap_count(start: datetime, end: datetime, intervals: list[tuple[datetime, datetime]]) -> int:
-                count = 0
-                for b_start, b_end in intervals:
-                    if start < b_end and end > b_start:
-                        count += 1
-                return count
-
-            def _generate_slots():
-                slots = []
-                cursor = day_start
-                while cursor + timedelta(minutes=min_slot_minutes) <= day_end:
-                    slot_end = day_end if all_day else cursor + timedelta(minutes=slot_minutes)
-                    slots.append((cursor, slot_end))
-                    cursor += timedelta(minutes=step_minutes)
-                return slots
-
-            filtered = []
-            if all_day:
-                for slot_start, slot_end in _generate_slots():
-                    if _overlap_count(slot_start, slot_end, busy) > 0:
-                        continue
-                    filtered.append(
-                        {"start_time": slot_start.time(), "end_time": slot_end.time(), "is_available": True}
-                    )
-            else:
-                slots = compute_free_slots(
-                    busy,
-                    day_start,
-                    day_end,
-                    slot_minutes=slot_minutes,
-                    step_minutes=step_minutes,
-                )
-                for slot_start, slot_end in slots:
-                    filtered.append(
-                        {"start_time": slot_start.time(), "end_time": slot_end.time(), "is_available": True}
-                    )
+            slots = _free_slots_for_day(
+                busy_index,
+                target_date,
+                tz,
+                duration_minutes,
+                all_day,
+            )
+            day_start = datetime.combine(target_date, time.min, tzinfo=tz)
+            holds = await calendar_service.list_holds(day_start, day_start + timedelta(days=1), exclude_holder=holder)
+            slots = _without_held(slots, holds)
+            filtered = [
+                {"start_time": slot_start.time(), "end_time": slot_end.time(), "is_available": True}
+                for slot_start, slot_end in slots
+            ]
             return filtered, True, None
         except Exception as e:
             return build_default_time_slots(duration_minutes, all_day=all_day), False, str(e)
@@ -116,18 +118,55 @@ async def get_time_slots_for_date(
     return build_default_time_slots(duration_minutes, all_day=all_day), False, None
 
 
+async def get_availability_for_range(
+    start: date,
+    days: int,
+    duration_minutes: int = 60,
+    all_day: bool = False,
+    holder: str | None = None,
+) -> dict[date, int] | None:
+    """Free slot counts for ``days`` dates from ``start``, computed in one pass.
+
+    Returns ``None`` when the calendar is unavailable, so callers can fall
+    back to an unmarked date picker.
+    """
+    if not (CALENDAR_AVAILABLE and GoogleCalendarService):
+        return None
+
+    try:
+        calendar_service = get_calendar_service()
+        busy_index = await calendar_service.get_busy_index()
+        tz = ZoneInfo(calendar_service.time_zone)
+        range_start = datetime.combine(start, time.min, tzinfo=tz)
+        holds = await calendar_service.list_holds(
+            range_start,
+            range_start + timedelta(days=max(0, days)),
+            exclude_holder=holder,
+        )
+        availability = {}
+        for offset in range(max(0, days)):
+            target_date = start + timedelta(days=offset)
+            availability[target_date] = len(
+                _without_held(_free_slots_for_day(busy_index, target_date, tz, duration_minutes, all_day), holds)
+            )
+        return availability
+    except Exception:
+        return None
+
+
 async def is_booking_available(
     target_date: date,
     start_time: datetime,
     duration_minutes: int,
     service_id: int,
     service_name: str | None,
+    holder: str | None = None,
 ) -> tuple[bool, str | None]:
     if not (CALENDAR_AVAILABLE and GoogleCalendarService):
         return True, None
 
     try:
-        calendar_service = GoogleCalendarService()
+        calendar_service = get_calendar_service()
         tz = ZoneInfo(calendar_service.time_zone)
         work_start = datetime.strptime("09:00", "%H:%M").time()
         work_end = datetime.strptime("21:00", "%H:%M").time()
@@ -135,34 +174,55 @@ async def is_booking_available(
         day_end = datetime.combine(target_date, work_end, tzinfo=tz)
         if start_time.tzinfo is None:
             start_time = start_time.replace(tzinfo=tz)
-        events = await calendar_service.list_events(day_start, day_end)
-
-        busy = []
-        for event in events:
-            start = event.get("start")
-            end = event.get("end")
-            if not start or not end:
-                continue
-            if start.tzinfo is None:
-                start = start.replace(tzinfo=ZoneInfo(calendar_service.time_zone))
-            if end.tzinfo is None:
-                end = end.replace(tzinfo=ZoneInfo(calendar_service.time_zone))
-            busy.append((start, end))
-
-        def _overlap_count(start: datetime, end: datetime, intervals: list[tuple[datetime, datetime]]) -> int:
-            count = 0
-            for b_start, b_end in intervals:
-                if start < b_end and end > b_start:
-                    count += 1
-            return count
+        busy_index = await calendar_service.get_busy_index()
 
         end_time = start_time + timedelta(minutes=duration_minutes)
         if start_time < day_start or end_time > day_end:
             return False, "Выбранный интервал выходит за пределы рабочего времени."
 
-        if _overlap_count(start_time, end_time, busy) > 0:
+        if busy_index.is_busy(start_time, end_time):
             return False, "Выбранное время уже занято другим событием в календаре."
 
+        if await calendar_service.list_holds(start_time, end_time, exclude_holder=holder):
+            return False, SLOT_HELD_MESSAGE
+
         return True, None
     except Exception:
         return True, None
+
+
+async def hold_booking_slot(
+    holder: str,
+    booking_data: dict,
+    default_duration_minutes: int = 60,
+) -> tuple[bool, str | None]:
+    """Hold the date and time in ``booking_data`` for ``holder`` until the booking is confirmed.
+
+    Like ``is_booking_available`` this lets the booking go on when the
+    calendar cannot be reached; the final reservation re-checks the slot.
+    """
+    if not (CALENDAR_AVAILABLE and GoogleCalendarService):
+        return True, None
+
+    try:
+        interval = _parse_booking_interval(booking_data, default_duration_minutes)
+        if interval is None:
+            return True, None
+        start_time, duration_minutes = interval
+        calendar_service = get_calendar_service()
+        start_time = start_time.replace(tzinfo=ZoneInfo(calendar_service.time_zone))
+        end_time = start_time + timedelta(minutes=duration_minutes)
+        if await calendar_service.hold_slot(holder, start_time, end_time):
+            return True, None
+        return False, SLOT_HELD_MESSAGE
+    except Exception:
+        return True, None
+
+
+async def release_booking_slot(holder: str) -> None:
+    if not (CALENDAR_AVAILABLE and GoogleCalendarService):
+        return
+    try:
+        await get_calendar_service().release_hold(holder)
+    except Exception:
+        pass
@@ -5,6 +5,10 @@ from datetime import datetime
 from typing import Any
 
 
+class CalendarSlotTakenError(RuntimeError):
+    pass
+
+
 @dataclass
 class CalendarCreateResult:
     created: bool
@@ -15,23 +19,31 @@ class CalendarCreateResult:
 async def create_booking_calendar_event(
     *,
     calendar_available: bool,
-    calendar_service_cls,
+    calendar_service_factory,
     title: str,
     description: str,
     start_time: datetime,
     end_time: datetime,
+    slot_holder: str | None = None,
 ) -> CalendarCreateResult:
-    if not calendar_available or not calendar_service_cls:
+    if not calendar_available or not calendar_service_factory:
         return CalendarCreateResult(created=False)
 
     try:
-        calendar_service = calendar_service_cls()
-        payload = await calendar_service.create_event(
+        calendar_service = calendar_service_factory()
+        # The Google insert happens in the outbox worker; confirm as soon as the slot is held.
+        event_id = await calendar_service.reserve_event(
             title=title,
             description=description,
             start_time=start_time,
             end_time=end_time,
+            holder=slot_holder,
         )
-        return CalendarCreateResult(created=True, payload=payload)
+        if event_id is None:
+            return CalendarCreateResult(
+                created=False,
+                error=CalendarSlotTakenError("Выбранное время уже занято другим событием в календаре."),
+            )
+        return CalendarCreateResult(created=True, payload={"id": event_id, "status": "pending"})
     except Exception as exc:
         return CalendarCreateResult(created=False, error=exc)
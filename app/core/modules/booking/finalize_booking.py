@@ -25,9 +25,10 @@ async def finalize_booking(
     event_start: datetime,
     event_end: datetime,
     calendar_available: bool,
-    calendar_service_cls,
+    calendar_service_factory,
     calendar_description: str | None = None,
     sync_client: Callable[[], Awaitable[None]] | None = None,
+    slot_holder: str | None = None,
 ) -> FinalizeBookingResult:
     summary = build_booking_summary(
         booking_data=booking_data,
@@ -41,11 +42,12 @@ async def finalize_booking(
     if calendar_description:
         calendar_result = await create_booking_calendar_event(
             calendar_available=calendar_available,
-            calendar_service_cls=calendar_service_cls,
+            calendar_service_factory=calendar_service_factory,
             title=service_name,
             description=calendar_description,
             start_time=event_start,
             end_time=event_end,
+            slot_holder=slot_holder,
         )
     else:
         calendar_result = CalendarCreateResult(created=False)
@@ -24,10 +24,11 @@ async def create_booking_use_case(
     event_start,
     event_end,
     calendar_available: bool,
-    calendar_service_cls,
+    calendar_service_factory,
     calendar_description: str | None = None,
     sync_client: Callable[[], Awaitable[None]] | None = None,
     admin_notification_builder: Callable[[dict], Any] | None = None,
+    slot_holder: str | None = None,
 ) -> CreateBookingUseCaseResult:
     finalize_result = await finalize_booking(
         booking_data=booking_data,
@@ -39,9 +40,10 @@ async def create_booking_use_case(
         event_start=event_start,
         event_end=event_end,
         calendar_available=calendar_available,
-        calendar_service_cls=calendar_service_cls,
+        calendar_service_factory=calendar_service_factory,
         calendar_description=calendar_description,
         sync_client=sync_client,
+        slot_holder=slot_holder,
     )
     summary = finalize_result.summary
     admin_notification = admin_notification_builder(summary) if admin_notification_builder else None
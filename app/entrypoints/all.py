@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import signal
 import subprocess
@@ -8,6 +9,7 @@ import time
 from pathlib import Path
 
 from app.bootstrap import configure_logging
+from config import BOTS_RUN_MODE
 
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -32,8 +34,25 @@ def _terminate_process(proc: subprocess.Popen, name: str, timeout: float = 10.0)
         proc.wait(timeout=5)
 
 
+def _run_single_process() -> int:
+    from app.interfaces.messenger.combined import main as combined_main
+
+    try:
+        logger.info("Запуск VK и Telegram ботов в одном процессе...")
+        asyncio.run(combined_main())
+        return 0
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.info("Боты остановлены")
+        return 0
+    except Exception:
+        logger.exception("Ошибка при запуске ботов в одном процессе")
+        return 1
+
+
 def run() -> int:
     configure_logging()
+    if BOTS_RUN_MODE == "single":
+        return _run_single_process()
     processes: list[tuple[str, subprocess.Popen]] = []
     stopping = False
 
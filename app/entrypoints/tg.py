@@ -6,6 +6,7 @@ import platform
 
 from app.bootstrap import configure_logging, load_settings
 from app.interfaces.messenger.tg import main as telegram_main
+from config import TG_UPDATE_MODE
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,10 @@ def run() -> int:
     if not settings.telegram_bot_token:
         logger.error("TELEGRAM_BOT_TOKEN не задан в .env")
         return 1
+    if TG_UPDATE_MODE == "webhook":
+        from app.entrypoints import tg_webhook
+
+        return tg_webhook.run()
 
     try:
         logger.info("Запуск Telegram бота...")
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+
+import uvicorn
+
+from app.bootstrap import configure_logging, load_settings, redis_is_reachable
+from config import REDIS_URL, TG_WEBHOOK_HOST, TG_WEBHOOK_PORT, TG_WEBHOOK_WORKERS
+
+logger = logging.getLogger(__name__)
+
+APP_FACTORY = "app.interfaces.messenger.tg.webhook:create_app"
+
+
+def _run_background_jobs() -> None:
+    configure_logging()
+    from app.interfaces.messenger.tg.main import run_background_jobs
+
+    try:
+        asyncio.run(run_background_jobs())
+    except KeyboardInterrupt:
+        pass
+
+
+def _start_background_jobs() -> multiprocessing.Process:
+    process = multiprocessing.get_context("spawn").Process(
+        target=_run_background_jobs,
+        name="tg-background-jobs",
+    )
+    process.start()
+    return process
+
+
+def run() -> int:
+    configure_logging()
+    settings = load_settings()
+    if not settings.telegram_bot_token:
+        logger.error("TELEGRAM_BOT_TOKEN не задан в .env")
+        return 1
+    if TG_WEBHOOK_WORKERS > 1 and not asyncio.run(redis_is_reachable(REDIS_URL)):
+        # uvicorn не перезапускает упавшие воркеры, поэтому проверяем до старта.
+        logger.error(
+            "Redis недоступен по REDIS_URL=%s: TG_WEBHOOK_WORKERS=%s требует Redis. "
+            "Запустите Redis или оставьте один воркер",
+            REDIS_URL,
+            TG_WEBHOOK_WORKERS,
+        )
+        return 1
+
+    from app.interfaces.messenger.tg.webhook import register_webhook
+
+    jobs_process = None
+    try:
+        asyncio.run(register_webhook())
+        if TG_WEBHOOK_WORKERS > 1:
+            jobs_process = _start_background_jobs()
+        logger.info(
+            "Запуск вебхука Telegram на %s:%s, воркеров: %s",
+            TG_WEBHOOK_HOST,
+            TG_WEBHOOK_PORT,
+            TG_WEBHOOK_WORKERS,
+        )
+        uvicorn.run(
+            APP_FACTORY,
+            factory=True,
+            host=TG_WEBHOOK_HOST,
+            port=TG_WEBHOOK_PORT,
+            workers=TG_WEBHOOK_WORKERS,
+            log_config=None,
+        )
+        return 0
+    except KeyboardInterrupt:
+        logger.info("Вебхук Telegram остановлен")
+        return 0
+    except Exception:
+        logger.exception("Ошибка при запуске вебхука Telegram")
+        return 1
+    finally:
+        if jobs_process is not None and jobs_process.is_alive():
+            jobs_process.terminate()
+            jobs_process.join(timeout=10)
+
+
+if __name__ == "__main__":
+    raise SystemExit(run())
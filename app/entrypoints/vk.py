@@ -5,7 +5,8 @@ import logging
 import platform
 
 from app.bootstrap import configure_logging, load_settings
-from app.interfaces.messenger.vk import build_bot, run_forever
+from app.interfaces.messenger.vk import main as vk_main
+from config import VK_UPDATE_MODE
 
 logger = logging.getLogger(__name__)
 
@@ -18,26 +19,21 @@ def _configure_event_loop_policy() -> None:
             pass
 
 
-def _build_bot_in_loop():
-    _configure_event_loop_policy()
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    bot = loop.run_until_complete(build_bot())
-    return bot, loop
-
-
 def run() -> int:
     configure_logging()
     settings = load_settings()
     if not settings.vk_bot_token:
         logger.error("VK_BOT_TOKEN/VK_GROUP_TOKEN не задан в .env")
         return 1
+    if VK_UPDATE_MODE == "callback":
+        from app.entrypoints import vk_callback
+
+        return vk_callback.run()
 
-    loop = None
     try:
         logger.info("Запуск VK бота...")
-        bot, loop = _build_bot_in_loop()
-        run_forever(bot)
+        _configure_event_loop_policy()
+        asyncio.run(vk_main())
         return 0
     except KeyboardInterrupt:
         logger.info("VK бот остановлен")
@@ -45,14 +41,6 @@ def run() -> int:
     except Exception:
         logger.exception("Ошибка при запуске VK бота")
         return 1
-    finally:
-        try:
-            if loop and loop.is_running():
-                loop.stop()
-            if loop and not loop.is_closed():
-                loop.close()
-        except Exception:
-            logger.exception("Ошибка при закрытии event loop VK бота")
 
 
 if __name__ == "__main__":
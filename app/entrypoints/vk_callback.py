@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+
+import uvicorn
+
+from app.bootstrap import configure_logging, load_settings, redis_is_reachable
+from config import REDIS_URL, VK_CALLBACK_HOST, VK_CALLBACK_PORT, VK_CALLBACK_WORKERS
+
+logger = logging.getLogger(__name__)
+
+APP_FACTORY = "app.interfaces.messenger.vk.callback:create_app"
+
+
+def _run_background_jobs() -> None:
+    configure_logging()
+    from app.interfaces.messenger.vk.main import run_background_jobs
+
+    try:
+        asyncio.run(run_background_jobs())
+    except KeyboardInterrupt:
+        pass
+
+
+def _start_background_jobs() -> multiprocessing.Process:
+    process = multiprocessing.get_context("spawn").Process(
+        target=_run_background_jobs,
+        name="vk-background-jobs",
+    )
+    process.start()
+    return process
+
+
+def run() -> int:
+    configure_logging()
+    settings = load_settings()
+    if not settings.vk_bot_token:
+        logger.error("VK_BOT_TOKEN/VK_GROUP_TOKEN не задан в .env")
+        return 1
+    if VK_CALLBACK_WORKERS > 1 and not asyncio.run(redis_is_reachable(REDIS_URL)):
+        # uvicorn не перезапускает упавшие воркеры, поэтому проверяем до старта.
+        logger.error(
+            "Redis недоступен по REDIS_URL=%s: VK_CALLBACK_WORKERS=%s требует Redis. "
+            "Запустите Redis или оставьте один воркер",
+            REDIS_URL,
+            VK_CALLBACK_WORKERS,
+        )
+        return 1
+
+    jobs_process = None
+    try:
+        if VK_CALLBACK_WORKERS > 1:
+            jobs_process = _start_background_jobs()
+        logger.info(
+            "Запуск Callback API VK на %s:%s, воркеров: %s",
+            VK_CALLBACK_HOST,
+            VK_CALLBACK_PORT,
+            VK_CALLBACK_WORKERS,
+        )
+        uvicorn.run(
+            APP_FACTORY,
+            factory=True,
+            host=VK_CALLBACK_HOST,
+            port=VK_CALLBACK_PORT,
+            workers=VK_CALLBACK_WORKERS,
+            log_config=None,
+        )
+        return 0
+    except KeyboardInterrupt:
+        logger.info("Callback API VK остановлен")
+        return 0
+    except Exception:
+        logger.exception("Ошибка при запуске Callback API VK")
+        return 1
+    finally:
+        if jobs_process is not None and jobs_process.is_alive():
+            jobs_process.terminate()
+            jobs_process.join(timeout=10)
+
+
+if __name__ == "__main__":
+    raise SystemExit(run())
@@ -1,3 +1,3 @@
-from app.integrations.local import calendar, db
+from app.integrations.local import calendar, db, invalidation
 
-__all__ = ["calendar", "db"]
+__all__ = ["calendar", "db", "invalidation"]
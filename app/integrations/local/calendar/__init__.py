@@ -1,5 +1,5 @@
 ﻿"""Calendar integration layer."""
 
-from .service import GoogleCalendarService
+from .service import GoogleCalendarService, get_calendar_service
 
-__all__ = ["GoogleCalendarService"]
+__all__ = ["GoogleCalendarService", "get_calendar_service"]
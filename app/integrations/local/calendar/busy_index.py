@@ -0,0 +1,190 @@
+"""In-process index of busy calendar intervals used for slot lookups."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+
+SLOT_CACHE_MAX_ENTRIES = 256
+SLOT_CACHE_TTL_SECONDS = 300.0
+
+
+class BusyIndex:
+    """Busy intervals of one calendar, bucketed by local day.
+
+    Every event is stored as a ``(start, end)`` pair of epoch seconds and
+    registered under each day it touches. A day's intervals are merged into
+    two sorted lists on first use, so overlap checks are a single bisect.
+    Computed slot lists are kept in a small LRU/TTL cache and dropped as soon
+    as an event touching their day changes.
+    """
+
+    def __init__(
+        self,
+        tz: ZoneInfo,
+        *,
+        slot_cache_size: int = SLOT_CACHE_MAX_ENTRIES,
+        slot_cache_ttl: float = SLOT_CACHE_TTL_SECONDS,
+    ):
+        self.tz = tz
+        self.loaded = False
+        self._events: dict[str, tuple[int, int]] = {}
+        self._day_events: dict[date, set[str]] = {}
+        self._merged: dict[date, tuple[list[int], list[int]]] = {}
+        self._slot_cache: OrderedDict[tuple, tuple[float, list[tuple[datetime, datetime]]]] = OrderedDict()
+        self._slot_cache_size = slot_cache_size
+        self._slot_cache_ttl = slot_cache_ttl
+
+    def load(self, events: Iterable[tuple[str, datetime | None, datetime | None]]) -> None:
+        self._events.clear()
+        self._day_events.clear()
+        self._merged.clear()
+        self._slot_cache.clear()
+        for event_id, start, end in events:
+            self._add(event_id, start, end)
+        self.loaded = True
+
+    def upsert(self, event_id: str, start: datetime | None, end: datetime | None) -> None:
+        self.remove(event_id)
+        self._add(event_id, start, end)
+
+    def remove(self, event_id: str) -> None:
+        interval = self._events.pop(event_id, None)
+        if interval is None:
+            return
+        for day in self._days(*interval):
+            event_ids = self._day_events.get(day)
+            if event_ids is not None:
+                event_ids.discard(event_id)
+                if not event_ids:
+                    del self._day_events[day]
+            self._invalidate_day(day)
+
+    def busy_intervals(self, day: date) -> list[tuple[datetime, datetime]]:
+        starts, ends = self._merged_for_day(day)
+        return [
+            (datetime.fromtimestamp(start, self.tz), datetime.fromtimestamp(end, self.tz))
+            for start, end in zip(starts, ends)
+        ]
+
+    def is_busy(self, start: datetime, end: datetime) -> bool:
+        start_ts = int(start.timestamp())
+        end_ts = int(end.timestamp())
+        return any(self._overlaps(day, start_ts, end_ts) for day in self._days(start_ts, end_ts))
+
+    def free_slots(
+        self,
+        day_start: datetime,
+        day_end: datetime,
+        *,
+        slot_minutes: int,
+        step_minutes: int,
+        all_day: bool = False,
+    ) -> list[tuple[datetime, datetime]]:
+        """Return free slots between ``day_start`` and ``day_end``.
+
+        Regular slots start at ``day_start`` and after each busy interval, like
+        ``freebusy.compute_free_slots``. With ``all_day`` every slot runs to
+        ``day_end`` and ``slot_minutes`` is the shortest slot offered.
+        """
+        origin = int(day_start.timestamp())
+        limit = int(day_end.timestamp())
+        day = day_start.astimezone(self.tz).date()
+        cache_key = (day, origin, limit, slot_minutes, step_minutes, all_day)
+        cached = self._slot_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._slot_cache.move_to_end(cache_key)
+            return list(cached[1])
+
+        slot_seconds = slot_minutes * 60
+        step_seconds = step_minutes * 60
+        slots: list[tuple[int, int]] = []
+
+        if all_day:
+            cursor = origin
+            while cursor + slot_seconds <= limit:
+                if not self._overlaps(day, cursor, limit):
+                    slots.append((cursor, limit))
+                cursor += step_seconds
+        else:
+            starts, ends = self._merged_for_day(day)
+            cursor = origin
+            for busy_start, busy_end in zip(starts, ends):
+                if busy_start >= limit:
+                    break
+                if cursor < busy_start:
+                    slots.extend(self._split(cursor, busy_start, slot_seconds, step_seconds))
+                cursor = max(cursor, busy_end)
+            if cursor < limit:
+                slots.extend(self._split(cursor, limit, slot_seconds, step_seconds))
+
+        result = [
+            (day_start + timedelta(seconds=start - origin), day_start + timedelta(seconds=end - origin))
+            for start, end in slots
+        ]
+        self._slot_cache[cache_key] = (time.monotonic() + self._slot_cache_ttl, result)
+        self._slot_cache.move_to_end(cache_key)
+        while len(self._slot_cache) > self._slot_cache_size:
+            self._slot_cache.popitem(last=False)
+        return list(result)
+
+    def _add(self, event_id: str, start: datetime | None, end: datetime | None) -> None:
+        if not event_id or start is None or end is None:
+            return
+        start_ts = int(start.timestamp())
+        end_ts = max(start_ts, int(end.timestamp()))
+        self._events[event_id] = (start_ts, end_ts)
+        for day in self._days(start_ts, end_ts):
+            self._day_events.setdefault(day, set()).add(event_id)
+            self._invalidate_day(day)
+
+    def _invalidate_day(self, day: date) -> None:
+        self._merged.pop(day, None)
+        for key in [key for key in self._slot_cache if key[0] == day]:
+            del self._slot_cache[key]
+
+    def _days(self, start_ts: int, end_ts: int) -> list[date]:
+        first = datetime.fromtimestamp(start_ts, self.tz).date()
+        last = datetime.fromtimestamp(max(start_ts, end_ts - 1), self.tz).date()
+        return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+    def _merged_for_day(self, day: date) -> tuple[list[int], list[int]]:
+        merged = self._merged.get(day)
+        if merged is not None:
+            return merged
+
+        intervals = sorted(self._events[event_id] for event_id in self._day_events.get(day, ()))
+        starts: list[int] = []
+        ends: list[int] = []
+        for start, end in intervals:
+            if starts and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        merged = (starts, ends)
+        self._merged[day] = merged
+        return merged
+
+    def _overlaps(self, day: date, start_ts: int, end_ts: int) -> bool:
+        starts, ends = self._merged_for_day(day)
+        # Merged intervals are disjoint, so ends are sorted as well.
+        index = bisect_right(ends, start_ts)
+        return index < len(starts) and starts[index] < end_ts
+
+    @staticmethod
+    def _split(start: int, end: int, slot_seconds: int, step_seconds: int) -> list[tuple[int, int]]:
+        slots = []
+        cursor = start
+        while cursor + slot_seconds <= end:
+            slots.append((cursor, cursor + slot_seconds))
+            cursor += step_seconds
+        return slots
+
+
+__all__ = ["BusyIndex"]
@@ -2,21 +2,167 @@ from __future__ import annotations
 
 import json
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
-import aiosqlite
+from app.integrations.local.db.database import DatabaseManager, db_manager
+from .projection import LINKED_EXTRA_SERVICE_ID, BookingProjection, parse_booking_projection
+from .search import build_match_query, extract_contact_terms
 
-from app.integrations.local.db.database import db_manager
 
+# Rewrites a cached event only when Google reports a new version of it.
+_UPSERT_CLAUSE = """
+    ON CONFLICT(event_id) DO UPDATE SET
+        calendar_id = excluded.calendar_id,
+        summary = excluded.summary,
+        description = excluded.description,
+        start_time = excluded.start_time,
+        end_time = excluded.end_time,
+        raw_event = excluded.raw_event,
+        etag = excluded.etag,
+        updated = excluded.updated,
+        search_contacts = excluded.search_contacts,
+        synced_at = CURRENT_TIMESTAMP
+    WHERE calendar_events_cache.etag IS NOT excluded.etag
+       OR calendar_events_cache.updated IS NOT excluded.updated
+       OR calendar_events_cache.calendar_id IS NOT excluded.calendar_id
+       OR (excluded.etag IS NULL AND calendar_events_cache.raw_event IS NOT excluded.raw_event)
+"""
 
-class CalendarCacheRepository:
-    def __init__(self, database_path: str):
-        self.db_path = database_path
+_PROJECTION_COLUMNS = (
+    "channel",
+    "is_primary",
+    "client_name",
+    "phone",
+    "phone10",
+    "email",
+    "tg_id",
+    "tg_username",
+    "vk_id",
+    "service_id",
+    "linked_event_id",
+)
+
+_UPSERT_PROJECTION_SQL = f"""
+    INSERT OR REPLACE INTO calendar_booking_projection (event_id, calendar_id, {", ".join(_PROJECTION_COLUMNS)})
+    VALUES (?, ?, {", ".join("?" for _ in _PROJECTION_COLUMNS)})
+"""
+
+_BOOKING_SELECT = f"""
+    SELECT c.event_id, c.summary, c.description, c.start_time, c.end_time,
+           {", ".join(f"p.{column}" for column in _PROJECTION_COLUMNS)}
+    FROM calendar_booking_projection AS p
+    JOIN calendar_events_cache AS c ON c.event_id = p.event_id
+"""
+
+
+_STAGE_COLUMNS = (
+    "event_id",
+    "calendar_id",
+    "summary",
+    "description",
+    "start_time",
+    "end_time",
+    "raw_event",
+    "etag",
+    "updated",
+    "search_contacts",
+)
+
+# Sync batches go through this table so they are merged in set-based statements.
+_CREATE_STAGE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS calendar_events_stage (
+        event_id TEXT PRIMARY KEY,
+        calendar_id TEXT NOT NULL,
+        summary TEXT,
+        description TEXT,
+        start_time TEXT,
+        end_time TEXT,
+        raw_event TEXT NOT NULL,
+        etag TEXT,
+        updated TEXT,
+        search_contacts TEXT
+    )
+"""
+
+# RETURNING lists only the events inserted or rewritten: ``_UPSERT_CLAUSE`` skips the rest.
+_MERGE_STAGE_SQL = f"""
+    INSERT INTO calendar_events_cache ({", ".join(_STAGE_COLUMNS)}, synced_at)
+    SELECT {", ".join(_STAGE_COLUMNS)}, CURRENT_TIMESTAMP
+    FROM calendar_events_stage
+    WHERE true
+    {_UPSERT_CLAUSE}
+    RETURNING event_id
+"""
+
+# Unchanged events cached before the projection table existed still need a projection row.
+_UNPROJECTED_STAGE_SQL = """
+    SELECT s.event_id
+    FROM calendar_events_stage AS s
+    WHERE NOT EXISTS (SELECT 1 FROM calendar_booking_projection AS p WHERE p.event_id = s.event_id)
+"""
+
+
+def _stage_row(calendar_id: str, row: dict) -> tuple:
+    return (
+        row["event_id"],
+        calendar_id,
+        row["summary"],
+        row["description"],
+        row["start_time"],
+        row["end_time"],
+        row["raw_event"],
+        row.get("etag"),
+        row.get("updated"),
+        extract_contact_terms(row["description"]),
+    )
+
+
+async def _stage_rows(db, stage_rows: list[tuple]) -> None:
+    await db.execute(_CREATE_STAGE_SQL)
+    await db.execute("DELETE FROM calendar_events_stage")
+    await db.executemany(
+        f"""
+        INSERT OR REPLACE INTO calendar_events_stage ({", ".join(_STAGE_COLUMNS)})
+        VALUES ({", ".join("?" for _ in _STAGE_COLUMNS)})
+        """,
+        stage_rows,
+    )
+
+
+async def _merge_stage(db, calendar_id: str, rows: list[dict]) -> int:
+    """Upsert the staged ``rows`` into the cache and project only the events that changed.
+
+    Returns how many cached events were inserted or rewritten.
+    """
+    cursor = await db.execute(_MERGE_STAGE_SQL)
+    merged = [row[0] for row in await cursor.fetchall()]
+    cursor = await db.execute(_UNPROJECTED_STAGE_SQL)
+    projected = dict.fromkeys([*merged, *(row[0] for row in await cursor.fetchall())])
+    if projected:
+        descriptions = {row["event_id"]: row["description"] for row in rows}
+        await db.executemany(
+            _UPSERT_PROJECTION_SQL,
+            [_projection_row(event_id, calendar_id, descriptions[event_id]) for event_id in projected],
+        )
+    await db.execute("DELETE FROM calendar_events_stage")
+    return len(merged)
 
-    def _ensure_db_parent_dir(self) -> None:
-        parent = Path(self.db_path).expanduser().resolve().parent
-        parent.mkdir(parents=True, exist_ok=True)
+
+def _projection_row(event_id: str, calendar_id: str, description: str | None) -> tuple:
+    projection = parse_booking_projection(description)
+    return (event_id, calendar_id, *(getattr(projection, column) for column in _PROJECTION_COLUMNS))
+
+
+def _projection_from_row(values) -> BookingProjection:
+    projection = BookingProjection(**dict(zip(_PROJECTION_COLUMNS, values)))
+    projection.is_primary = bool(projection.is_primary)
+    return projection
+
+
+class CalendarCacheRepository:
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self._search_index = False
 
     async def list_events(
         self,
@@ -27,29 +173,112 @@ class CalendarCacheRepository:
         max_results: int = 250,
         query: str | None = None,
     ) -> list[dict]:
-        sql = """
-            SELECT event_id, summary, description, start_time, end_time
-            FROM calendar_events_cache
-            WHERE calendar_id = ?
-              AND start_time IS NOT NULL
-              AND start_time >= ?
-              AND start_time < ?
+        """Cached events starting in the period, by start time.
+
+        With ``query`` the events are matched through the full-text index
+        (every word as a prefix, phones by their digits) and ordered by
+        relevance instead.
         """
+        match_query = build_match_query(query) if query else None
         params: list[Any] = [
             calendar_id,
             period_start.isoformat(),
             period_end.isoformat(),
         ]
-        if query:
-            sql += " AND (summary LIKE ? OR description LIKE ?)"
-            like_value = f"%{query}%"
-            params.extend([like_value, like_value])
+        if match_query and await self._has_search_index():
+            # Summary and contacts weigh more than the long description.
+            sql = """
+                SELECT c.event_id, c.summary, c.description, c.start_time, c.end_time
+                FROM calendar_events_fts
+                JOIN calendar_events_cache AS c ON c.rowid = calendar_events_fts.rowid
+                WHERE calendar_events_fts MATCH ?
+                  AND c.calendar_id = ?
+                  AND c.start_time IS NOT NULL
+                  AND c.start_time >= ?
+                  AND c.start_time < ?
+                ORDER BY bm25(calendar_events_fts, 2.0, 1.0, 4.0), c.start_time
+                LIMIT ?
+            """
+            params = [match_query, *params, max_results]
+        else:
+            sql = """
+                SELECT event_id, summary, description, start_time, end_time
+                FROM calendar_events_cache
+                WHERE calendar_id = ?
+                  AND start_time IS NOT NULL
+                  AND start_time >= ?
+                  AND start_time < ?
+            """
+            if query:
+                sql += " AND (summary LIKE ? OR description LIKE ?)"
+                like_value = f"%{query}%"
+                params.extend([like_value, like_value])
+            sql += " ORDER BY start_time LIMIT ?"
+            params.append(max_results)
 
-        sql += " ORDER BY start_time LIMIT ?"
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute(sql, params)
+            rows = await cursor.fetchall()
+
+        return [
+            {
+                "id": row[0],
+                "summary": row[1] or "",
+                "description": row[2] or "",
+                "start": datetime.fromisoformat(row[3]) if row[3] else None,
+                "end": datetime.fromisoformat(row[4]) if row[4] else None,
+            }
+            for row in rows
+        ]
+
+    async def _has_search_index(self) -> bool:
+        # Only a positive answer is kept: the index may be created after the first call.
+        if not self._search_index:
+            async with self.db_manager.reader() as db:
+                cursor = await db.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'calendar_events_fts'"
+                )
+                self._search_index = await cursor.fetchone() is not None
+        return self._search_index
+
+    async def list_bookings(
+        self,
+        *,
+        calendar_id: str,
+        period_start: datetime,
+        period_end: datetime,
+        channel: str | None = None,
+        primary_only: bool = False,
+        phone10: str | None = None,
+        tg_id: int | None = None,
+        vk_id: int | None = None,
+        max_results: int = 250,
+    ) -> list[dict]:
+        """Cached events starting in the period with their booking projection.
+
+        ``phone10``, ``tg_id`` and ``vk_id`` select one client's bookings: an
+        event matches when any of the given values does.
+        """
+        sql = _BOOKING_SELECT + """
+            WHERE c.calendar_id = ?
+              AND c.start_time IS NOT NULL
+              AND c.start_time >= ?
+              AND c.start_time < ?
+        """
+        params: list[Any] = [calendar_id, period_start.isoformat(), period_end.isoformat()]
+        if channel:
+            sql += " AND p.channel = ?"
+            params.append(channel)
+        if primary_only:
+            sql += " AND p.is_primary = 1"
+        owner = [(column, value) for column, value in (("phone10", phone10), ("tg_id", tg_id), ("vk_id", vk_id)) if value]
+        if owner:
+            sql += " AND (" + " OR ".join(f"p.{column} = ?" for column, _ in owner) + ")"
+            params.extend(value for _, value in owner)
+        sql += " ORDER BY c.start_time LIMIT ?"
         params.append(max_results)
 
-        self._ensure_db_parent_dir()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(sql, params)
             rows = await cursor.fetchall()
 
@@ -60,13 +289,55 @@ class CalendarCacheRepository:
                 "description": row[2] or "",
                 "start": datetime.fromisoformat(row[3]) if row[3] else None,
                 "end": datetime.fromisoformat(row[4]) if row[4] else None,
+                "booking": _projection_from_row(row[5:]),
             }
             for row in rows
         ]
 
+    async def get_booking(self, event_id: str) -> BookingProjection | None:
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute(
+                f"SELECT {', '.join(_PROJECTION_COLUMNS)} FROM calendar_booking_projection WHERE event_id = ?",
+                (event_id,),
+            )
+            row = await cursor.fetchone()
+        return _projection_from_row(row) if row else None
+
+    async def list_linked_event_ids(self, event_id: str) -> list[str]:
+        """Extra-service events booked together with ``event_id``."""
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute(
+                """
+                SELECT event_id
+                FROM calendar_booking_projection
+                WHERE linked_event_id = ? AND service_id = ?
+                """,
+                (event_id, LINKED_EXTRA_SERVICE_ID),
+            )
+            rows = await cursor.fetchall()
+        return [row[0] for row in rows]
+
+    async def list_busy_intervals(self, calendar_id: str) -> list[tuple[str, datetime | None, datetime | None]]:
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute(
+                """
+                SELECT event_id, start_time, end_time
+                FROM calendar_events_cache
+                WHERE calendar_id = ?
+                  AND start_time IS NOT NULL
+                  AND end_time IS NOT NULL
+                """,
+                (calendar_id,),
+            )
+            rows = await cursor.fetchall()
+
+        return [
+            (row[0], datetime.fromisoformat(row[1]), datetime.fromisoformat(row[2]))
+            for row in rows
+        ]
+
     async def get_event(self, event_id: str) -> dict | None:
-        self._ensure_db_parent_dir()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT raw_event
@@ -93,34 +364,35 @@ class CalendarCacheRepository:
         end_time: datetime | None,
         raw_event: dict,
     ) -> None:
-        self._ensure_db_parent_dir()
-        async with aiosqlite.connect(self.db_path) as db:
+        row = (
+            event_id,
+            calendar_id,
+            summary,
+            description,
+            start_time.isoformat() if start_time else None,
+            end_time.isoformat() if end_time else None,
+            json.dumps(raw_event, ensure_ascii=False),
+            raw_event.get("etag"),
+            raw_event.get("updated"),
+            extract_contact_terms(description),
+        )
+        projection_row = _projection_row(event_id, calendar_id, description)
+
+        async def _upsert(db) -> None:
             await db.execute(
-                """
+                f"""
                 INSERT INTO calendar_events_cache (
-                    event_id, calendar_id, summary, description, start_time, end_time, raw_event, synced_at
+                    event_id, calendar_id, summary, description, start_time, end_time,
+                    raw_event, etag, updated, search_contacts, synced_at
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(event_id) DO UPDATE SET
-                    calendar_id = excluded.calendar_id,
-                    summary = excluded.summary,
-                    description = excluded.description,
-                    start_time = excluded.start_time,
-                    end_time = excluded.end_time,
-                    raw_event = excluded.raw_event,
-                    synced_at = CURRENT_TIMESTAMP
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                {_UPSERT_CLAUSE}
                 """,
-                (
-                    event_id,
-                    calendar_id,
-                    summary,
-                    description,
-                    start_time.isoformat() if start_time else None,
-                    end_time.isoformat() if end_time else None,
-                    json.dumps(raw_event, ensure_ascii=False),
-                ),
+                row,
             )
-            await db.commit()
+            await db.execute(_UPSERT_PROJECTION_SQL, projection_row)
+
+        await self.db_manager.run_write(_upsert)
 
     async def replace_period(
         self,
@@ -129,16 +401,25 @@ class CalendarCacheRepository:
         period_start: datetime,
         period_end: datetime,
         rows: list[dict],
-    ) -> None:
-        self._ensure_db_parent_dir()
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
+    ) -> int:
+        """Make the cached period match ``rows`` and return how many rows changed.
+
+        Rows are staged into a temp table with one ``executemany`` and merged
+        in set-based statements; events whose etag/``updated`` did not change
+        are left untouched and are not parsed into the booking projection again.
+        """
+        stage_rows = [_stage_row(calendar_id, row) for row in rows]
+
+        async def _replace(db) -> int:
+            await _stage_rows(db, stage_rows)
+            cursor = await db.execute(
                 """
                 DELETE FROM calendar_events_cache
                 WHERE calendar_id = ?
                   AND start_time IS NOT NULL
                   AND start_time >= ?
                   AND start_time < ?
+                  AND event_id NOT IN (SELECT event_id FROM calendar_events_stage)
                 """,
                 (
                     calendar_id,
@@ -146,44 +427,15 @@ class CalendarCacheRepository:
                     period_end.isoformat(),
                 ),
             )
+            return cursor.rowcount + await _merge_stage(db, calendar_id, rows)
 
-            for row in rows:
-                await db.execute(
-                    """
-                    INSERT INTO calendar_events_cache (
-                        event_id, calendar_id, summary, description, start_time, end_time, raw_event, synced_at
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ON CONFLICT(event_id) DO UPDATE SET
-                        calendar_id = excluded.calendar_id,
-                        summary = excluded.summary,
-                        description = excluded.description,
-                        start_time = excluded.start_time,
-                        end_time = excluded.end_time,
-                        raw_event = excluded.raw_event,
-                        synced_at = CURRENT_TIMESTAMP
-                    """,
-                    (
-                        row["event_id"],
-                        calendar_id,
-                        row["summary"],
-                        row["description"],
-                        row["start_time"],
-                        row["end_time"],
-                        row["raw_event"],
-                    ),
-                )
-            await db.commit()
+        return await self.db_manager.run_write(_replace)
 
     async def delete_event(self, event_id: str) -> None:
-        self._ensure_db_parent_dir()
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("DELETE FROM calendar_events_cache WHERE event_id = ?", (event_id,))
-            await db.commit()
+        await self.db_manager.execute_write("DELETE FROM calendar_events_cache WHERE event_id = ?", (event_id,))
 
     async def has_events(self, calendar_id: str) -> bool:
-        self._ensure_db_parent_dir()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT 1
@@ -195,24 +447,66 @@ class CalendarCacheRepository:
             )
             return await cursor.fetchone() is not None
 
+    async def apply_changes(
+        self,
+        *,
+        calendar_id: str,
+        rows: list[dict],
+        deleted_event_ids: list[str],
+    ) -> int:
+        """Apply an incremental sync batch and return how many rows changed."""
+        stage_rows = [_stage_row(calendar_id, row) for row in rows]
+        delete_rows = [(event_id,) for event_id in deleted_event_ids]
+
+        async def _apply(db) -> int:
+            changed = 0
+            if delete_rows:
+                cursor = await db.executemany(
+                    "DELETE FROM calendar_events_cache WHERE event_id = ?",
+                    delete_rows,
+                )
+                changed += cursor.rowcount
+            if rows:
+                await _stage_rows(db, stage_rows)
+                changed += await _merge_stage(db, calendar_id, rows)
+            return changed
+
+        return await self.db_manager.run_write(_apply)
+
     async def set_last_sync(self, *, calendar_id: str, synced_at: datetime) -> None:
-        self._ensure_db_parent_dir()
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                INSERT INTO calendar_cache_meta (meta_key, meta_value, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(meta_key) DO UPDATE SET
-                    meta_value = excluded.meta_value,
-                    updated_at = CURRENT_TIMESTAMP
-                """,
-                (self._last_sync_key(calendar_id), synced_at.isoformat()),
-            )
-            await db.commit()
+        await self._set_meta(self._last_sync_key(calendar_id), synced_at.isoformat())
 
     async def get_last_sync(self, calendar_id: str) -> datetime | None:
-        self._ensure_db_parent_dir()
-        async with aiosqlite.connect(self.db_path) as db:
+        value = await self._get_meta(self._last_sync_key(calendar_id))
+        return datetime.fromisoformat(value) if value else None
+
+    async def set_last_full_sync(self, *, calendar_id: str, synced_at: datetime) -> None:
+        await self._set_meta(self._last_full_sync_key(calendar_id), synced_at.isoformat())
+
+    async def get_last_full_sync(self, calendar_id: str) -> datetime | None:
+        value = await self._get_meta(self._last_full_sync_key(calendar_id))
+        return datetime.fromisoformat(value) if value else None
+
+    async def set_sync_token(self, *, calendar_id: str, sync_token: str | None) -> None:
+        await self._set_meta(self._sync_token_key(calendar_id), sync_token)
+
+    async def get_sync_token(self, calendar_id: str) -> str | None:
+        return await self._get_meta(self._sync_token_key(calendar_id))
+
+    async def _set_meta(self, meta_key: str, meta_value: str | None) -> None:
+        await self.db_manager.execute_write(
+            """
+            INSERT INTO calendar_cache_meta (meta_key, meta_value, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(meta_key) DO UPDATE SET
+                meta_value = excluded.meta_value,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (meta_key, meta_value),
+        )
+
+    async def _get_meta(self, meta_key: str) -> str | None:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT meta_value
@@ -220,20 +514,28 @@ class CalendarCacheRepository:
                 WHERE meta_key = ?
                 LIMIT 1
                 """,
-                (self._last_sync_key(calendar_id),),
+                (meta_key,),
             )
             row = await cursor.fetchone()
 
         if not row or not row[0]:
             return None
-        return datetime.fromisoformat(row[0])
+        return row[0]
 
     @staticmethod
     def _last_sync_key(calendar_id: str) -> str:
         return f"calendar_events_last_sync:{calendar_id}"
 
+    @staticmethod
+    def _last_full_sync_key(calendar_id: str) -> str:
+        return f"calendar_events_last_full_sync:{calendar_id}"
+
+    @staticmethod
+    def _sync_token_key(calendar_id: str) -> str:
+        return f"calendar_events_sync_token:{calendar_id}"
+
 
-calendar_cache_repo = CalendarCacheRepository(db_manager.db_path)
+calendar_cache_repo = CalendarCacheRepository(db_manager)
 
 
 __all__ = ["CalendarCacheRepository", "calendar_cache_repo"]
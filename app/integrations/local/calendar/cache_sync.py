@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
@@ -9,10 +8,11 @@ from config import (
     CALENDAR_CACHE_FUTURE_DAYS,
     CALENDAR_CACHE_PAST_DAYS,
     CALENDAR_CACHE_SYNC_INTERVAL_SECONDS,
+    CALENDAR_FULL_SYNC_INTERVAL_SECONDS,
     GOOGLE_CALENDAR_ID,
 )
 from .cache_repo import calendar_cache_repo
-from .service import GoogleCalendarService
+from .service import get_calendar_service
 
 
 logger = logging.getLogger(__name__)
@@ -27,21 +27,25 @@ async def sync_calendar_cache(*, force: bool = False) -> int | None:
         if last_sync and (now - last_sync).total_seconds() < CALENDAR_CACHE_SYNC_INTERVAL_SECONDS:
             return None
 
-    service = GoogleCalendarService(calendar_id=calendar_id)
+    # The window slides every day, so a periodic full download picks up
+    # events that entered it without being modified.
+    last_full_sync = await calendar_cache_repo.get_last_full_sync(calendar_id)
+    full = (
+        last_full_sync is None
+        or (now - last_full_sync).total_seconds() >= CALENDAR_FULL_SYNC_INTERVAL_SECONDS
+    )
+
+    service = get_calendar_service(calendar_id)
     period_start = now - timedelta(days=CALENDAR_CACHE_PAST_DAYS)
     period_end = now + timedelta(days=CALENDAR_CACHE_FUTURE_DAYS)
-    return await service.sync_cache(period_start=period_start, period_end=period_end)
+    return await service.sync_cache(period_start=period_start, period_end=period_end, full=full)
 
 
-async def run_calendar_cache_sync_loop(owner_name: str) -> None:
-    while True:
-        try:
-            synced_count = await sync_calendar_cache(force=False)
-            if synced_count is not None:
-                logger.info("%s calendar cache synced: %s events", owner_name, synced_count)
-        except Exception:
-            logger.exception("Ошибка синхронизации календарного кэша для %s", owner_name)
-        await asyncio.sleep(CALENDAR_CACHE_SYNC_INTERVAL_SECONDS)
+async def run_calendar_cache_sync(owner_name: str) -> int | None:
+    synced_count = await sync_calendar_cache(force=False)
+    if synced_count is not None:
+        logger.info("%s calendar cache synced: %s events", owner_name, synced_count)
+    return synced_count
 
 
-__all__ = ["run_calendar_cache_sync_loop", "sync_calendar_cache"]
+__all__ = ["run_calendar_cache_sync", "sync_calendar_cache"]
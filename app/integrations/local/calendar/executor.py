@@ -0,0 +1,65 @@
+"""Runs blocking googleapiclient calls off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from config import CALENDAR_CALL_TIMEOUT_SECONDS, CALENDAR_EXECUTOR_WORKERS
+
+
+T = TypeVar("T")
+
+
+class CalendarCallTimeout(TimeoutError):
+    pass
+
+
+class CalendarExecutor:
+    """Dedicated bounded thread pool for Google Calendar HTTP calls.
+
+    Each call waits at most ``timeout`` seconds. On timeout or cancellation
+    the awaiting coroutine is released at once; a request that already
+    started keeps its worker thread until the socket timeout set in
+    ``build_calendar_service``, a little below ``timeout``, ends it.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = CALENDAR_EXECUTOR_WORKERS,
+        timeout: float = CALENDAR_CALL_TIMEOUT_SECONDS,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self._pool: ThreadPoolExecutor | None = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="google-calendar",
+            )
+        return self._pool
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: float | None = None, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_pool(), functools.partial(func, *args, **kwargs))
+        call_timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(future, call_timeout)
+        except asyncio.TimeoutError as exc:
+            name = getattr(func, "__qualname__", repr(func))
+            raise CalendarCallTimeout(f"Google Calendar не ответил за {call_timeout} сек. ({name})") from exc
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+calendar_executor = CalendarExecutor()
+
+
+__all__ = ["CalendarCallTimeout", "CalendarExecutor", "calendar_executor"]
@@ -0,0 +1,159 @@
+"""In-memory stand-in for the googleapiclient Calendar resource.
+
+Implements the subset of ``events()`` used by ``GoogleCalendarService``
+(list with paging and sync tokens, insert, get, delete) so calendar sync can
+be exercised offline.
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+from datetime import datetime, timezone
+from typing import Any
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+def _http_error(status: int, reason: str) -> HttpError:
+    response = httplib2.Response({"status": status})
+    response.reason = reason
+    return HttpError(response, reason.encode("utf-8"))
+
+
+class _FakeRequest:
+    def __init__(self, handler, **kwargs):
+        self._handler = handler
+        self._kwargs = kwargs
+
+    def execute(self):
+        return self._handler(**self._kwargs)
+
+
+class _FakeEventsResource:
+    def __init__(self, calendar: "FakeCalendarService"):
+        self._calendar = calendar
+
+    def list(self, **kwargs) -> _FakeRequest:
+        return _FakeRequest(self._calendar._list, **kwargs)
+
+    def insert(self, **kwargs) -> _FakeRequest:
+        return _FakeRequest(self._calendar._insert, **kwargs)
+
+    def get(self, **kwargs) -> _FakeRequest:
+        return _FakeRequest(self._calendar._get, **kwargs)
+
+    def delete(self, **kwargs) -> _FakeRequest:
+        return _FakeRequest(self._calendar._delete, **kwargs)
+
+
+class FakeCalendarService:
+    """Single-calendar fake that records a change log for sync tokens."""
+
+    def __init__(self, page_size: int = 250):
+        self.page_size = page_size
+        self.list_calls: list[dict] = []
+        self._events: dict[str, dict] = {}
+        self._changes: list[tuple[int, str]] = []
+        self._sequence = 0
+        self._min_valid_sequence = 0
+        self._ids = itertools.count(1)
+
+    def events(self) -> _FakeEventsResource:
+        return _FakeEventsResource(self)
+
+    def add_event(self, summary: str, start: datetime, end: datetime, description: str = "", event_id: str | None = None) -> dict:
+        return self._insert(
+            calendarId="fake",
+            body={
+                "id": event_id,
+                "summary": summary,
+                "description": description,
+                "start": {"dateTime": start.isoformat()},
+                "end": {"dateTime": end.isoformat()},
+            },
+        )
+
+    def update_event(self, event_id: str, **fields: Any) -> dict:
+        event = self._events[event_id]
+        event.update(fields)
+        self._touch(event)
+        return copy.deepcopy(event)
+
+    def expire_sync_tokens(self) -> None:
+        """Make every issued token answer 410 Gone, like Google does after a while."""
+        self._min_valid_sequence = self._sequence + 1
+
+    def _touch(self, event: dict) -> None:
+        self._sequence += 1
+        event["etag"] = f'"{self._sequence}"'
+        event["updated"] = datetime.now(timezone.utc).isoformat()
+        self._changes.append((self._sequence, event["id"]))
+
+    def _insert(self, *, calendarId: str, body: dict) -> dict:
+        event = copy.deepcopy(body)
+        if event.get("id") in self._events:
+            raise _http_error(409, "The requested identifier already exists.")
+        event["id"] = event.get("id") or f"fake-{next(self._ids)}"
+        event["status"] = "confirmed"
+        self._events[event["id"]] = event
+        self._touch(event)
+        return copy.deepcopy(event)
+
+    def _get(self, *, calendarId: str, eventId: str) -> dict:
+        event = self._events.get(eventId)
+        if not event or event.get("status") == "cancelled":
+            raise _http_error(404, "Not Found")
+        return copy.deepcopy(event)
+
+    def _delete(self, *, calendarId: str, eventId: str) -> str:
+        event = self._events.get(eventId)
+        if not event or event.get("status") == "cancelled":
+            raise _http_error(410, "Resource has been deleted")
+        event["status"] = "cancelled"
+        self._touch(event)
+        return ""
+
+    def _list(self, **kwargs) -> dict:
+        self.list_calls.append(kwargs)
+        sync_token = kwargs.get("syncToken")
+        if sync_token:
+            since = int(sync_token.split("-", 1)[1])
+            if since < self._min_valid_sequence:
+                raise _http_error(410, "Sync token is no longer valid, a full sync is required.")
+            changed_ids = {event_id for sequence, event_id in self._changes if sequence > since}
+            items = [self._events[event_id] for event_id in changed_ids]
+        else:
+            time_min = kwargs.get("timeMin")
+            time_max = kwargs.get("timeMax")
+            items = [
+                event
+                for event in self._events.values()
+                if event.get("status") != "cancelled"
+                and self._in_window(event, time_min, time_max)
+            ]
+        items = sorted(items, key=lambda event: event["start"].get("dateTime") or event["start"].get("date") or "")
+
+        offset = int(kwargs.get("pageToken") or 0)
+        page_size = min(int(kwargs.get("maxResults") or self.page_size), self.page_size)
+        page = items[offset:offset + page_size]
+        response: dict[str, Any] = {"items": copy.deepcopy(page)}
+        if offset + page_size < len(items):
+            response["nextPageToken"] = str(offset + page_size)
+        else:
+            response["nextSyncToken"] = f"sync-{self._sequence}"
+        return response
+
+    @staticmethod
+    def _in_window(event: dict, time_min: str | None, time_max: str | None) -> bool:
+        start = datetime.fromisoformat(event["start"]["dateTime"])
+        end = datetime.fromisoformat(event["end"]["dateTime"])
+        if time_min and end <= datetime.fromisoformat(time_min):
+            return False
+        if time_max and start >= datetime.fromisoformat(time_max):
+            return False
+        return True
+
+
+__all__ = ["FakeCalendarService"]
@@ -6,19 +6,29 @@ Unified module for working with Google Calendar free/busy slots.
 from __future__ import annotations
 
 import json
+import logging
 import os
-from datetime import datetime, time, timedelta
+import threading
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Tuple
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import google_auth_httplib2
+import httplib2
 from dotenv import load_dotenv
 from google.auth.transport.requests import Request
 from google.oauth2 import service_account
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import HttpRequest
+
+from config import CALENDAR_CALL_TIMEOUT_SECONDS, GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 CREDENTIALS_FILE = os.getenv(
@@ -27,6 +37,13 @@ CREDENTIALS_FILE = os.getenv(
 TOKEN_FILE = os.getenv(
     "GOOGLE_TOKEN_FILE", "calendar_properties_primary.json"
 )
+# Socket timeout a bit below the executor's wait, so a call the caller gave up
+# on also ends in its worker thread instead of holding it for another round.
+HTTP_TIMEOUT_SECONDS = max(CALENDAR_CALL_TIMEOUT_SECONDS - 2.0, CALENDAR_CALL_TIMEOUT_SECONDS / 2)
+
+_service_lock = threading.Lock()
+_credentials = None
+_calendar_resource = None
 
 
 def _load_json_objects(path: str) -> List[dict]:
@@ -94,7 +111,7 @@ def _get_tz(time_zone: str) -> ZoneInfo:
         return ZoneInfo("UTC")
 
 
-def build_calendar_service():
+def _load_credentials():
     token_file = _resolve_token_file()
     creds = None
 
@@ -145,7 +162,86 @@ def build_calendar_service():
             f"Не удалось получить Google credentials. Проверьте {CREDENTIALS_FILE} и {token_file}"
         )
 
-    return build("calendar", "v3", credentials=creds)
+    return creds
+
+
+@lru_cache(maxsize=1)
+def _calendar_discovery_document() -> str:
+    # Bundled with googleapiclient, so building the client never hits the network.
+    document = get_static_doc("calendar", "v3")
+    if document is None:
+        raise FileNotFoundError("Статический discovery-документ Google Calendar v3 не найден")
+    return document
+
+
+def _refresh_credentials_if_needed(creds) -> None:
+    expiry = getattr(creds, "expiry", None)
+    if expiry is None and creds.token:
+        return
+    if expiry is not None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if expiry - now > timedelta(seconds=GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS):
+            return
+    if isinstance(creds, Credentials) and not creds.refresh_token:
+        return
+
+    try:
+        creds.refresh(Request())
+    except Exception:
+        if not creds.valid:
+            raise
+        # The current token still works; the next call will try again.
+        logger.warning("Не удалось заранее обновить Google token", exc_info=True)
+        return
+    if isinstance(creds, Credentials):
+        with open(_resolve_token_file(), "w", encoding="utf-8") as token:
+            token.write(creds.to_json())
+
+
+def _build_calendar_resource(creds):
+    # httplib2 is not thread-safe: calls run on the calendar executor's
+    # threads, so every request gets its own authorized Http object.
+    def _build_request(_http, *args, **kwargs):
+        request_http = google_auth_httplib2.AuthorizedHttp(
+            creds,
+            http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS),
+        )
+        return HttpRequest(request_http, *args, **kwargs)
+
+    authorized_http = google_auth_httplib2.AuthorizedHttp(
+        creds,
+        http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS),
+    )
+    return build_from_document(
+        _calendar_discovery_document(),
+        http=authorized_http,
+        requestBuilder=_build_request,
+    )
+
+
+def build_calendar_service():
+    """Return the process-wide Calendar client.
+
+    Credentials and the client are built once; later calls only refresh the
+    token when it is about to expire, so they stay cheap.
+    """
+    global _credentials, _calendar_resource
+
+    with _service_lock:
+        if _calendar_resource is None:
+            _credentials = _load_credentials()
+            _calendar_resource = _build_calendar_resource(_credentials)
+        else:
+            _refresh_credentials_if_needed(_credentials)
+        return _calendar_resource
+
+
+def reset_calendar_service() -> None:
+    global _credentials, _calendar_resource
+
+    with _service_lock:
+        _credentials = None
+        _calendar_resource = None
 
 
 def get_freebusy(
@@ -279,6 +375,7 @@ def book_slot(
     end: datetime,
     time_zone: str = "Europe/Moscow",
     description: str = "",
+    event_id: str | None = None,
 ) -> dict:
     if start.tzinfo is None or end.tzinfo is None:
         tz = _get_tz(time_zone)
@@ -291,6 +388,9 @@ def book_slot(
         "start": {"dateTime": start.isoformat(), "timeZone": time_zone},
         "end": {"dateTime": end.isoformat(), "timeZone": time_zone},
     }
+    if event_id:
+        # A client-chosen id makes a retried insert answer 409 instead of duplicating the event.
+        body["id"] = event_id
 
     return service.events().insert(calendarId=calendar_id, body=body).execute()
 
@@ -303,4 +403,5 @@ __all__ = [
     "get_free_slots_for_date",
     "get_freebusy",
     "merge_busy",
+    "reset_calendar_service",
 ]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import aiosqlite
+
+from app.integrations.local.db.database import DatabaseManager, db_manager
+from .outbox_repo import has_slot_conflict
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SlotHoldRepository:
+    """Short-lived holds on a slot a client has picked but not confirmed yet.
+
+    Each holder (one messenger user) has at most one hold; taking a new one
+    replaces the previous. Holds expire on their own after the TTL, so an
+    abandoned form never blocks a slot for long.
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+
+    async def hold(
+        self,
+        *,
+        holder: str,
+        calendar_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        ttl_seconds: float,
+        now: datetime | None = None,
+    ) -> bool:
+        """Hold the interval for ``holder``; ``False`` when it is busy or held by someone else."""
+        now = now or _utc_now()
+
+        async def _hold(db: aiosqlite.Connection) -> bool:
+            await db.execute("DELETE FROM slot_holds WHERE expires_at <= ?", (now.isoformat(),))
+            if await has_slot_conflict(db, calendar_id, start_time, end_time, holder=holder, now=now):
+                return False
+            await db.execute(
+                """
+                INSERT INTO slot_holds (holder, calendar_id, start_time, end_time, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(holder) DO UPDATE SET
+                    calendar_id = excluded.calendar_id,
+                    start_time = excluded.start_time,
+                    end_time = excluded.end_time,
+                    expires_at = excluded.expires_at,
+                    created_at = CURRENT_TIMESTAMP
+                """,
+                (
+                    holder,
+                    calendar_id,
+                    start_time.isoformat(),
+                    end_time.isoformat(),
+                    (now + timedelta(seconds=ttl_seconds)).isoformat(),
+                ),
+            )
+            return True
+
+        return await self.db_manager.run_write(_hold)
+
+    async def release(self, holder: str) -> bool:
+        result = await self.db_manager.execute_write("DELETE FROM slot_holds WHERE holder = ?", (holder,))
+        return result.rowcount > 0
+
+    async def list_active(
+        self,
+        *,
+        calendar_id: str,
+        period_start: datetime,
+        period_end: datetime,
+        exclude_holder: str | None = None,
+        now: datetime | None = None,
+    ) -> list[tuple[datetime, datetime]]:
+        """Unexpired holds of other holders that overlap the period."""
+        # Same widened string window as has_slot_conflict; exact check below.
+        lower = (period_start - timedelta(days=1)).isoformat()
+        upper = (period_end + timedelta(days=1)).isoformat()
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute(
+                """
+                SELECT start_time, end_time
+                FROM slot_holds
+                WHERE calendar_id = ? AND expires_at > ? AND holder IS NOT ?
+                  AND start_time < ? AND end_time > ?
+                """,
+                (calendar_id, (now or _utc_now()).isoformat(), exclude_holder, upper, lower),
+            )
+            rows = await cursor.fetchall()
+        intervals = [(datetime.fromisoformat(row[0]), datetime.fromisoformat(row[1])) for row in rows]
+        return [(start, end) for start, end in intervals if start < period_end and end > period_start]
+
+
+slot_hold_repo = SlotHoldRepository(db_manager)
+
+
+__all__ = ["SlotHoldRepository", "slot_hold_repo"]
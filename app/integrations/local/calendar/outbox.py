@@ -0,0 +1,166 @@
+"""Background delivery of queued booking events to Google Calendar."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable
+
+from googleapiclient.errors import HttpError
+
+from config import CALENDAR_OUTBOX_MAX_ATTEMPTS, CALENDAR_OUTBOX_POLL_SECONDS
+from ..invalidation import Invalidation, InvalidationEvent, invalidation_bus
+from .outbox_repo import CalendarOutboxEntry, CalendarOutboxRepository, calendar_outbox_repo
+from .service import GoogleCalendarService, _http_status, get_calendar_service
+
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 10
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 600.0
+# Google answers these for a request that will never succeed as sent.
+PERMANENT_HTTP_STATUSES = (400, 404)
+
+FailureHandler = Callable[[CalendarOutboxEntry, str], Awaitable[None]]
+
+
+class CalendarOutboxWorker:
+    """Push reservations from ``calendar_outbox`` to Google Calendar.
+
+    Entries are claimed in small batches, inserted with their reserved event
+    id and marked done. Failures are retried with exponential backoff; after
+    ``max_attempts`` (or a permanent error) the entry is marked failed and
+    its slot released. The client was already told the booking is
+    confirmed, so ``on_failed`` is then called to alert the admins.
+    Because the event id is fixed at reservation time,
+    an insert repeated after a crash or by a second worker is a no-op.
+    """
+
+    def __init__(
+        self,
+        repo: CalendarOutboxRepository = calendar_outbox_repo,
+        *,
+        service_factory: Callable[[str], GoogleCalendarService] = get_calendar_service,
+        poll_seconds: float = CALENDAR_OUTBOX_POLL_SECONDS,
+        max_attempts: int = CALENDAR_OUTBOX_MAX_ATTEMPTS,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        backoff_base: float = BACKOFF_BASE_SECONDS,
+        backoff_max: float = BACKOFF_MAX_SECONDS,
+        on_failed: FailureHandler | None = None,
+    ):
+        self.repo = repo
+        self.service_factory = service_factory
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max(1, int(max_attempts))
+        self.batch_size = batch_size
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.on_failed = on_failed
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def process_due(self) -> int:
+        """Deliver every entry that is due now; return how many reached Google."""
+        delivered = 0
+        while True:
+            entries = await self.repo.claim_due(limit=self.batch_size)
+            if not entries:
+                return delivered
+            for entry in entries:
+                if await self._deliver(entry):
+                    delivered += 1
+
+    async def run_forever(self) -> None:
+        self._wakeup = asyncio.Event()
+        invalidation_bus.subscribe(InvalidationEvent.CALENDAR_EVENT_CHANGED, self._on_calendar_event_changed)
+        try:
+            # Entries a previous run left half-done are safe to repeat.
+            await self.repo.requeue_processing()
+            while True:
+                self._wakeup.clear()
+                try:
+                    await self.process_due()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Ошибка обработки очереди событий календаря")
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            invalidation_bus.unsubscribe(InvalidationEvent.CALENDAR_EVENT_CHANGED, self._on_calendar_event_changed)
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _deliver(self, entry: CalendarOutboxEntry) -> bool:
+        service = self.service_factory(entry.calendar_id)
+        try:
+            await service.create_event(
+                title=entry.title,
+                description=entry.description,
+                start_time=entry.start_time,
+                end_time=entry.end_time,
+                event_id=entry.event_id,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            permanent = isinstance(exc, HttpError) and _http_status(exc) in PERMANENT_HTTP_STATUSES
+            if permanent or entry.attempts >= self.max_attempts:
+                logger.error(
+                    "Событие %s не создано в календаре после %s попыток: %s",
+                    entry.event_id,
+                    entry.attempts,
+                    exc,
+                )
+                await self.repo.mark_failed(entry.id, str(exc))
+                await service.release_reservation(entry.event_id)
+                await self._report_failure(entry, str(exc))
+                return False
+            delay = self._retry_delay(entry.attempts)
+            logger.warning("Повтор создания события %s через %.0f сек.: %s", entry.event_id, delay, exc)
+            await self.repo.schedule_retry(entry.id, error=str(exc), delay_seconds=delay)
+            return False
+        await self.repo.mark_done(entry.id)
+        return True
+
+    async def _report_failure(self, entry: CalendarOutboxEntry, error: str) -> None:
+        if self.on_failed is None:
+            return
+        try:
+            await self.on_failed(entry, error)
+        except Exception:
+            logger.exception("Не удалось сообщить о несозданном событии %s", entry.event_id)
+
+    def _retry_delay(self, attempt: int) -> float:
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def _on_calendar_event_changed(self, _message: Invalidation) -> None:
+        self.wake()
+
+
+calendar_outbox_worker = CalendarOutboxWorker()
+
+
+__all__ = ["CalendarOutboxWorker", "FailureHandler", "calendar_outbox_worker"]
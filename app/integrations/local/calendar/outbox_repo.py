@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import aiosqlite
+
+from app.integrations.local.db.database import DatabaseManager, db_manager
+
+
+OUTBOX_PENDING = "pending"
+OUTBOX_PROCESSING = "processing"
+OUTBOX_DONE = "done"
+OUTBOX_FAILED = "failed"
+# Reservations in these states still hold their slot.
+OUTBOX_ACTIVE_STATUSES = (OUTBOX_PENDING, OUTBOX_PROCESSING)
+
+_OUTBOX_SELECT = """
+    SELECT id, event_id, calendar_id, title, description, start_time, end_time, status, attempts
+    FROM calendar_outbox
+"""
+
+
+@dataclass(frozen=True)
+class CalendarOutboxEntry:
+    id: int
+    event_id: str
+    calendar_id: str
+    title: str
+    description: str
+    start_time: datetime
+    end_time: datetime
+    status: str
+    attempts: int
+
+    @classmethod
+    def from_row(cls, row) -> "CalendarOutboxEntry":
+        return cls(
+            id=row[0],
+            event_id=row[1],
+            calendar_id=row[2],
+            title=row[3],
+            description=row[4] or "",
+            start_time=datetime.fromisoformat(row[5]),
+            end_time=datetime.fromisoformat(row[6]),
+            status=row[7],
+            attempts=row[8],
+        )
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def has_slot_conflict(
+    db: aiosqlite.Connection,
+    calendar_id: str,
+    start_time: datetime,
+    end_time: datetime,
+    *,
+    holder: str | None = None,
+    now: datetime | None = None,
+) -> bool:
+    """Whether the interval overlaps a cached event, a queued reservation or another client's hold."""
+    # Stored timestamps may carry different offsets, so the SQL range is
+    # widened by a day and the exact comparison is done on parsed values.
+    lower = (start_time - timedelta(days=1)).isoformat()
+    upper = (end_time + timedelta(days=1)).isoformat()
+    cursor = await db.execute(
+        """
+        SELECT start_time, end_time
+        FROM calendar_events_cache
+        WHERE calendar_id = ? AND start_time < ? AND end_time > ?
+        UNION ALL
+        SELECT start_time, end_time
+        FROM calendar_outbox
+        WHERE calendar_id = ? AND status IN (?, ?) AND start_time < ? AND end_time > ?
+        UNION ALL
+        SELECT start_time, end_time
+        FROM slot_holds
+        WHERE calendar_id = ? AND expires_at > ? AND holder IS NOT ?
+          AND start_time < ? AND end_time > ?
+        """,
+        (
+            calendar_id, upper, lower,
+            calendar_id, *OUTBOX_ACTIVE_STATUSES, upper, lower,
+            calendar_id, (now or _utc_now()).isoformat(), holder, upper, lower,
+        ),
+    )
+    for raw_start, raw_end in await cursor.fetchall():
+        if not raw_start or not raw_end:
+            continue
+        if datetime.fromisoformat(raw_start) < end_time and datetime.fromisoformat(raw_end) > start_time:
+            return True
+    return False
+
+
+class CalendarOutboxRepository:
+    """Durable queue of calendar inserts confirmed to clients but not yet sent to Google."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+
+    async def reserve(
+        self,
+        *,
+        event_id: str,
+        calendar_id: str,
+        title: str,
+        description: str,
+        start_time: datetime,
+        end_time: datetime,
+        holder: str | None = None,
+    ) -> CalendarOutboxEntry | None:
+        """Queue an insert unless the interval overlaps a cached event or another reservation.
+
+        The overlap check and the insert share one write transaction, so two
+        processes cannot both reserve the same slot. A slot hold taken by
+        ``holder`` does not count as a conflict and is consumed by the
+        reservation. Returns ``None`` on conflict.
+        """
+
+        async def _reserve(db: aiosqlite.Connection) -> CalendarOutboxEntry | None:
+            if await has_slot_conflict(db, calendar_id, start_time, end_time, holder=holder):
+                return None
+            if holder is not None:
+                await db.execute("DELETE FROM slot_holds WHERE holder = ?", (holder,))
+            cursor = await db.execute(
+                """
+                INSERT INTO calendar_outbox (
+                    event_id, calendar_id, title, description, start_time, end_time, status
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    event_id,
+                    calendar_id,
+                    title,
+                    description,
+                    start_time.isoformat(),
+                    end_time.isoformat(),
+                    OUTBOX_PENDING,
+                ),
+            )
+            return CalendarOutboxEntry(
+                id=cursor.lastrowid,
+                event_id=event_id,
+                calendar_id=calendar_id,
+                title=title,
+                description=description,
+                start_time=start_time,
+                end_time=end_time,
+                status=OUTBOX_PENDING,
+                attempts=0,
+            )
+
+        return await self.db_manager.run_write(_reserve)
+
+    async def claim_due(self, *, limit: int = 10, now: datetime | None = None) -> list[CalendarOutboxEntry]:
+        """Move up to ``limit`` due entries to ``processing`` and return them."""
+        now_iso = (now or _utc_now()).isoformat()
+
+        async def _claim(db: aiosqlite.Connection) -> list[CalendarOutboxEntry]:
+            cursor = await db.execute(
+                f"""
+                {_OUTBOX_SELECT}
+                WHERE status = ? AND (next_attempt_at IS NULL OR next_attempt_at <= ?)
+                ORDER BY id
+                LIMIT ?
+                """,
+                (OUTBOX_PENDING, now_iso, limit),
+            )
+            rows = await cursor.fetchall()
+            if not rows:
+                return []
+            ids = [row[0] for row in rows]
+            placeholders = ", ".join("?" for _ in ids)
+            await db.execute(
+                f"""
+                UPDATE calendar_outbox
+                SET status = ?, attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id IN ({placeholders})
+                """,
+                (OUTBOX_PROCESSING, *ids),
+            )
+            return [
+                CalendarOutboxEntry.from_row((*row[:7], OUTBOX_PROCESSING, row[8] + 1))
+                for row in rows
+            ]
+
+        return await self.db_manager.run_write(_claim)
+
+    async def mark_done(self, entry_id: int) -> None:
+        await self._set_status(entry_id, OUTBOX_DONE)
+
+    async def mark_failed(self, entry_id: int, error: str) -> None:
+        await self._set_status(entry_id, OUTBOX_FAILED, error=error)
+
+    async def schedule_retry(self, entry_id: int, *, error: str, delay_seconds: float) -> None:
+        next_attempt_at = (_utc_now() + timedelta(seconds=delay_seconds)).isoformat()
+        await self._set_status(entry_id, OUTBOX_PENDING, error=error, next_attempt_at=next_attempt_at)
+
+    async def requeue_processing(self) -> int:
+        """Return entries left in ``processing`` by a crashed worker to the queue."""
+        result = await self.db_manager.execute_write(
+            """
+            UPDATE calendar_outbox
+            SET status = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE status = ?
+            """,
+            (OUTBOX_PENDING, OUTBOX_PROCESSING),
+        )
+        return result.rowcount
+
+    async def get_active_by_event_id(self, event_id: str) -> CalendarOutboxEntry | None:
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute(
+                f"{_OUTBOX_SELECT} WHERE event_id = ? AND status IN (?, ?)",
+                (event_id, *OUTBOX_ACTIVE_STATUSES),
+            )
+            row = await cursor.fetchone()
+        return CalendarOutboxEntry.from_row(row) if row else None
+
+    async def list_active_intervals(self, calendar_id: str) -> list[tuple[str, datetime, datetime]]:
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute(
+                """
+                SELECT event_id, start_time, end_time
+                FROM calendar_outbox
+                WHERE calendar_id = ? AND status IN (?, ?)
+                """,
+                (calendar_id, *OUTBOX_ACTIVE_STATUSES),
+            )
+            rows = await cursor.fetchall()
+        return [(row[0], datetime.fromisoformat(row[1]), datetime.fromisoformat(row[2])) for row in rows]
+
+    async def _set_status(
+        self,
+        entry_id: int,
+        status: str,
+        *,
+        error: str | None = None,
+        next_attempt_at: str | None = None,
+    ) -> None:
+        await self.db_manager.execute_write(
+            """
+            UPDATE calendar_outbox
+            SET status = ?, last_error = COALESCE(?, last_error), next_attempt_at = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (status, error, next_attempt_at, entry_id),
+        )
+
+
+calendar_outbox_repo = CalendarOutboxRepository(db_manager)
+
+
+__all__ = [
+    "CalendarOutboxEntry",
+    "CalendarOutboxRepository",
+    "OUTBOX_ACTIVE_STATUSES",
+    "OUTBOX_DONE",
+    "OUTBOX_FAILED",
+    "OUTBOX_PENDING",
+    "OUTBOX_PROCESSING",
+    "calendar_outbox_repo",
+    "has_slot_conflict",
+]
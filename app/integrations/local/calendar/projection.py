@@ -0,0 +1,127 @@
+"""Typed view of the booking data written into event descriptions."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+
+# Extra service booked as a separate event next to the main booking.
+LINKED_EXTRA_SERVICE_ID = 9
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_EMAIL_RE = re.compile(r"[\w.\-+%]+@[\w.\-]+\.\w+")
+_PHONE_RE = re.compile(r"(\+?\d[\d\-\s\(\)]{8,}\d)")
+_TG_ID_RE = re.compile(r"Telegram ID:\s*(\d+)", flags=re.IGNORECASE)
+_VK_ID_RE = re.compile(r"VK ID:\s*(\d+)", flags=re.IGNORECASE)
+_TG_LINK_RE = re.compile(r"https?://t\.me/([A-Za-z0-9_]{5,32})", flags=re.IGNORECASE)
+_TG_USERNAME_RE = re.compile(r"(?:^|\s)@([A-Za-z0-9_]{5,32})(?:\s|$)")
+_SERVICE_ID_RE = re.compile(r"(?<!Linked )Service ID:\s*(\d+)")
+_LINKED_EVENT_RE = re.compile(r"Связано с событием:\s*(\S+)")
+
+
+def _phone10(phone: str | None) -> str | None:
+    digits = "".join(ch for ch in str(phone or "") if ch.isdigit())
+    if len(digits) == 11 and digits.startswith(("7", "8")):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else None
+
+
+def extract_booking_contact_details(description: str) -> dict:
+    text = _TAG_RE.sub("", description or "")
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+
+    name = None
+    for i, line in enumerate(lines):
+        if line.lower() == "кто забронировал" and i + 1 < len(lines):
+            name = lines[i + 1]
+            break
+
+    email_match = _EMAIL_RE.search(text)
+    phone_match = _PHONE_RE.search(text)
+    tg_id_match = _TG_ID_RE.search(text)
+    vk_id_match = _VK_ID_RE.search(text)
+    tg_link_match = _TG_LINK_RE.search(text)
+    tg_username_match = _TG_USERNAME_RE.search(text)
+
+    return {
+        "name": name,
+        "email": email_match.group(0) if email_match else None,
+        "phone": phone_match.group(1) if phone_match else None,
+        "telegram_id": tg_id_match.group(1) if tg_id_match else None,
+        "vk_id": vk_id_match.group(1) if vk_id_match else None,
+        "telegram_username": (
+            tg_link_match.group(1)
+            if tg_link_match
+            else (tg_username_match.group(1) if tg_username_match else None)
+        ),
+    }
+
+
+@dataclass(slots=True)
+class BookingProjection:
+    """One cached event as a booking: who made it, through which bot, for what."""
+
+    channel: str | None = None
+    is_primary: bool = True
+    client_name: str | None = None
+    phone: str | None = None
+    phone10: str | None = None
+    email: str | None = None
+    tg_id: int | None = None
+    tg_username: str | None = None
+    vk_id: int | None = None
+    service_id: int | None = None
+    linked_event_id: str | None = None
+
+    def contact_details(self) -> dict:
+        """The same shape as :func:`extract_booking_contact_details`."""
+        return {
+            "name": self.client_name,
+            "email": self.email,
+            "phone": self.phone,
+            "telegram_id": str(self.tg_id) if self.tg_id is not None else None,
+            "vk_id": str(self.vk_id) if self.vk_id is not None else None,
+            "telegram_username": self.tg_username,
+        }
+
+
+def parse_booking_projection(description: str | None) -> BookingProjection:
+    details = extract_booking_contact_details(description or "")
+    text = _TAG_RE.sub("", description or "")
+    service_match = _SERVICE_ID_RE.search(text)
+    linked_match = _LINKED_EVENT_RE.search(text)
+    service_id = int(service_match.group(1)) if service_match else None
+    linked_event_id = linked_match.group(1) if linked_match else None
+
+    if "Telegram:" in text or "Telegram ID:" in text:
+        channel = "telegram"
+    elif "VK ID:" in text:
+        channel = "vk"
+    else:
+        channel = None
+
+    is_primary = "Linked Service ID:" not in text and not (
+        service_id == LINKED_EXTRA_SERVICE_ID and linked_event_id
+    )
+    return BookingProjection(
+        channel=channel,
+        is_primary=is_primary,
+        client_name=details["name"],
+        phone=details["phone"],
+        phone10=_phone10(details["phone"]),
+        email=details["email"],
+        tg_id=int(details["telegram_id"]) if details["telegram_id"] else None,
+        tg_username=details["telegram_username"],
+        vk_id=int(details["vk_id"]) if details["vk_id"] else None,
+        service_id=service_id,
+        linked_event_id=linked_event_id,
+    )
+
+
+__all__ = [
+    "BookingProjection",
+    "LINKED_EXTRA_SERVICE_ID",
+    "extract_booking_contact_details",
+    "parse_booking_projection",
+]
@@ -0,0 +1,49 @@
+"""Helpers for the full-text index over cached calendar events."""
+
+from __future__ import annotations
+
+import re
+
+
+_PHONE_RE = re.compile(r"(?<!\d)(?:\+?7|8)?[\s(-]*\d{3}[\s)-]*\d{3}[\s-]*\d{2}[\s-]*\d{2}(?!\d)")
+_TELEGRAM_LINK_RE = re.compile(r"t\.me/([A-Za-z0-9_]{3,})")
+_QUERY_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _phone10(value: str) -> str | None:
+    digits = "".join(ch for ch in value if ch.isdigit())
+    if len(digits) == 11 and digits.startswith(("7", "8")):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else None
+
+
+def extract_contact_terms(text: str | None) -> str:
+    """Phone numbers and Telegram usernames from an event description as index terms.
+
+    Phones are reduced to their last 10 digits, so a number written as
+    ``+7 999 123 45 67`` or ``8 (999) 123-45-67`` is found by ``9991234567``.
+    """
+    if not text:
+        return ""
+    terms: list[str] = []
+    for match in _PHONE_RE.finditer(text):
+        phone = _phone10(match.group(0))
+        if phone and phone not in terms:
+            terms.append(phone)
+    for username in _TELEGRAM_LINK_RE.findall(text):
+        if username not in terms:
+            terms.append(username)
+    return " ".join(terms)
+
+
+def build_match_query(query: str) -> str | None:
+    """Turn user input into an FTS5 query: every word must match as a prefix."""
+    terms = []
+    for token in _QUERY_TOKEN_RE.findall(query):
+        phone = _phone10(token) if token.isdigit() else None
+        # Quoting keeps FTS5 operators typed by the user from being interpreted.
+        terms.append(f'"{phone or token}"*')
+    return " ".join(terms) or None
+
+
+__all__ = ["build_match_query", "extract_contact_terms"]
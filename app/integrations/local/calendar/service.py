@@ -1,31 +1,64 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
-from datetime import date, datetime, time
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta
 from typing import Any, Dict, List, Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from dotenv import load_dotenv
+from googleapiclient.errors import HttpError
 
+from config import CALENDAR_CACHE_FUTURE_DAYS, CALENDAR_CACHE_PAST_DAYS, SLOT_HOLD_TTL_SECONDS
+from ..invalidation import Invalidation, InvalidationEvent, invalidation_bus
+from .busy_index import BusyIndex
 from .cache_repo import calendar_cache_repo
+from .executor import calendar_executor
 from .freebusy import book_slot, build_calendar_service, get_free_slots_for_date
+from .hold_repo import slot_hold_repo
+from .outbox_repo import calendar_outbox_repo
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def _http_status(exc: HttpError) -> int | None:
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
 class GoogleCalendarService:
-    def __init__(self, calendar_id: Optional[str] = None, time_zone: str = "Europe/Moscow"):
+    def __init__(
+        self,
+        calendar_id: Optional[str] = None,
+        time_zone: str = "Europe/Moscow",
+        service=None,
+    ):
         self.calendar_id = calendar_id or os.getenv("GOOGLE_CALENDAR_ID") or "primary"
         self.time_zone = time_zone
-        self._service = None
+        self._service = service
+        self._busy_index = BusyIndex(self._get_tzinfo())
+        # Bumped on every cache write so a concurrent index load can tell it is stale.
+        self._cache_generation = 0
+        self._first_sync_lock = asyncio.Lock()
 
     def _get_service(self):
-        if self._service is None:
-            self._service = build_calendar_service()
-        return self._service
+        if self._service is not None:
+            return self._service
+        # Shared client; refreshes the token ahead of expiry when needed.
+        return build_calendar_service()
+
+    async def _get_service_async(self):
+        if self._service is not None:
+            return self._service
+        return await calendar_executor.run(self._get_service)
 
     def _ensure_tz(self, dt: datetime) -> datetime:
         if dt.tzinfo is None:
@@ -65,8 +98,9 @@ class GoogleCalendarService:
         work_start: time = time(hour=9, minute=0),
         work_end: time = time(hour=21, minute=0),
     ) -> List[Dict[str, datetime]]:
-        slots = get_free_slots_for_date(
-            self._get_service(),
+        slots = await calendar_executor.run(
+            get_free_slots_for_date,
+            await self._get_service_async(),
             self.calendar_id,
             date,
             slot_minutes=duration_minutes,
@@ -83,18 +117,30 @@ class GoogleCalendarService:
         description: str,
         start_time: datetime,
         end_time: datetime,
+        event_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         start_time = self._ensure_tz(start_time)
         end_time = self._ensure_tz(end_time)
-        payload = book_slot(
-            self._get_service(),
-            self.calendar_id,
-            title=title,
-            start=start_time,
-            end=end_time,
-            time_zone=self.time_zone,
-            description=description,
-        )
+        service = await self._get_service_async()
+        try:
+            payload = await calendar_executor.run(
+                book_slot,
+                service,
+                self.calendar_id,
+                title=title,
+                start=start_time,
+                end=end_time,
+                time_zone=self.time_zone,
+                description=description,
+                event_id=event_id,
+            )
+        except HttpError as exc:
+            # 409 means an earlier attempt with this id already created the event.
+            if not event_id or _http_status(exc) != 409:
+                raise
+            payload = await calendar_executor.run(
+                service.events().get(calendarId=self.calendar_id, eventId=event_id).execute
+            )
         try:
             await calendar_cache_repo.upsert_event(
                 event_id=str(payload.get("id") or ""),
@@ -107,9 +153,87 @@ class GoogleCalendarService:
             )
         except Exception:
             logger.exception("Не удалось записать новое событие в локальный кэш календаря")
+        self._update_busy_index([payload])
+        await invalidation_bus.publish(InvalidationEvent.CALENDAR_EVENT_CHANGED, payload.get("id"))
         return payload
 
-    def _fetch_raw_events(
+    async def reserve_event(
+        self,
+        title: str,
+        description: str,
+        start_time: datetime,
+        end_time: datetime,
+        holder: Optional[str] = None,
+    ) -> Optional[str]:
+        """Hold the slot locally and queue the Google insert; return the future event id.
+
+        Returns ``None`` when the slot overlaps a cached event, another
+        reservation or a hold of someone other than ``holder``. The insert
+        itself is performed by the outbox worker.
+        """
+        start_time = self._ensure_tz(start_time)
+        end_time = self._ensure_tz(end_time)
+        # The conflict check reads the cache, so it must have been synced at least once.
+        await self.get_busy_index()
+        # Google accepts base32hex ids of 5-1024 chars; a hex uuid qualifies.
+        event_id = uuid.uuid4().hex
+        entry = await calendar_outbox_repo.reserve(
+            event_id=event_id,
+            calendar_id=self.calendar_id,
+            title=title,
+            description=description,
+            start_time=start_time,
+            end_time=end_time,
+            holder=holder,
+        )
+        if entry is None:
+            return None
+        self._cache_generation += 1
+        if self._busy_index.loaded:
+            self._busy_index.upsert(event_id, start_time, end_time)
+        await invalidation_bus.publish(InvalidationEvent.CALENDAR_EVENT_CHANGED, event_id)
+        return event_id
+
+    async def release_reservation(self, event_id: str) -> None:
+        """Drop a reservation that will never reach Google from the busy index."""
+        self._update_busy_index([], [event_id])
+        await invalidation_bus.publish(InvalidationEvent.CALENDAR_EVENT_CHANGED, event_id)
+
+    async def hold_slot(
+        self,
+        holder: str,
+        start_time: datetime,
+        end_time: datetime,
+        ttl_seconds: float = SLOT_HOLD_TTL_SECONDS,
+    ) -> bool:
+        """Keep the slot for ``holder`` while they fill in the booking form."""
+        await self.get_busy_index()
+        return await slot_hold_repo.hold(
+            holder=holder,
+            calendar_id=self.calendar_id,
+            start_time=self._ensure_tz(start_time),
+            end_time=self._ensure_tz(end_time),
+            ttl_seconds=ttl_seconds,
+        )
+
+    async def release_hold(self, holder: str) -> None:
+        await slot_hold_repo.release(holder)
+
+    async def list_holds(
+        self,
+        start: datetime,
+        end: datetime,
+        exclude_holder: Optional[str] = None,
+    ) -> list[tuple[datetime, datetime]]:
+        """Intervals held by other clients; read from the database so every process sees them."""
+        return await slot_hold_repo.list_active(
+            calendar_id=self.calendar_id,
+            period_start=self._ensure_tz(start),
+            period_end=self._ensure_tz(end),
+            exclude_holder=exclude_holder,
+        )
+
+    async def _fetch_raw_events(
         self,
         *,
         start: datetime,
@@ -117,12 +241,12 @@ class GoogleCalendarService:
         query: Optional[str] = None,
         max_results: int | None = None,
     ) -> list[dict]:
-        service = self._get_service()
+        service = await self._get_service_async()
         page_token = None
         items: list[dict] = []
 
         while True:
-            response = (
+            response = await calendar_executor.run(
                 service.events()
                 .list(
                     calendarId=self.calendar_id,
@@ -135,7 +259,7 @@ class GoogleCalendarService:
                     maxResults=min(max_results or 250, 250) if max_results else 250,
                     pageToken=page_token,
                 )
-                .execute()
+                .execute
             )
             batch = response.get("items", [])
             items.extend(batch)
@@ -166,34 +290,187 @@ class GoogleCalendarService:
             "start_time": start_time.isoformat() if start_time else None,
             "end_time": end_time.isoformat() if end_time else None,
             "raw_event": json.dumps(event, ensure_ascii=False),
+            "etag": event.get("etag"),
+            "updated": event.get("updated"),
         }
 
+    async def _fetch_event_changes(
+        self,
+        *,
+        sync_token: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Fetch a full window (no token) or the changes since ``sync_token``.
+
+        Returns the raw items and Google's ``nextSyncToken`` for the next call.
+        """
+        service = await self._get_service_async()
+        page_token = None
+        items: list[dict] = []
+
+        while True:
+            params: dict[str, Any] = {
+                "calendarId": self.calendar_id,
+                "timeZone": self.time_zone,
+                "singleEvents": True,
+                "maxResults": 250,
+                "pageToken": page_token,
+            }
+            if sync_token:
+                params["syncToken"] = sync_token
+            else:
+                params["timeMin"] = start.isoformat()
+                params["timeMax"] = end.isoformat()
+
+            response = await calendar_executor.run(service.events().list(**params).execute)
+            items.extend(response.get("items", []))
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return items, response.get("nextSyncToken")
+
     async def sync_cache(
         self,
         *,
         period_start: datetime,
         period_end: datetime,
+        full: bool = False,
     ) -> int:
+        """Bring the local cache up to date and return the number of fetched events.
+
+        Uses the stored sync token to pull only changed/deleted events. Falls
+        back to a full window download when there is no token, when ``full``
+        is requested or when Google answers 410 Gone for an expired token.
+        """
         period_start = self._ensure_tz(period_start)
         period_end = self._ensure_tz(period_end)
-        raw_events = self._fetch_raw_events(
-            start=period_start,
-            end=period_end,
-            max_results=None,
-        )
-        rows = [self._build_cache_row(event) for event in raw_events]
+        sync_token = None if full else await calendar_cache_repo.get_sync_token(self.calendar_id)
+        raw_events: list[dict] = []
+        next_sync_token = None
+        changed_count = 0
 
-        await calendar_cache_repo.replace_period(
-            calendar_id=self.calendar_id,
-            period_start=period_start,
-            period_end=period_end,
-            rows=rows,
-        )
+        if sync_token:
+            try:
+                raw_events, next_sync_token = await self._fetch_event_changes(sync_token=sync_token)
+            except HttpError as exc:
+                if _http_status(exc) != 410:
+                    raise
+                logger.info("Sync token календаря %s устарел, выполняется полная синхронизация", self.calendar_id)
+                sync_token = None
+            else:
+                deleted_event_ids = [
+                    str(event["id"])
+                    for event in raw_events
+                    if event.get("status") == "cancelled" and event.get("id")
+                ]
+                rows = [
+                    self._build_cache_row(event)
+                    for event in raw_events
+                    if event.get("status") != "cancelled"
+                ]
+                changed_count = await calendar_cache_repo.apply_changes(
+                    calendar_id=self.calendar_id,
+                    rows=rows,
+                    deleted_event_ids=deleted_event_ids,
+                )
+                self._update_busy_index(
+                    [event for event in raw_events if event.get("status") != "cancelled"],
+                    deleted_event_ids,
+                )
+                logger.debug(
+                    "Calendar cache incremental sync: %s changes fetched, %s rows changed",
+                    len(raw_events),
+                    changed_count,
+                )
+
+        if not sync_token:
+            raw_events, next_sync_token = await self._fetch_event_changes(start=period_start, end=period_end)
+            rows = [self._build_cache_row(event) for event in raw_events]
+            changed_count = await calendar_cache_repo.replace_period(
+                calendar_id=self.calendar_id,
+                period_start=period_start,
+                period_end=period_end,
+                rows=rows,
+            )
+            await calendar_cache_repo.set_last_full_sync(
+                calendar_id=self.calendar_id,
+                synced_at=datetime.now(self._get_tzinfo()),
+            )
+            self._cache_generation += 1
+            self._busy_index.loaded = False
+            logger.debug("Calendar cache sync: %s events fetched, %s rows changed", len(rows), changed_count)
+
+        await calendar_cache_repo.set_sync_token(calendar_id=self.calendar_id, sync_token=next_sync_token)
         await calendar_cache_repo.set_last_sync(
             calendar_id=self.calendar_id,
             synced_at=datetime.now(self._get_tzinfo()),
         )
-        return len(rows)
+        await self.get_busy_index()
+        if changed_count:
+            await invalidation_bus.publish(InvalidationEvent.CALENDAR_EVENT_CHANGED)
+        return len(raw_events)
+
+    async def get_busy_index(self) -> BusyIndex:
+        """Return the busy-interval index, loading it from the local cache on first use.
+
+        A cache that has never been synced is filled from Google first, so
+        an empty index always means a free calendar and not a missing one.
+        """
+        while not self._busy_index.loaded:
+            generation = self._cache_generation
+            intervals = await calendar_cache_repo.list_busy_intervals(self.calendar_id)
+            if not intervals and await calendar_cache_repo.get_last_sync(self.calendar_id) is None:
+                await self._sync_never_synced_cache()
+                continue
+            # Confirmed bookings still waiting in the outbox occupy their slots too.
+            reserved = await calendar_outbox_repo.list_active_intervals(self.calendar_id)
+            if generation == self._cache_generation:
+                self._busy_index.load([*intervals, *reserved])
+        return self._busy_index
+
+    async def _sync_never_synced_cache(self) -> None:
+        # Concurrent first lookups share one download.
+        async with self._first_sync_lock:
+            if await calendar_cache_repo.get_last_sync(self.calendar_id) is not None:
+                return
+            logger.info("Календарный кэш %s ещё не синхронизирован, загружаем события из Google", self.calendar_id)
+            now = datetime.now(self._get_tzinfo())
+            await self.sync_cache(
+                period_start=now - timedelta(days=CALENDAR_CACHE_PAST_DAYS),
+                period_end=now + timedelta(days=CALENDAR_CACHE_FUTURE_DAYS),
+                full=True,
+            )
+
+    async def _on_cache_invalidated(self, event_id: str | None) -> None:
+        if event_id is None:
+            self._cache_generation += 1
+            self._busy_index.loaded = False
+            return
+        event = await calendar_cache_repo.get_event(event_id)
+        if event and event.get("status") != "cancelled":
+            self._update_busy_index([event])
+            return
+        reservation = await calendar_outbox_repo.get_active_by_event_id(event_id)
+        if reservation is not None:
+            self._cache_generation += 1
+            if self._busy_index.loaded:
+                self._busy_index.upsert(event_id, reservation.start_time, reservation.end_time)
+        else:
+            self._update_busy_index([], [event_id])
+
+    def _update_busy_index(self, events: list[dict], deleted_event_ids: list[str] | None = None) -> None:
+        self._cache_generation += 1
+        if not self._busy_index.loaded:
+            return
+        for event_id in deleted_event_ids or ():
+            self._busy_index.remove(event_id)
+        for event in events:
+            self._busy_index.upsert(
+                str(event.get("id") or ""),
+                self._parse_event_time(event, "start"),
+                self._parse_event_time(event, "end"),
+            )
 
     async def list_events(
         self,
@@ -214,7 +491,7 @@ class GoogleCalendarService:
         if cached_events or await calendar_cache_repo.has_events(self.calendar_id):
             return cached_events
 
-        raw_events = self._fetch_raw_events(
+        raw_events = await self._fetch_raw_events(
             start=start,
             end=end,
             query=query,
@@ -230,18 +507,57 @@ class GoogleCalendarService:
                 end_time=self._parse_event_time(event, "end"),
                 raw_event=event,
             )
+        self._update_busy_index(raw_events)
         return [self._normalize_event(event) for event in raw_events]
 
+    async def list_bookings(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        channel: Optional[str] = None,
+        primary_only: bool = False,
+        phone10: Optional[str] = None,
+        telegram_id: Optional[int] = None,
+        vk_id: Optional[int] = None,
+        max_results: int = 250,
+    ) -> List[Dict[str, Any]]:
+        """Events of the period with their parsed booking data under ``"booking"``."""
+        start = self._ensure_tz(start)
+        end = self._ensure_tz(end)
+        if not await calendar_cache_repo.has_events(self.calendar_id):
+            # Fills the cache, and the projection with it, before the first sync.
+            await self.list_events(start, end, max_results=max_results)
+        return await calendar_cache_repo.list_bookings(
+            calendar_id=self.calendar_id,
+            period_start=start,
+            period_end=end,
+            channel=channel,
+            primary_only=primary_only,
+            phone10=phone10,
+            tg_id=telegram_id,
+            vk_id=vk_id,
+            max_results=max_results,
+        )
+
+    async def get_booking_contact(self, event_id: str) -> dict | None:
+        booking = await calendar_cache_repo.get_booking(event_id)
+        return booking.contact_details() if booking else None
+
+    async def list_linked_event_ids(self, event_id: str) -> list[str]:
+        return await calendar_cache_repo.list_linked_event_ids(event_id)
+
     async def get_event(self, event_id: str) -> dict | None:
         cached_event = await calendar_cache_repo.get_event(event_id)
         if cached_event:
             return cached_event
 
-        event = (
-            self._get_service().events().get(
+        service = await self._get_service_async()
+        event = await calendar_executor.run(
+            service.events().get(
                 calendarId=self.calendar_id,
                 eventId=event_id,
-            ).execute()
+            ).execute
         )
         if event:
             await calendar_cache_repo.upsert_event(
@@ -253,15 +569,61 @@ class GoogleCalendarService:
                 end_time=self._parse_event_time(event, "end"),
                 raw_event=event,
             )
+            self._update_busy_index([event])
         return event
 
     async def delete_event(self, event_id: str) -> bool:
-        self._get_service().events().delete(
-            calendarId=self.calendar_id,
-            eventId=event_id,
-        ).execute()
+        service = await self._get_service_async()
+        await calendar_executor.run(
+            service.events().delete(
+                calendarId=self.calendar_id,
+                eventId=event_id,
+            ).execute
+        )
         await calendar_cache_repo.delete_event(event_id)
+        self._update_busy_index([], [event_id])
+        await invalidation_bus.publish(InvalidationEvent.CALENDAR_EVENT_CHANGED, event_id)
         return True
 
 
-__all__ = ["GoogleCalendarService"]
+_services_lock = threading.Lock()
+_services: dict[str, GoogleCalendarService] = {}
+
+
+def get_calendar_service(calendar_id: Optional[str] = None) -> GoogleCalendarService:
+    """Return the shared GoogleCalendarService for ``calendar_id``."""
+    resolved_id = calendar_id or os.getenv("GOOGLE_CALENDAR_ID") or "primary"
+    with _services_lock:
+        service = _services.get(resolved_id)
+        if service is None:
+            service = GoogleCalendarService(calendar_id=resolved_id)
+            _services[resolved_id] = service
+        return service
+
+
+async def _on_calendar_event_changed(message: Invalidation) -> None:
+    # This process already updated its own indexes when it made the change.
+    if message.origin == invalidation_bus.origin:
+        return
+    with _services_lock:
+        services = list(_services.values())
+    for service in services:
+        await service._on_cache_invalidated(message.key)
+
+
+invalidation_bus.subscribe(InvalidationEvent.CALENDAR_EVENT_CHANGED, _on_calendar_event_changed)
+
+
+async def reload_calendar_indexes() -> None:
+    """Rebuild every busy index from the shared cache on its next use.
+
+    For processes that do not sync the cache themselves and cannot hear the
+    syncing process's invalidations because Redis is unavailable.
+    """
+    with _services_lock:
+        services = list(_services.values())
+    for service in services:
+        await service._on_cache_invalidated(None)
+
+
+__all__ = ["GoogleCalendarService", "get_calendar_service", "reload_calendar_indexes"]
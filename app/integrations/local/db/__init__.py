@@ -1,5 +1,7 @@
 """Primary access point for the database layer."""
 
+from .admin_directory import AdminDirectory, AdminSnapshot
+from .catalog import CatalogCache, CatalogSnapshot
 from .database import DatabaseManager, db_manager
 from .models import (
     Admin,
@@ -19,6 +21,8 @@ from .repositories import (
     BookingRepository,
     ClientRepository,
     ExtraServiceRepository,
+    LeaderLeaseRepository,
+    SchedulerJobRepository,
     ServiceRepository,
 )
 from .services import BookingService, ClientService
@@ -32,20 +36,30 @@ booking_repo = BookingRepository(db_manager)
 admin_repo = AdminRepository(db_manager)
 support_repo = SupportRepository(db_manager)
 faq_repo = FaqRepository(db_manager)
+admin_directory = AdminDirectory(admin_repo)
+admin_directory.subscribe()
+catalog = CatalogCache(service_repo, extra_service_repo)
+catalog.subscribe()
 booking_reminder_log_repo = BookingReminderLogRepository(db_manager)
+scheduler_job_repo = SchedulerJobRepository(db_manager)
+leader_lease_repo = LeaderLeaseRepository(db_manager)
 
 booking_service = BookingService(db_manager)
 client_service = ClientService(db_manager)
 
 __all__ = [
     "Admin",
+    "AdminDirectory",
     "AdminRepository",
+    "AdminSnapshot",
     "Booking",
     "BookingReminderLogRepository",
     "BookingRepository",
     "BookingService",
     "BookingStatus",
     "BookingWithDetails",
+    "CatalogCache",
+    "CatalogSnapshot",
     "Client",
     "ClientRepository",
     "ClientService",
@@ -54,21 +68,27 @@ __all__ = [
     "ExtraServiceRepository",
     "FaqEntry",
     "FaqRepository",
+    "LeaderLeaseRepository",
     "PriceCalculation",
+    "SchedulerJobRepository",
     "Service",
     "ServiceWithPhotos",
     "ServiceRepository",
     "SupportRepository",
     "TimeSlot",
+    "admin_directory",
     "admin_repo",
     "booking_reminder_log_repo",
     "booking_repo",
     "booking_service",
+    "catalog",
     "client_repo",
     "client_service",
     "db_manager",
     "extra_service_repo",
     "faq_repo",
+    "leader_lease_repo",
+    "scheduler_job_repo",
     "service_repo",
     "support_repo",
 ]
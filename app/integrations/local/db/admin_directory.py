@@ -0,0 +1,82 @@
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import List, Mapping, Optional
+
+from config import ADMIN_DIRECTORY_TTL_SECONDS
+
+from ..invalidation import Invalidation, InvalidationEvent, invalidation_bus
+from .models import Admin
+from .repositories import AdminRepository
+
+
+@dataclass(frozen=True)
+class AdminSnapshot:
+    """Immutable view of the admins table taken at ``loaded_at``."""
+
+    admins: tuple[Admin, ...] = ()
+    by_telegram_id: Mapping[int, Admin] = field(default_factory=lambda: MappingProxyType({}))
+    by_vk_id: Mapping[int, Admin] = field(default_factory=lambda: MappingProxyType({}))
+    loaded_at: float = 0.0
+
+    @classmethod
+    def from_admins(cls, admins: List[Admin]) -> "AdminSnapshot":
+        active = [admin for admin in admins if admin.is_active]
+        return cls(
+            admins=tuple(admins),
+            by_telegram_id=MappingProxyType({int(a.telegram_id): a for a in active if a.telegram_id}),
+            by_vk_id=MappingProxyType({int(a.vk_id): a for a in active if a.vk_id}),
+            loaded_at=time.monotonic(),
+        )
+
+
+class AdminDirectory:
+    """In-memory admin lookups backed by a periodically refreshed snapshot.
+
+    The snapshot is reloaded after ``ttl_seconds`` or as soon as an
+    ``admin_changed`` invalidation arrives, so per-update admin checks never
+    touch SQLite. ``get_all`` mirrors ``AdminRepository.get_all`` and lets the
+    directory stand in for the repository in read-only use cases.
+    """
+
+    def __init__(self, admin_repo: AdminRepository, ttl_seconds: float = ADMIN_DIRECTORY_TTL_SECONDS):
+        self.admin_repo = admin_repo
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[AdminSnapshot] = None
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._snapshot = None
+
+    async def snapshot(self) -> AdminSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl_seconds:
+            return snapshot
+
+        generation = self._generation
+        snapshot = AdminSnapshot.from_admins(await self.admin_repo.get_all())
+        # An invalidation during the load means the rows may already be stale.
+        if generation == self._generation:
+            self._snapshot = snapshot
+        return snapshot
+
+    async def get_all(self) -> List[Admin]:
+        return list((await self.snapshot()).admins)
+
+    async def get_by_telegram_id(self, telegram_id: int) -> Optional[Admin]:
+        return (await self.snapshot()).by_telegram_id.get(int(telegram_id))
+
+    async def get_by_vk_id(self, vk_id: int) -> Optional[Admin]:
+        return (await self.snapshot()).by_vk_id.get(int(vk_id))
+
+    async def active_targets(self, channel: str) -> List[int]:
+        snapshot = await self.snapshot()
+        targets = {"telegram": snapshot.by_telegram_id, "vk": snapshot.by_vk_id}[channel]
+        return list(targets)
+
+    def _on_admin_changed(self, _message: Invalidation) -> None:
+        self.invalidate()
+
+    def subscribe(self) -> None:
+        invalidation_bus.subscribe(InvalidationEvent.ADMIN_CHANGED, self._on_admin_changed)
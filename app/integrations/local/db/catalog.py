@@ -0,0 +1,95 @@
+import time
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import List, Mapping, Optional
+
+from config import CATALOG_TTL_SECONDS
+
+from ..invalidation import Invalidation, InvalidationEvent, invalidation_bus
+from .models import ExtraService, Service
+from .repositories import ExtraServiceRepository, ServiceRepository
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Services and extras as loaded at ``loaded_at``, in repository order."""
+
+    version: int = 0
+    services: tuple[Service, ...] = ()
+    services_by_id: Mapping[int, Service] = field(default_factory=lambda: MappingProxyType({}))
+    extra_services: tuple[ExtraService, ...] = ()
+    extra_services_by_id: Mapping[int, ExtraService] = field(default_factory=lambda: MappingProxyType({}))
+    loaded_at: float = 0.0
+
+
+class CatalogCache:
+    """Read-through cache of the service catalog for the booking flows.
+
+    Both tables are loaded together on first use and kept until a
+    ``service_changed`` invalidation or ``ttl_seconds`` pass. Every reload
+    bumps ``version``. Callers get copies, so editing a returned model never
+    leaks into the cache.
+    """
+
+    def __init__(
+        self,
+        service_repo: ServiceRepository,
+        extra_service_repo: ExtraServiceRepository,
+        ttl_seconds: float = CATALOG_TTL_SECONDS,
+    ):
+        self.service_repo = service_repo
+        self.extra_service_repo = extra_service_repo
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self._generation = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._snapshot = None
+
+    async def snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl_seconds:
+            return snapshot
+
+        generation = self._generation
+        services = await self.service_repo.get_all()
+        extra_services = await self.extra_service_repo.get_all()
+        self._version += 1
+        snapshot = CatalogSnapshot(
+            version=self._version,
+            services=tuple(services),
+            services_by_id=MappingProxyType({service.id: service for service in services}),
+            extra_services=tuple(extra_services),
+            extra_services_by_id=MappingProxyType({extra.id: extra for extra in extra_services}),
+            loaded_at=time.monotonic(),
+        )
+        # Keep a snapshot only if no write landed while it was loading.
+        if generation == self._generation:
+            self._snapshot = snapshot
+        return snapshot
+
+    async def get_service(self, service_id: int) -> Optional[Service]:
+        service = (await self.snapshot()).services_by_id.get(int(service_id))
+        return replace(service) if service else None
+
+    async def get_active_services(self) -> List[Service]:
+        return [replace(service) for service in (await self.snapshot()).services if service.is_active]
+
+    async def get_extra_service(self, extra_service_id: int) -> Optional[ExtraService]:
+        extra_service = (await self.snapshot()).extra_services_by_id.get(int(extra_service_id))
+        return replace(extra_service) if extra_service else None
+
+    async def get_active_extra_services(self) -> List[ExtraService]:
+        return [replace(extra) for extra in (await self.snapshot()).extra_services if extra.is_active]
+
+    def _on_service_changed(self, _message: Invalidation) -> None:
+        self.invalidate()
+
+    def subscribe(self) -> None:
+        invalidation_bus.subscribe(InvalidationEvent.SERVICE_CHANGED, self._on_service_changed)
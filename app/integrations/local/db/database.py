@@ -1,8 +1,33 @@
+import asyncio
+import logging
 import re
+import sqlite3
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, TypeVar
 
 import aiosqlite
 
-from config import DATABASE_URL
+from config import DATABASE_BUSY_TIMEOUT_MS, DATABASE_POOL_SIZE, DATABASE_URL
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteOperation = Callable[[aiosqlite.Connection], Awaitable[T]]
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 134217728",
+    "PRAGMA temp_store = MEMORY",
+)
+WRITE_BATCH_LIMIT = 64
+WRITE_RETRY_ATTEMPTS = 5
+WRITE_RETRY_BASE_DELAY_SECONDS = 0.05
 
 
 def _resolve_db_path(database_url: str) -> str:
@@ -13,20 +38,196 @@ def _resolve_db_path(database_url: str) -> str:
     return database_url
 
 
+def _is_lock_error(exc: BaseException) -> bool:
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+@dataclass(frozen=True)
+class WriteResult:
+    lastrowid: int | None
+    rowcount: int
+
+
+@dataclass
+class _WriteJob:
+    operation: WriteOperation
+    future: asyncio.Future
+
+
 class DatabaseManager:
-    def __init__(self, db_path: str = None):
+    """Owns the SQLite file, a pool of read connections and the write queue.
+
+    Reads borrow one of up to ``pool_size`` long-lived connections through
+    ``reader()``. Writes never touch a connection directly: they are submitted
+    with ``run_write()``/``execute_write()`` and applied by a single worker
+    task on the writer connection. Jobs queued at the same time are committed
+    together in one ``BEGIN IMMEDIATE`` transaction, each inside its own
+    savepoint so a failing job does not discard its neighbours. Lock errors
+    from the other bot process are retried with backoff.
+    """
+
+    def __init__(self, db_path: str = None, pool_size: int = DATABASE_POOL_SIZE):
         self.db_path = db_path or _resolve_db_path(DATABASE_URL or "photostudio.db")
+        self.pool_size = max(1, int(pool_size or 1))
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reader_slots: asyncio.Semaphore | None = None
+        self._idle_readers: list[aiosqlite.Connection] = []
+        self._writer: aiosqlite.Connection | None = None
+        self._write_queue: asyncio.Queue | None = None
+        self._write_worker: asyncio.Task | None = None
+
+    def _bind_loop(self) -> None:
+        # aiosqlite connections are loop-agnostic, asyncio primitives are not.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._reader_slots = asyncio.Semaphore(self.pool_size)
+            self._write_queue = asyncio.Queue()
+            self._write_worker = None
+
+    async def _open_connection(self, *, isolation_level: str | None = "") -> aiosqlite.Connection:
+        Path(self.db_path).expanduser().resolve().parent.mkdir(parents=True, exist_ok=True)
+        connection = aiosqlite.connect(
+            self.db_path,
+            timeout=DATABASE_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=isolation_level,
+        )
+        # A pooled connection must never keep the interpreter alive on exit.
+        connection.daemon = True
+        await connection
+        for pragma in CONNECTION_PRAGMAS:
+            await connection.execute(pragma)
+        return connection
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a pooled read connection."""
+        self._bind_loop()
+        async with self._reader_slots:
+            connection = self._idle_readers.pop() if self._idle_readers else await self._open_connection()
+            try:
+                yield connection
+            finally:
+                self._idle_readers.append(connection)
+
+    async def run_write(self, operation: WriteOperation) -> T:
+        """Queue ``operation(db)`` for the writer and wait for its commit.
+
+        The operation must not call ``run_write`` itself and must not commit.
+        """
+        self._bind_loop()
+        if self._write_worker is None or self._write_worker.done():
+            self._write_worker = asyncio.create_task(self._drain_writes())
+        future = self._loop.create_future()
+        self._write_queue.put_nowait(_WriteJob(operation=operation, future=future))
+        return await future
+
+    async def execute_write(self, sql: str, parameters: Iterable[Any] = ()) -> WriteResult:
+        parameters = tuple(parameters)
+
+        async def _execute(db: aiosqlite.Connection) -> WriteResult:
+            cursor = await db.execute(sql, parameters)
+            return WriteResult(lastrowid=cursor.lastrowid, rowcount=cursor.rowcount)
+
+        return await self.run_write(_execute)
+
+    async def executemany_write(self, sql: str, rows: Iterable[Iterable[Any]]) -> int:
+        rows = [tuple(row) for row in rows]
+
+        async def _execute(db: aiosqlite.Connection) -> int:
+            cursor = await db.executemany(sql, rows)
+            return cursor.rowcount
+
+        return await self.run_write(_execute)
+
+    async def _drain_writes(self) -> None:
+        queue = self._write_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < WRITE_BATCH_LIMIT and not queue.empty():
+                batch.append(queue.get_nowait())
+            batch = [job for job in batch if not job.future.done()]
+            if not batch:
+                continue
+            try:
+                outcomes = await self._commit_batch(batch)
+            except Exception as exc:
+                logger.exception("Не удалось записать пакет из %s операций в базу данных", len(batch))
+                outcomes = [(False, exc)] * len(batch)
+            for job, (ok, value) in zip(batch, outcomes):
+                if job.future.done():
+                    continue
+                if ok:
+                    job.future.set_result(value)
+                else:
+                    job.future.set_exception(value)
+
+    async def _commit_batch(self, batch: list[_WriteJob]) -> list[tuple[bool, Any]]:
+        if self._writer is None:
+            self._writer = await self._open_connection(isolation_level=None)
+        db = self._writer
+
+        for attempt in range(1, WRITE_RETRY_ATTEMPTS + 1):
+            outcomes: list[tuple[bool, Any]] = []
+            try:
+                await db.execute("BEGIN IMMEDIATE")
+                for job in batch:
+                    await db.execute("SAVEPOINT write_job")
+                    try:
+                        outcomes.append((True, await job.operation(db)))
+                    except Exception as exc:
+                        if _is_lock_error(exc):
+                            raise
+                        await db.execute("ROLLBACK TO write_job")
+                        outcomes.append((False, exc))
+                    await db.execute("RELEASE write_job")
+                await db.execute("COMMIT")
+                return outcomes
+            except Exception as exc:
+                if db.in_transaction:
+                    await db.execute("ROLLBACK")
+                if not _is_lock_error(exc) or attempt == WRITE_RETRY_ATTEMPTS:
+                    raise
+                delay = WRITE_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1))
+                logger.warning("База данных занята, повтор записи через %.2f сек.: %s", delay, exc)
+                await asyncio.sleep(delay)
+        return []
+
+    async def close(self) -> None:
+        worker = self._write_worker
+        self._write_worker = None
+        if worker is not None and not worker.done() and worker.get_loop() is asyncio.get_running_loop():
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+
+        connections = list(self._idle_readers)
+        self._idle_readers.clear()
+        if self._writer is not None:
+            connections.append(self._writer)
+            self._writer = None
+        for connection in connections:
+            try:
+                await connection.close()
+            except Exception:
+                logger.exception("Не удалось закрыть соединение с базой данных")
 
     async def init_database(self):
         """Initialize database and create tables."""
-        async with aiosqlite.connect(self.db_path) as db:
+
+        async def _initialize(db: aiosqlite.Connection) -> None:
             await self._create_tables(db)
             await self._insert_initial_data(db)
 
+        await self.run_write(_initialize)
+
     async def _create_tables(self, db: aiosqlite.Connection):
         """Create all database tables."""
-        await db.execute("PRAGMA foreign_keys = ON")
-
         await db.execute(
             """
             CREATE TABLE IF NOT EXISTS services (
@@ -157,6 +358,16 @@ class DatabaseManager:
             """
         )
 
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scheduler_jobs (
+                job_name TEXT PRIMARY KEY,
+                last_run_at TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
         await db.execute(
             """
             CREATE TABLE IF NOT EXISTS calendar_events_cache (
@@ -167,6 +378,9 @@ class DatabaseManager:
                 start_time TEXT,
                 end_time TEXT,
                 raw_event TEXT NOT NULL,
+                etag TEXT,
+                updated TEXT,
+                search_contacts TEXT,
                 synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
             """
@@ -189,6 +403,108 @@ class DatabaseManager:
             """
         )
 
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_clients_phone ON clients(phone)")
+
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS calendar_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_id TEXT NOT NULL UNIQUE,
+                calendar_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TEXT,
+                last_error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+        await db.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_calendar_outbox_status
+            ON calendar_outbox(status, next_attempt_at)
+            """
+        )
+
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS slot_holds (
+                holder TEXT PRIMARY KEY,
+                calendar_id TEXT NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                expires_at TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+        await db.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_slot_holds_calendar
+            ON slot_holds(calendar_id, expires_at)
+            """
+        )
+
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS leader_leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+        cursor = await db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'calendar_booking_projection'"
+        )
+        projection_exists = await cursor.fetchone() is not None
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS calendar_booking_projection (
+                event_id TEXT PRIMARY KEY,
+                calendar_id TEXT NOT NULL,
+                channel TEXT,
+                is_primary INTEGER NOT NULL DEFAULT 1,
+                client_name TEXT,
+                phone TEXT,
+                phone10 TEXT,
+                email TEXT,
+                tg_id INTEGER,
+                tg_username TEXT,
+                vk_id INTEGER,
+                service_id INTEGER,
+                linked_event_id TEXT
+            )
+            """
+        )
+        for column in ("phone10", "tg_id", "vk_id", "linked_event_id"):
+            await db.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_calendar_booking_projection_{column}
+                ON calendar_booking_projection({column})
+                """
+            )
+        await db.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS calendar_events_cache_projection_delete
+            AFTER DELETE ON calendar_events_cache BEGIN
+                DELETE FROM calendar_booking_projection WHERE event_id = old.event_id;
+            END
+            """
+        )
+        if not projection_exists:
+            # Cached events are projected on the next full sync; dropping the token forces one.
+            await db.execute("DELETE FROM calendar_cache_meta WHERE meta_key LIKE 'calendar_events_sync_token:%'")
+
         cursor = await db.execute("PRAGMA table_info(services)")
         columns = [row[1] for row in await cursor.fetchall()]
         if "base_num_clients" not in columns:
@@ -205,9 +521,22 @@ class DatabaseManager:
         if "discount_code" not in columns:
             await db.execute("ALTER TABLE clients ADD COLUMN discount_code VARCHAR(100)")
 
-        await self._normalize_legacy_clients(db)
+        cursor = await db.execute("PRAGMA table_info(calendar_events_cache)")
+        columns = [row[1] for row in await cursor.fetchall()]
+        if "etag" not in columns:
+            await db.execute("ALTER TABLE calendar_events_cache ADD COLUMN etag TEXT")
+        if "updated" not in columns:
+            await db.execute("ALTER TABLE calendar_events_cache ADD COLUMN updated TEXT")
+        if "search_contacts" not in columns:
+            await db.execute("ALTER TABLE calendar_events_cache ADD COLUMN search_contacts TEXT")
+            # Existing rows get their contacts on the next full sync: clearing
+            # the versions makes it rewrite every row, dropping the token forces it.
+            await db.execute("UPDATE calendar_events_cache SET etag = NULL, updated = NULL")
+            await db.execute("DELETE FROM calendar_cache_meta WHERE meta_key LIKE 'calendar_events_sync_token:%'")
+
+        await self._create_search_index(db)
 
-        await db.commit()
+        await self._normalize_legacy_clients(db)
 
     @staticmethod
     def _normalize_phone(value: str | None) -> str | None:
@@ -255,6 +584,58 @@ class DatabaseManager:
         except (TypeError, ValueError):
             return 0
 
+    async def _create_search_index(self, db: aiosqlite.Connection):
+        """FTS5 index over cached calendar events, kept in sync by triggers."""
+        try:
+            await db.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS calendar_events_fts USING fts5(
+                    summary,
+                    description,
+                    search_contacts,
+                    content='calendar_events_cache',
+                    content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """
+            )
+        except sqlite3.OperationalError as exc:
+            logger.warning("SQLite без FTS5, поиск по бронированиям будет медленным: %s", exc)
+            return
+
+        await db.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS calendar_events_cache_fts_insert
+            AFTER INSERT ON calendar_events_cache BEGIN
+                INSERT INTO calendar_events_fts(rowid, summary, description, search_contacts)
+                VALUES (new.rowid, new.summary, new.description, new.search_contacts);
+            END
+            """
+        )
+        await db.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS calendar_events_cache_fts_delete
+            AFTER DELETE ON calendar_events_cache BEGIN
+                INSERT INTO calendar_events_fts(calendar_events_fts, rowid, summary, description, search_contacts)
+                VALUES ('delete', old.rowid, old.summary, old.description, old.search_contacts);
+            END
+            """
+        )
+        await db.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS calendar_events_cache_fts_update
+            AFTER UPDATE OF summary, description, search_contacts ON calendar_events_cache BEGIN
+                INSERT INTO calendar_events_fts(calendar_events_fts, rowid, summary, description, search_contacts)
+                VALUES ('delete', old.rowid, old.summary, old.description, old.search_contacts);
+                INSERT INTO calendar_events_fts(rowid, summary, description, search_contacts)
+                VALUES (new.rowid, new.summary, new.description, new.search_contacts);
+            END
+            """
+        )
+        # The index points at rowids, which VACUUM may renumber; rebuilding
+        # on start is cheap at this size and also covers pre-existing rows.
+        await db.execute("INSERT INTO calendar_events_fts(calendar_events_fts) VALUES ('rebuild')")
+
     async def _normalize_legacy_clients(self, db: aiosqlite.Connection):
         cursor = await db.execute(
             """
@@ -365,8 +746,6 @@ class DatabaseManager:
                 """,
                 services,
             )
-
-            await db.commit()
             print("Initial services inserted")
 
         cursor = await db.execute("SELECT COUNT(*) FROM extra_services")
@@ -409,7 +788,6 @@ class DatabaseManager:
                 """,
                 extra_services,
             )
-            await db.commit()
             print("Initial extra services inserted")
 
 
@@ -1,8 +1,8 @@
-import aiosqlite
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional
 
+from ..invalidation import InvalidationEvent, invalidation_bus
 from .database import DatabaseManager
 
 
@@ -23,7 +23,7 @@ class FaqRepository:
         self.db_manager = db_manager
 
     async def get_all(self) -> List[FaqEntry]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, question, answer, sort_order, is_active, created_at
@@ -35,7 +35,7 @@ class FaqRepository:
             return [self._row_to_faq(row) for row in rows]
 
     async def get_all_active(self) -> List[FaqEntry]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, question, answer, sort_order, is_active, created_at
@@ -54,48 +54,43 @@ class FaqRepository:
         sort_order: int = 0,
         is_active: bool = True,
     ) -> int:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO faq_entries (question, answer, sort_order, is_active)
-                VALUES (?, ?, ?, ?)
-                """,
-                (question, answer, sort_order, 1 if is_active else 0),
-            )
-            await db.commit()
-            return int(cursor.lastrowid or 0)
+        result = await self.db_manager.execute_write(
+            """
+            INSERT INTO faq_entries (question, answer, sort_order, is_active)
+            VALUES (?, ?, ?, ?)
+            """,
+            (question, answer, sort_order, 1 if is_active else 0),
+        )
+        await invalidation_bus.publish(InvalidationEvent.FAQ_CHANGED, result.lastrowid)
+        return int(result.lastrowid or 0)
 
     async def update_question(self, faq_id: int, question: str) -> None:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            await db.execute(
-                "UPDATE faq_entries SET question = ? WHERE id = ?",
-                (question, faq_id),
-            )
-            await db.commit()
+        await self.db_manager.execute_write(
+            "UPDATE faq_entries SET question = ? WHERE id = ?",
+            (question, faq_id),
+        )
+        await invalidation_bus.publish(InvalidationEvent.FAQ_CHANGED, faq_id)
 
     async def update_answer(self, faq_id: int, answer: str) -> None:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            await db.execute(
-                "UPDATE faq_entries SET answer = ? WHERE id = ?",
-                (answer, faq_id),
-            )
-            await db.commit()
+        await self.db_manager.execute_write(
+            "UPDATE faq_entries SET answer = ? WHERE id = ?",
+            (answer, faq_id),
+        )
+        await invalidation_bus.publish(InvalidationEvent.FAQ_CHANGED, faq_id)
 
     async def set_active(self, faq_id: int, is_active: bool) -> None:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            await db.execute(
-                "UPDATE faq_entries SET is_active = ? WHERE id = ?",
-                (1 if is_active else 0, faq_id),
-            )
-            await db.commit()
+        await self.db_manager.execute_write(
+            "UPDATE faq_entries SET is_active = ? WHERE id = ?",
+            (1 if is_active else 0, faq_id),
+        )
+        await invalidation_bus.publish(InvalidationEvent.FAQ_CHANGED, faq_id)
 
     async def delete(self, faq_id: int) -> None:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            await db.execute("DELETE FROM faq_entries WHERE id = ?", (faq_id,))
-            await db.commit()
+        await self.db_manager.execute_write("DELETE FROM faq_entries WHERE id = ?", (faq_id,))
+        await invalidation_bus.publish(InvalidationEvent.FAQ_CHANGED, faq_id)
 
     async def get_by_id(self, faq_id: int) -> Optional[FaqEntry]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, question, answer, sort_order, is_active, created_at
@@ -1,13 +1,21 @@
-import aiosqlite
+from typing import Iterable, Optional, List
 
-from typing import Optional, List
-
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
+from ..invalidation import InvalidationEvent, invalidation_bus
 from .models import ExtraService, Service, Client, Booking, Admin, BookingStatus
 from .database import DatabaseManager
 
 
+# Stays well below SQLITE_MAX_VARIABLE_NUMBER on old SQLite builds (999).
+IN_QUERY_CHUNK_SIZE = 500
+
+
+def _chunks(values: list, size: int = IN_QUERY_CHUNK_SIZE):
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
+
+
 class ServiceRepository:
     """Repository for services."""
 
@@ -15,7 +23,7 @@ class ServiceRepository:
         self.db_manager = db_manager
 
     async def get_all(self) -> List[Service]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, name, description, COALESCE(base_num_clients, max_num_clients) AS base_num_clients,
@@ -30,7 +38,7 @@ class ServiceRepository:
             return [self._row_to_service(row) for row in rows]
 
     async def get_all_active(self) -> List[Service]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, name, description, COALESCE(base_num_clients, max_num_clients) AS base_num_clients,
@@ -46,7 +54,7 @@ class ServiceRepository:
             return [self._row_to_service(row) for row in rows]
 
     async def get_by_id(self, service_id: int) -> Optional[Service]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, name, description, COALESCE(base_num_clients, max_num_clients) AS base_num_clients,
@@ -62,81 +70,80 @@ class ServiceRepository:
             return self._row_to_service(row) if row else None
 
     async def create(self, service: Service) -> int:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO services (
-                    name, description, base_num_clients, max_num_clients, plus_service_ids,
-                    price_min, price_min_weekend, fix_price, price_for_extra_client,
-                    price_for_extra_client_weekend, min_duration_minutes,
-                    duration_step_minutes, photo_ids, is_active
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    service.name,
-                    service.description,
-                    int(service.base_num_clients or service.max_num_clients or 1),
-                    service.max_num_clients,
-                    service.plus_service_ids,
-                    service.price_min,
-                    service.price_min_weekend,
-                    service.fix_price,
-                    service.price_for_extra_client,
-                    service.price_for_extra_client_weekend,
-                    service.min_duration_minutes,
-                    service.duration_step_minutes,
-                    service.photo_ids,
-                    service.is_active,
-                ),
+        result = await self.db_manager.execute_write(
+            """
+            INSERT INTO services (
+                name, description, base_num_clients, max_num_clients, plus_service_ids,
+                price_min, price_min_weekend, fix_price, price_for_extra_client,
+                price_for_extra_client_weekend, min_duration_minutes,
+                duration_step_minutes, photo_ids, is_active
             )
-            await db.commit()
-            return cursor.lastrowid
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                service.name,
+                service.description,
+                int(service.base_num_clients or service.max_num_clients or 1),
+                service.max_num_clients,
+                service.plus_service_ids,
+                service.price_min,
+                service.price_min_weekend,
+                service.fix_price,
+                service.price_for_extra_client,
+                service.price_for_extra_client_weekend,
+                service.min_duration_minutes,
+                service.duration_step_minutes,
+                service.photo_ids,
+                service.is_active,
+            ),
+        )
+        await invalidation_bus.publish(InvalidationEvent.SERVICE_CHANGED, f"service:{result.lastrowid}")
+        return result.lastrowid
 
     async def update(self, service: Service) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                UPDATE services
-                SET name=?, description=?, base_num_clients=?, max_num_clients=?, plus_service_ids=?,
-                    price_min=?, price_min_weekend=?, fix_price=?, price_for_extra_client=?,
-                    price_for_extra_client_weekend=?, min_duration_minutes=?,
-                    duration_step_minutes=?, photo_ids=?, is_active=?
-                WHERE id=?
-                """,
-                (
-                    service.name,
-                    service.description,
-                    int(service.base_num_clients or service.max_num_clients or 1),
-                    service.max_num_clients,
-                    service.plus_service_ids,
-                    service.price_min,
-                    service.price_min_weekend,
-                    service.fix_price,
-                    service.price_for_extra_client,
-                    service.price_for_extra_client_weekend,
-                    service.min_duration_minutes,
-                    service.duration_step_minutes,
-                    service.photo_ids,
-                    service.is_active,
-                    service.id,
-                ),
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        result = await self.db_manager.execute_write(
+            """
+            UPDATE services
+            SET name=?, description=?, base_num_clients=?, max_num_clients=?, plus_service_ids=?,
+                price_min=?, price_min_weekend=?, fix_price=?, price_for_extra_client=?,
+                price_for_extra_client_weekend=?, min_duration_minutes=?,
+                duration_step_minutes=?, photo_ids=?, is_active=?
+            WHERE id=?
+            """,
+            (
+                service.name,
+                service.description,
+                int(service.base_num_clients or service.max_num_clients or 1),
+                service.max_num_clients,
+                service.plus_service_ids,
+                service.price_min,
+                service.price_min_weekend,
+                service.fix_price,
+                service.price_for_extra_client,
+                service.price_for_extra_client_weekend,
+                service.min_duration_minutes,
+                service.duration_step_minutes,
+                service.photo_ids,
+                service.is_active,
+                service.id,
+            ),
+        )
+        if result.rowcount > 0:
+            await invalidation_bus.publish(InvalidationEvent.SERVICE_CHANGED, f"service:{service.id}")
+        return result.rowcount > 0
 
     async def update_photo_ids(self, service_id: int, photo_ids: Optional[str]) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                UPDATE services
-                SET photo_ids = ?
-                WHERE id = ?
-                """,
-                (photo_ids, service_id),
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        result = await self.db_manager.execute_write(
+            """
+            UPDATE services
+            SET photo_ids = ?
+            WHERE id = ?
+            """,
+            (photo_ids, service_id),
+        )
+        if result.rowcount > 0:
+            await invalidation_bus.publish(InvalidationEvent.SERVICE_CHANGED, f"service:{service_id}")
+        return result.rowcount > 0
 
     def _row_to_service(self, row) -> Service:
         return Service(
@@ -166,7 +173,7 @@ class ExtraServiceRepository:
         self.db_manager = db_manager
 
     async def get_all(self) -> List[ExtraService]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, name, description, price_text, sort_order, is_active, created_at
@@ -178,7 +185,7 @@ class ExtraServiceRepository:
             return [self._row_to_extra_service(row) for row in rows]
 
     async def get_all_active(self) -> List[ExtraService]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, name, description, price_text, sort_order, is_active, created_at
@@ -191,7 +198,7 @@ class ExtraServiceRepository:
             return [self._row_to_extra_service(row) for row in rows]
 
     async def get_by_id(self, extra_service_id: int) -> Optional[ExtraService]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT id, name, description, price_text, sort_order, is_active, created_at
@@ -204,54 +211,53 @@ class ExtraServiceRepository:
             return self._row_to_extra_service(row) if row else None
 
     async def create(self, extra_service: ExtraService) -> int:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO extra_services (name, description, price_text, sort_order, is_active)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    extra_service.name,
-                    extra_service.description,
-                    extra_service.price_text,
-                    extra_service.sort_order,
-                    extra_service.is_active,
-                ),
-            )
-            await db.commit()
-            return cursor.lastrowid
+        result = await self.db_manager.execute_write(
+            """
+            INSERT INTO extra_services (name, description, price_text, sort_order, is_active)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                extra_service.name,
+                extra_service.description,
+                extra_service.price_text,
+                extra_service.sort_order,
+                extra_service.is_active,
+            ),
+        )
+        await invalidation_bus.publish(InvalidationEvent.SERVICE_CHANGED, f"extra:{result.lastrowid}")
+        return result.lastrowid
 
     async def update(self, extra_service: ExtraService) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                UPDATE extra_services
-                SET name = ?, description = ?, price_text = ?, sort_order = ?, is_active = ?
-                WHERE id = ?
-                """,
-                (
-                    extra_service.name,
-                    extra_service.description,
-                    extra_service.price_text,
-                    extra_service.sort_order,
-                    extra_service.is_active,
-                    extra_service.id,
-                ),
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        result = await self.db_manager.execute_write(
+            """
+            UPDATE extra_services
+            SET name = ?, description = ?, price_text = ?, sort_order = ?, is_active = ?
+            WHERE id = ?
+            """,
+            (
+                extra_service.name,
+                extra_service.description,
+                extra_service.price_text,
+                extra_service.sort_order,
+                extra_service.is_active,
+                extra_service.id,
+            ),
+        )
+        if result.rowcount > 0:
+            await invalidation_bus.publish(InvalidationEvent.SERVICE_CHANGED, f"extra:{extra_service.id}")
+        return result.rowcount > 0
 
     async def delete(self, extra_service_id: int) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                DELETE FROM extra_services
-                WHERE id = ?
-                """,
-                (extra_service_id,),
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        result = await self.db_manager.execute_write(
+            """
+            DELETE FROM extra_services
+            WHERE id = ?
+            """,
+            (extra_service_id,),
+        )
+        if result.rowcount > 0:
+            await invalidation_bus.publish(InvalidationEvent.SERVICE_CHANGED, f"extra:{extra_service_id}")
+        return result.rowcount > 0
 
     def _row_to_extra_service(self, row) -> ExtraService:
         return ExtraService(
@@ -277,25 +283,25 @@ class ClientRepository:
         self.db_manager = db_manager
 
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[Client]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(f"{self.CLIENT_SELECT} WHERE telegram_id = ?", (telegram_id,))
             row = await cursor.fetchone()
             return self._row_to_client(row) if row else None
 
     async def get_by_vk_id(self, vk_id: int) -> Optional[Client]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(f"{self.CLIENT_SELECT} WHERE vk_id = ?", (vk_id,))
             row = await cursor.fetchone()
             return self._row_to_client(row) if row else None
 
     async def get_by_phone(self, phone: str) -> Optional[Client]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(f"{self.CLIENT_SELECT} WHERE phone = ?", (phone,))
             row = await cursor.fetchone()
             return self._row_to_client(row) if row else None
 
     async def get_all_by_phone(self, phone: str) -> List[Client]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 f"{self.CLIENT_SELECT} WHERE phone = ? ORDER BY created_at DESC, id DESC",
                 (phone,),
@@ -314,58 +320,88 @@ class ClientRepository:
                 return client
         return clients[0]
 
+    async def get_by_telegram_ids(self, telegram_ids: Iterable[int]) -> dict[int, Client]:
+        clients = await self._get_where_in("telegram_id", telegram_ids)
+        return {client.telegram_id: client for client in clients}
+
+    async def get_by_vk_ids(self, vk_ids: Iterable[int]) -> dict[int, Client]:
+        clients = await self._get_where_in("vk_id", vk_ids)
+        return {client.vk_id: client for client in clients}
+
+    async def get_by_phones_for_channel(self, phones: Iterable[str], channel: str) -> dict[str, Client]:
+        """Batch version of ``get_by_phone_for_channel``, keyed by phone."""
+        clients = await self._get_where_in("phone", phones, order_by="created_at DESC, id DESC")
+        attr = "telegram_id" if channel == "telegram" else "vk_id"
+        by_phone: dict[str, Client] = {}
+        for client in clients:
+            current = by_phone.get(client.phone)
+            if current is None or (not getattr(current, attr, None) and getattr(client, attr, None)):
+                by_phone[client.phone] = client
+        return by_phone
+
+    async def _get_where_in(self, column: str, values: Iterable, order_by: str = "id") -> List[Client]:
+        values = list(dict.fromkeys(value for value in values if value))
+        clients: List[Client] = []
+        if not values:
+            return clients
+        async with self.db_manager.reader() as db:
+            for chunk in _chunks(values):
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor = await db.execute(
+                    f"{self.CLIENT_SELECT} WHERE {column} IN ({placeholders}) ORDER BY {order_by}",
+                    tuple(chunk),
+                )
+                clients.extend(self._row_to_client(row) for row in await cursor.fetchall())
+        return clients
+
     async def get_by_id(self, client_id: int) -> Optional[Client]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(f"{self.CLIENT_SELECT} WHERE id = ?", (client_id,))
             row = await cursor.fetchone()
             return self._row_to_client(row) if row else None
 
     async def create(self, client: Client) -> int:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO clients (telegram_id, vk_id, name, last_name, phone, email, discount_code, sale)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    client.telegram_id,
-                    client.vk_id,
-                    client.name,
-                    client.last_name,
-                    client.phone,
-                    client.email,
-                    client.discount_code,
-                    client.sale,
-                ),
-            )
-            await db.commit()
-            return cursor.lastrowid
+        result = await self.db_manager.execute_write(
+            """
+            INSERT INTO clients (telegram_id, vk_id, name, last_name, phone, email, discount_code, sale)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                client.telegram_id,
+                client.vk_id,
+                client.name,
+                client.last_name,
+                client.phone,
+                client.email,
+                client.discount_code,
+                client.sale,
+            ),
+        )
+        return result.lastrowid
 
     async def update(self, client: Client) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                UPDATE clients
-                SET telegram_id=?, vk_id=?, name=?, last_name=?, phone=?, email=?, discount_code=?, sale=?
-                WHERE id=?
-                """,
-                (
-                    client.telegram_id,
-                    client.vk_id,
-                    client.name,
-                    client.last_name,
-                    client.phone,
-                    client.email,
-                    client.discount_code,
-                    client.sale,
-                    client.id,
-                ),
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        result = await self.db_manager.execute_write(
+            """
+            UPDATE clients
+            SET telegram_id=?, vk_id=?, name=?, last_name=?, phone=?, email=?, discount_code=?, sale=?
+            WHERE id=?
+            """,
+            (
+                client.telegram_id,
+                client.vk_id,
+                client.name,
+                client.last_name,
+                client.phone,
+                client.email,
+                client.discount_code,
+                client.sale,
+                client.id,
+            ),
+        )
+        return result.rowcount > 0
 
     async def get_all(self) -> List[Client]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(f"{self.CLIENT_SELECT} ORDER BY created_at DESC")
             rows = await cursor.fetchall()
             return [self._row_to_client(row) for row in rows]
@@ -392,33 +428,31 @@ class BookingRepository:
         self.db_manager = db_manager
 
     async def create(self, booking: Booking) -> int:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO bookings (
-                    client_id, service_id, start_time, num_durations, num_clients,
-                    status, need_photographer, need_makeuproom, notes, all_price
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    booking.client_id,
-                    booking.service_id,
-                    booking.start_time.isoformat(),
-                    booking.num_durations,
-                    booking.num_clients,
-                    booking.status.value,
-                    booking.need_photographer,
-                    booking.need_makeuproom,
-                    booking.notes,
-                    booking.all_price,
-                ),
+        result = await self.db_manager.execute_write(
+            """
+            INSERT INTO bookings (
+                client_id, service_id, start_time, num_durations, num_clients,
+                status, need_photographer, need_makeuproom, notes, all_price
             )
-            await db.commit()
-            return cursor.lastrowid
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                booking.client_id,
+                booking.service_id,
+                booking.start_time.isoformat(),
+                booking.num_durations,
+                booking.num_clients,
+                booking.status.value,
+                booking.need_photographer,
+                booking.need_makeuproom,
+                booking.notes,
+                booking.all_price,
+            ),
+        )
+        return result.lastrowid
 
     async def get_by_client_id(self, client_id: int) -> List[Booking]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 "SELECT * FROM bookings WHERE client_id = ? ORDER BY start_time DESC",
                 (client_id,),
@@ -427,7 +461,7 @@ class BookingRepository:
             return [self._row_to_booking(row) for row in rows]
 
     async def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Booking]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT * FROM bookings
@@ -445,7 +479,7 @@ class BookingRepository:
         end_time: datetime,
         exclude_id: Optional[int] = None,
     ) -> List[Booking]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             query = """
                 SELECT * FROM bookings
                 WHERE status IN ('pending', 'confirmed')
@@ -462,13 +496,11 @@ class BookingRepository:
             return [self._row_to_booking(row) for row in rows]
 
     async def update_status(self, booking_id: int, status: BookingStatus) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                "UPDATE bookings SET status = ? WHERE id = ?",
-                (status.value, booking_id),
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        result = await self.db_manager.execute_write(
+            "UPDATE bookings SET status = ? WHERE id = ?",
+            (status.value, booking_id),
+        )
+        return result.rowcount > 0
 
     def _row_to_booking(self, row) -> Booking:
         return Booking(
@@ -494,7 +526,7 @@ class AdminRepository:
         self.db_manager = db_manager
 
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[Admin]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 "SELECT * FROM admins WHERE telegram_id = ? AND is_active = 1",
                 (telegram_id,),
@@ -503,7 +535,7 @@ class AdminRepository:
             return self._row_to_admin(row) if row else None
 
     async def get_by_vk_id(self, vk_id: int) -> Optional[Admin]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 "SELECT * FROM admins WHERE vk_id = ? AND is_active = 1",
                 (vk_id,),
@@ -512,41 +544,40 @@ class AdminRepository:
             return self._row_to_admin(row) if row else None
 
     async def create(self, admin: Admin) -> int:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO admins (telegram_id, vk_id, is_active)
-                VALUES (?, ?, ?)
-                """,
-                (admin.telegram_id, admin.vk_id, admin.is_active),
-            )
-            await db.commit()
-            return cursor.lastrowid
+        result = await self.db_manager.execute_write(
+            """
+            INSERT INTO admins (telegram_id, vk_id, is_active)
+            VALUES (?, ?, ?)
+            """,
+            (admin.telegram_id, admin.vk_id, admin.is_active),
+        )
+        await invalidation_bus.publish(InvalidationEvent.ADMIN_CHANGED, result.lastrowid)
+        return result.lastrowid
 
     async def get_all(self) -> List[Admin]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute("SELECT * FROM admins ORDER BY created_at")
             rows = await cursor.fetchall()
             return [self._row_to_admin(row) for row in rows]
 
     async def update(self, admin: Admin) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                UPDATE admins
-                SET telegram_id=?, vk_id=?, is_active=?
-                WHERE id=?
-                """,
-                (admin.telegram_id, admin.vk_id, admin.is_active, admin.id),
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        result = await self.db_manager.execute_write(
+            """
+            UPDATE admins
+            SET telegram_id=?, vk_id=?, is_active=?
+            WHERE id=?
+            """,
+            (admin.telegram_id, admin.vk_id, admin.is_active, admin.id),
+        )
+        if result.rowcount > 0:
+            await invalidation_bus.publish(InvalidationEvent.ADMIN_CHANGED, admin.id)
+        return result.rowcount > 0
 
     async def delete(self, admin_id: int) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute("DELETE FROM admins WHERE id = ?", (admin_id,))
-            await db.commit()
-            return cursor.rowcount > 0
+        result = await self.db_manager.execute_write("DELETE FROM admins WHERE id = ?", (admin_id,))
+        if result.rowcount > 0:
+            await invalidation_bus.publish(InvalidationEvent.ADMIN_CHANGED, admin_id)
+        return result.rowcount > 0
 
     def _row_to_admin(self, row) -> Admin:
         return Admin(
@@ -564,39 +595,113 @@ class BookingReminderLogRepository:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
 
-    async def was_sent(self, channel: str, event_id: str, reminder_date: str) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            cursor = await db.execute(
-                """
-                SELECT 1
-                FROM booking_reminder_log
-                WHERE channel = ? AND event_id = ? AND reminder_date = ?
-                LIMIT 1
-                """,
-                (channel, event_id, reminder_date),
-            )
-            return await cursor.fetchone() is not None
+    async def get_sent_event_ids(self, channel: str, event_ids: Iterable[str], reminder_date: str) -> set[str]:
+        event_ids = list(dict.fromkeys(event_ids))
+        sent: set[str] = set()
+        if not event_ids:
+            return sent
+        async with self.db_manager.reader() as db:
+            for chunk in _chunks(event_ids):
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor = await db.execute(
+                    f"""
+                    SELECT event_id
+                    FROM booking_reminder_log
+                    WHERE channel = ? AND reminder_date = ? AND event_id IN ({placeholders})
+                    """,
+                    (channel, reminder_date, *chunk),
+                )
+                sent.update(row[0] for row in await cursor.fetchall())
+        return sent
 
     async def mark_sent(
         self,
         channel: str,
-        event_id: str,
-        client_id: int,
-        booking_date: str,
         reminder_date: str,
-    ) -> bool:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        entries: Iterable[tuple[str, int, str]],
+    ) -> int:
+        """Record ``(event_id, client_id, booking_date)`` entries in one write.
+
+        Returns how many entries were new.
+        """
+        rows = [
+            (channel, event_id, client_id, booking_date, reminder_date)
+            for event_id, client_id, booking_date in entries
+        ]
+        if not rows:
+            return 0
+        return await self.db_manager.executemany_write(
+            """
+            INSERT OR IGNORE INTO booking_reminder_log (
+                channel, event_id, client_id, booking_date, reminder_date
+            )
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+
+
+class SchedulerJobRepository:
+    """Last run times of scheduled jobs, shared by all bot processes."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+
+    async def get_last_run(self, job_name: str) -> Optional[datetime]:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
-                """
-                INSERT OR IGNORE INTO booking_reminder_log (
-                    channel, event_id, client_id, booking_date, reminder_date
-                )
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (channel, event_id, client_id, booking_date, reminder_date),
+                "SELECT last_run_at FROM scheduler_jobs WHERE job_name = ?",
+                (job_name,),
             )
-            await db.commit()
-            return cursor.rowcount > 0
+            row = await cursor.fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    async def set_last_run(self, job_name: str, run_at: datetime) -> None:
+        await self.db_manager.execute_write(
+            """
+            INSERT INTO scheduler_jobs (job_name, last_run_at, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(job_name) DO UPDATE SET
+                last_run_at = excluded.last_run_at,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (job_name, run_at.isoformat()),
+        )
+
+
+class LeaderLeaseRepository:
+    """Leader leases kept in SQLite, used for leader election when Redis is unavailable.
+
+    A lease is taken over only once it has expired, so the owner has to
+    renew it well within ``ttl_seconds``. Expiry uses the wall clock, which
+    all processes sharing the database file agree on.
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+
+    async def acquire(self, name: str, owner: str, ttl_seconds: float, now: Optional[datetime] = None) -> bool:
+        """Take the lease or renew it for ``owner``; ``False`` while another owner holds it."""
+        now = now or datetime.now(timezone.utc)
+        result = await self.db_manager.execute_write(
+            """
+            INSERT INTO leader_leases (name, owner, expires_at, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(name) DO UPDATE SET
+                owner = excluded.owner,
+                expires_at = excluded.expires_at,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE leader_leases.owner = excluded.owner OR leader_leases.expires_at <= ?
+            """,
+            (name, owner, (now + timedelta(seconds=ttl_seconds)).isoformat(), now.isoformat()),
+        )
+        return result.rowcount > 0
+
+    async def release(self, name: str, owner: str) -> None:
+        await self.db_manager.execute_write(
+            "DELETE FROM leader_leases WHERE name = ? AND owner = ?",
+            (name, owner),
+        )
 
 
 __all__ = [
@@ -604,5 +709,7 @@ __all__ = [
     "BookingReminderLogRepository",
     "BookingRepository",
     "ClientRepository",
+    "LeaderLeaseRepository",
+    "SchedulerJobRepository",
     "ServiceRepository",
 ]
@@ -1,4 +1,3 @@
-import aiosqlite
 from typing import List, Optional, Tuple
 
 from .database import DatabaseManager
@@ -18,18 +17,16 @@ class SupportRepository:
         role: str,
         text: Optional[str] = None,
     ) -> None:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            await db.execute(
-                """
-                INSERT INTO support_messages (user_id, chat_id, message_id, role, text)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (user_id, chat_id, message_id, role, text),
-            )
-            await db.commit()
+        await self.db_manager.execute_write(
+            """
+            INSERT INTO support_messages (user_id, chat_id, message_id, role, text)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (user_id, chat_id, message_id, role, text),
+        )
 
     async def get_last_messages(self, user_id: int, limit: int = 6) -> List[Tuple[str, Optional[str]]]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT role, text FROM support_messages
@@ -44,7 +41,7 @@ class SupportRepository:
             return [(row[0], row[1]) for row in rows]
 
     async def get_message_ids(self, user_id: int) -> List[Tuple[int, int]]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT chat_id, message_id FROM support_messages
@@ -56,7 +53,7 @@ class SupportRepository:
             return [(row[0], row[1]) for row in rows]
 
     async def get_admin_alerts(self, user_id: int) -> List[Tuple[int, int]]:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
+        async with self.db_manager.reader() as db:
             cursor = await db.execute(
                 """
                 SELECT chat_id, message_id FROM support_messages
@@ -68,26 +65,22 @@ class SupportRepository:
             return [(row[0], row[1]) for row in rows]
 
     async def delete_admin_alerts(self, user_id: int) -> None:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            await db.execute(
-                """
-                DELETE FROM support_messages
-                WHERE user_id = ? AND role = 'admin_alert'
-                """,
-                (user_id,),
-            )
-            await db.commit()
+        await self.db_manager.execute_write(
+            """
+            DELETE FROM support_messages
+            WHERE user_id = ? AND role = 'admin_alert'
+            """,
+            (user_id,),
+        )
 
     async def delete_by_user(self, user_id: int) -> None:
-        async with aiosqlite.connect(self.db_manager.db_path) as db:
-            await db.execute(
-                """
-                DELETE FROM support_messages
-                WHERE user_id = ?
-                """,
-                (user_id,),
-            )
-            await db.commit()
+        await self.db_manager.execute_write(
+            """
+            DELETE FROM support_messages
+            WHERE user_id = ?
+            """,
+            (user_id,),
+        )
 
 
 __all__ = ["SupportRepository"]
@@ -0,0 +1,11 @@
+"""Cross-process cache invalidation."""
+
+from .bus import Invalidation, InvalidationBus, InvalidationEvent, InvalidationHandler, invalidation_bus
+
+__all__ = [
+    "Invalidation",
+    "InvalidationBus",
+    "InvalidationEvent",
+    "InvalidationHandler",
+    "invalidation_bus",
+]
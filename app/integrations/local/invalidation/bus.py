@@ -0,0 +1,174 @@
+"""Cache invalidation events shared between the TG and VK processes."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import socket
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Optional
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from config import INVALIDATION_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+class InvalidationEvent(str, Enum):
+    CALENDAR_EVENT_CHANGED = "calendar_event_changed"
+    SERVICE_CHANGED = "service_changed"
+    FAQ_CHANGED = "faq_changed"
+    ADMIN_CHANGED = "admin_changed"
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    event: InvalidationEvent
+    # What changed, e.g. an event or service id; None means "drop everything".
+    key: Optional[str] = None
+    origin: str = ""
+
+
+InvalidationHandler = Callable[[Invalidation], Optional[Awaitable[None]]]
+
+
+class InvalidationBus:
+    """Fan out invalidation events to local handlers and, once connected, over Redis pub/sub.
+
+    Without Redis the bus only reaches handlers in the current process, which
+    is all a single-process run needs. Messages from Redis that this process
+    published itself are skipped, since they were already handled locally.
+    After the subscription drops, every handler receives a ``key=None`` event,
+    because messages published in the meantime were lost.
+    """
+
+    def __init__(self, channel: str = INVALIDATION_CHANNEL):
+        self.channel = channel
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._handlers: dict[InvalidationEvent, list[InvalidationHandler]] = defaultdict(list)
+        self._redis: Redis | None = None
+        self._listener: asyncio.Task | None = None
+
+    @property
+    def is_distributed(self) -> bool:
+        return self._redis is not None
+
+    def subscribe(self, event: InvalidationEvent, handler: InvalidationHandler) -> None:
+        if handler not in self._handlers[event]:
+            self._handlers[event].append(handler)
+
+    def unsubscribe(self, event: InvalidationEvent, handler: InvalidationHandler) -> None:
+        if handler in self._handlers[event]:
+            self._handlers[event].remove(handler)
+
+    async def publish(self, event: InvalidationEvent, key: object | None = None) -> None:
+        message = Invalidation(event=event, key=None if key is None else str(key), origin=self.origin)
+        await self._dispatch(message)
+        if self._redis is None:
+            return
+        payload = {"event": message.event.value, "key": message.key, "origin": message.origin}
+        try:
+            await self._redis.publish(self.channel, json.dumps(payload))
+        except Exception:
+            logger.warning("Не удалось опубликовать инвалидацию %s через Redis", event.value, exc_info=True)
+
+    async def connect(self, redis_url: str) -> bool:
+        """Start relaying events through Redis; stay in-process if it is unreachable."""
+        if self._redis is not None:
+            return True
+        redis = Redis.from_url(redis_url, decode_responses=True)
+        try:
+            await redis.ping()
+        except Exception as e:
+            logger.warning(
+                "Redis недоступен по REDIS_URL=%s. Инвалидация кэшей работает только внутри процесса. Ошибка: %s",
+                redis_url,
+                e,
+            )
+            await redis.aclose()
+            return False
+
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        self._redis = redis
+        self._listener = asyncio.create_task(self._listen(pubsub))
+        return True
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            while True:
+                try:
+                    async for raw in pubsub.listen():
+                        if raw.get("type") != "message":
+                            continue
+                        message = self._decode(raw.get("data"))
+                        if message is not None and message.origin != self.origin:
+                            await self._dispatch(message)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.warning("Подписка на инвалидации Redis прервана, переподключение", exc_info=True)
+                    await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+                    try:
+                        await pubsub.subscribe(self.channel)
+                    except Exception:
+                        continue
+                    for event in InvalidationEvent:
+                        await self._dispatch(Invalidation(event=event))
+        finally:
+            await pubsub.aclose()
+
+    @staticmethod
+    def _decode(data) -> Invalidation | None:
+        try:
+            payload = json.loads(data)
+            return Invalidation(
+                event=InvalidationEvent(payload["event"]),
+                key=payload.get("key"),
+                origin=str(payload.get("origin") or ""),
+            )
+        except (TypeError, ValueError, KeyError):
+            logger.warning("Некорректное сообщение инвалидации: %r", data)
+            return None
+
+    async def _dispatch(self, message: Invalidation) -> None:
+        for handler in list(self._handlers[message.event]):
+            try:
+                result = handler(message)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Ошибка обработчика инвалидации %s", message.event.value)
+
+
+invalidation_bus = InvalidationBus()
+
+
+__all__ = [
+    "Invalidation",
+    "InvalidationBus",
+    "InvalidationEvent",
+    "InvalidationHandler",
+    "invalidation_bus",
+]
@@ -0,0 +1,10 @@
+"""Leader election between the bot processes."""
+
+from .election import LeaderElection, LeaseStore, RedisLeaseStore, leader_election
+
+__all__ = [
+    "LeaderElection",
+    "LeaseStore",
+    "RedisLeaseStore",
+    "leader_election",
+]
@@ -0,0 +1,208 @@
+"""Lease-based leader election for background jobs shared by the bot processes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Callable, Protocol
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from config import LEADER_KEY_PREFIX, LEADER_LEASE_TTL_SECONDS, LEADER_RENEW_INTERVAL_SECONDS
+from app.integrations.local.db import leader_lease_repo
+
+logger = logging.getLogger(__name__)
+
+# Extends the lease only while the caller still owns it.
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaseStore(Protocol):
+    async def acquire(self, name: str, owner: str, ttl_seconds: float) -> bool: ...
+
+    async def release(self, name: str, owner: str) -> None: ...
+
+
+class RedisLeaseStore:
+    """Leases as Redis keys: taken with ``SET NX PX``, renewed and released only by their owner."""
+
+    def __init__(self, redis: Redis, key_prefix: str = LEADER_KEY_PREFIX):
+        self.redis = redis
+        self.key_prefix = key_prefix
+
+    def _key(self, name: str) -> str:
+        return f"{self.key_prefix}:{name}"
+
+    async def acquire(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        key = self._key(name)
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        if await self.redis.set(key, owner, nx=True, px=ttl_ms):
+            return True
+        return bool(await self.redis.eval(_RENEW_SCRIPT, 1, key, owner, ttl_ms))
+
+    async def release(self, name: str, owner: str) -> None:
+        await self.redis.eval(_RELEASE_SCRIPT, 1, self._key(name), owner)
+
+
+class LeaderElection:
+    """Hold one lease per campaigned name and report which names this process leads.
+
+    Every ``renew_interval_seconds`` the process tries to take or renew each
+    lease. A lease counts as held only until ``ttl_seconds`` after the
+    attempt that took it, measured on the local monotonic clock, so a process
+    that cannot reach the store or stalls stops acting as leader before
+    another one may take over. A leader that dies is replaced within
+    ``ttl_seconds`` plus one renewal; one that stops cleanly releases its
+    leases right away. Without Redis the SQLite ``fallback_store`` is used.
+    """
+
+    def __init__(
+        self,
+        fallback_store: LeaseStore | None = None,
+        *,
+        key_prefix: str = LEADER_KEY_PREFIX,
+        ttl_seconds: float = LEADER_LEASE_TTL_SECONDS,
+        renew_interval_seconds: float = LEADER_RENEW_INTERVAL_SECONDS,
+        monotonic: Callable[[], float] = time.monotonic,
+    ):
+        if renew_interval_seconds >= ttl_seconds:
+            raise ValueError("Интервал продления лидерства должен быть меньше TTL аренды")
+        self.identity = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.store = fallback_store
+        self._fallback_store = fallback_store
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.renew_interval_seconds = renew_interval_seconds
+        self._monotonic = monotonic
+        self._names: set[str] = set()
+        self._held_until: dict[str, float] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._redis: Redis | None = None
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def campaign(self, name: str) -> None:
+        """Compete for ``name``; a running election tries to take it immediately."""
+        self._names.add(name)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def is_leader(self, name: str) -> bool:
+        held_until = self._held_until.get(name)
+        return held_until is not None and self._monotonic() < held_until
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call ``listener`` whenever a lease is gained or lost."""
+        self._listeners.append(listener)
+
+    async def connect(self, redis_url: str) -> bool:
+        """Keep leases in Redis; stay on the fallback store if it is unreachable."""
+        if self._redis is not None:
+            return True
+        redis = Redis.from_url(redis_url, decode_responses=True)
+        try:
+            await redis.ping()
+        except Exception as e:
+            logger.warning(
+                "Redis недоступен по REDIS_URL=%s. Аренда лидерства хранится в SQLite. Ошибка: %s",
+                redis_url,
+                e,
+            )
+            await redis.aclose()
+            return False
+        self._redis = redis
+        self.store = RedisLeaseStore(redis, self.key_prefix)
+        return True
+
+    async def start(self) -> None:
+        """Make a first round of attempts, then keep renewing in the background."""
+        await self.refresh()
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        held = list(self._held_until)
+        self._held_until.clear()
+        for name in held:
+            try:
+                await self.store.release(name, self.identity)
+            except Exception:
+                logger.warning("Не удалось освободить лидерство %s", name, exc_info=True)
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self.store = self._fallback_store
+
+    async def refresh(self) -> None:
+        """Take or renew every campaigned lease once."""
+        if self.store is None:
+            return
+        changed = False
+        for name in sorted(self._names):
+            held_until = self._monotonic() + self.ttl_seconds
+            try:
+                acquired = await self.store.acquire(name, self.identity, self.ttl_seconds)
+            except Exception:
+                logger.warning("Не удалось продлить лидерство %s", name, exc_info=True)
+                acquired = False
+            was_leader = self.is_leader(name)
+            if acquired:
+                self._held_until[name] = held_until
+            else:
+                self._held_until.pop(name, None)
+            if acquired != was_leader:
+                changed = True
+                logger.info("Лидерство %s %s", name, "получено" if acquired else "потеряно")
+        if changed:
+            for listener in list(self._listeners):
+                try:
+                    listener()
+                except Exception:
+                    logger.exception("Ошибка обработчика смены лидерства")
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.renew_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self.refresh()
+        finally:
+            self._wakeup = None
+
+
+leader_election = LeaderElection(leader_lease_repo)
+
+
+__all__ = [
+    "LeaderElection",
+    "LeaseStore",
+    "RedisLeaseStore",
+    "leader_election",
+]
@@ -0,0 +1,32 @@
+import asyncio
+import contextlib
+import logging
+import signal
+
+from app.interfaces.messenger.shared.runtime import messenger_runtime
+from app.interfaces.messenger.tg.main import poll_updates, telegram_bot
+from app.interfaces.messenger.vk.main import poll_events, vk_bot
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Telegram и VK в одном процессе и одном event loop.
+
+    База, кэш календаря, каталоги и справочник админов открываются один раз,
+    синхронизация календаря, напоминания обеих платформ и outbox работают
+    в общем планировщике. Оба бота получают события через polling.
+    """
+    with contextlib.suppress(NotImplementedError):
+        # SIGINT asyncio.run обрабатывает сам; SIGTERM от docker останавливает так же.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+    async with messenger_runtime("all") as scheduler:
+        async with telegram_bot(scheduler) as telegram, vk_bot(scheduler) as vk:
+            logger.info("Telegram и VK боты запущены в одном процессе")
+            async with asyncio.TaskGroup() as group:
+                group.create_task(poll_updates(telegram, handle_signals=False))
+                group.create_task(poll_events(vk))
+
+
+__all__ = ["main"]
@@ -0,0 +1,132 @@
+"""Cross-platform fan-out of admin notifications."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from aiogram import Bot as TelegramBot
+from vkbottle import API
+
+from config import TELEGRAM_BOT_TOKEN, VK_BOT_TOKEN
+from app.interfaces.messenger.shared.dispatch import DispatchResult
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AdminNotificationReport:
+    telegram: list[DispatchResult] = field(default_factory=list)
+    vk: list[DispatchResult] = field(default_factory=list)
+
+    @property
+    def delivered(self) -> int:
+        return sum(1 for result in self.telegram + self.vk if result.ok)
+
+    @property
+    def failed(self) -> list[DispatchResult]:
+        return [result for result in self.telegram + self.vk if not result.ok]
+
+
+class AdminNotifier:
+    """Deliver one notification to Telegram and VK admins at the same time.
+
+    Telegram and VK clients are created on first use and kept for the life
+    of the process, so a VK booking no longer opens and closes a Telegram
+    session per notification. Callers that already have a bot or API (the
+    handler's own) pass it in instead. Per-admin sends go through the
+    platform dispatchers, which bound concurrency and apply rate limits.
+    """
+
+    def __init__(self, telegram_bot_token: str | None = TELEGRAM_BOT_TOKEN, vk_token: str | None = VK_BOT_TOKEN):
+        self.telegram_bot_token = telegram_bot_token
+        self.vk_token = vk_token
+        self._telegram_bot: TelegramBot | None = None
+        self._vk_api: API | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    async def notify(
+        self,
+        *,
+        telegram=None,
+        vk=None,
+        telegram_bot: TelegramBot | None = None,
+        vk_api: API | None = None,
+    ) -> AdminNotificationReport:
+        telegram_results, vk_results = await asyncio.gather(
+            self._notify_telegram(telegram, telegram_bot),
+            self._notify_vk(vk, vk_api),
+        )
+        report = AdminNotificationReport(telegram=telegram_results, vk=vk_results)
+        if report.failed:
+            logger.warning(
+                "Админские уведомления доставлены не всем: %s из %s",
+                report.delivered,
+                report.delivered + len(report.failed),
+            )
+        return report
+
+    def notify_in_background(self, **kwargs) -> asyncio.Task:
+        """Start ``notify`` without making the caller wait for the HTTP calls."""
+        task = asyncio.create_task(self.notify(**kwargs))
+        self._pending.add(task)
+        task.add_done_callback(self._on_background_done)
+        return task
+
+    async def close(self) -> None:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._telegram_bot is not None:
+            await self._telegram_bot.session.close()
+            self._telegram_bot = None
+        if self._vk_api is not None:
+            await self._vk_api.http_client.close()
+            self._vk_api = None
+
+    async def _notify_telegram(self, notification, bot: TelegramBot | None) -> list[DispatchResult]:
+        # Imported here: both bot packages import this module from their handlers.
+        from app.interfaces.messenger.tg.services.admin_notifications import send_telegram_admin_notification
+
+        if not notification:
+            return []
+        if bot is None:
+            if not self.telegram_bot_token:
+                return []
+            if self._telegram_bot is None:
+                self._telegram_bot = TelegramBot(token=self.telegram_bot_token)
+            bot = self._telegram_bot
+        try:
+            return await send_telegram_admin_notification(notification=notification, bot=bot)
+        except Exception:
+            logger.exception("Ошибка рассылки админского уведомления в Telegram")
+            return []
+
+    async def _notify_vk(self, notification, api: API | None) -> list[DispatchResult]:
+        from app.interfaces.messenger.vk.services.admin_notifications import build_vk_api, send_vk_admin_notification
+
+        if not notification:
+            return []
+        if api is None:
+            if not self.vk_token:
+                return []
+            if self._vk_api is None:
+                self._vk_api = build_vk_api()
+            api = self._vk_api
+        try:
+            return await send_vk_admin_notification(notification=notification, api=api)
+        except Exception:
+            logger.exception("Ошибка рассылки админского уведомления в VK")
+            return []
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Ошибка фоновой рассылки админских уведомлений", exc_info=task.exception())
+
+
+admin_notifier = AdminNotifier()
+
+
+__all__ = ["AdminNotificationReport", "AdminNotifier", "admin_notifier"]
@@ -0,0 +1,208 @@
+"""Rate-limited, concurrent delivery of outgoing messenger messages."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Iterable, Optional
+
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from aiohttp import ClientError
+from vkbottle import VKAPIError
+
+from config import (
+    MESSAGE_DISPATCH_CONCURRENCY,
+    MESSAGE_DISPATCH_MAX_ATTEMPTS,
+    TELEGRAM_SEND_RATE_PER_SECOND,
+    VK_SEND_RATE_PER_SECOND,
+)
+
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# VK API error codes: too many requests per second, flood control, internal error.
+VK_TOO_MANY_REQUESTS = 6
+VK_FLOOD_CONTROL = 9
+VK_INTERNAL_ERROR = 10
+
+
+class TokenBucket:
+    """Classic token bucket shared by every sender of one platform.
+
+    ``pause`` empties the bucket until a deadline, which is how a flood-wait
+    reported by the platform slows down all in-flight jobs, not only the one
+    that hit it.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await self._sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                # The epsilon keeps float rounding from spinning on tiny sleeps.
+                if self._tokens >= 1 - 1e-9:
+                    self._tokens = max(0.0, self._tokens - 1)
+                    return
+                await self._sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        now = self._clock()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated_at = self._paused_until
+
+
+@dataclass(frozen=True)
+class RetryAdvice:
+    # Wait requested by the platform; None means exponential backoff.
+    delay: float | None = None
+    # Pause the whole platform bucket, not only this job.
+    throttle: bool = False
+
+
+RetryClassifier = Callable[[BaseException], Optional[RetryAdvice]]
+
+
+@dataclass(frozen=True)
+class DispatchResult:
+    key: Hashable
+    ok: bool
+    attempts: int
+    error: BaseException | None = None
+
+
+class MessageDispatcher:
+    """Send jobs through one platform's token bucket with bounded concurrency.
+
+    A job is a zero-argument coroutine function that performs one API call.
+    Failures are retried up to ``max_attempts`` times when ``classify``
+    returns a ``RetryAdvice``; anything else is reported as a failed result,
+    so one bad chat never stops the rest of a batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        rate: float,
+        classify: RetryClassifier,
+        concurrency: int = MESSAGE_DISPATCH_CONCURRENCY,
+        max_attempts: int = MESSAGE_DISPATCH_MAX_ATTEMPTS,
+        backoff_base: float = BACKOFF_BASE_SECONDS,
+        backoff_max: float = BACKOFF_MAX_SECONDS,
+        bucket: TokenBucket | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.name = name
+        self.bucket = bucket or TokenBucket(rate)
+        self.classify = classify
+        self.concurrency = max(1, int(concurrency))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def send(self, key: Hashable, job: Callable[[], Awaitable[object]]) -> DispatchResult:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            attempt = 0
+            while True:
+                attempt += 1
+                await self.bucket.acquire()
+                try:
+                    await job()
+                    return DispatchResult(key=key, ok=True, attempts=attempt)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    advice = self.classify(exc)
+                    if advice is None or attempt >= self.max_attempts:
+                        logger.warning("Не удалось отправить %s-сообщение %s: %s", self.name, key, exc)
+                        return DispatchResult(key=key, ok=False, attempts=attempt, error=exc)
+                    delay = self._retry_delay(attempt, advice)
+                    if advice.throttle:
+                        self.bucket.pause(delay)
+                    logger.info("Повтор %s-сообщения %s через %.1f сек.: %s", self.name, key, delay, exc)
+                    await self._sleep(delay)
+
+    async def send_all(self, jobs: Iterable[tuple[Hashable, Callable[[], Awaitable[object]]]]) -> list[DispatchResult]:
+        return list(await asyncio.gather(*(self.send(key, job) for key, job in jobs)))
+
+    def _retry_delay(self, attempt: int, advice: RetryAdvice) -> float:
+        if advice.delay is not None:
+            return float(advice.delay)
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+
+def telegram_retry_advice(exc: BaseException) -> RetryAdvice | None:
+    if isinstance(exc, TelegramRetryAfter):
+        return RetryAdvice(delay=exc.retry_after, throttle=True)
+    if isinstance(exc, (TelegramNetworkError, TelegramServerError, asyncio.TimeoutError)):
+        return RetryAdvice()
+    return None
+
+
+def vk_retry_advice(exc: BaseException) -> RetryAdvice | None:
+    if isinstance(exc, VKAPIError):
+        if exc.code in (VK_TOO_MANY_REQUESTS, VK_FLOOD_CONTROL):
+            return RetryAdvice(throttle=True)
+        if exc.code == VK_INTERNAL_ERROR:
+            return RetryAdvice()
+        return None
+    if isinstance(exc, (ClientError, asyncio.TimeoutError)):
+        return RetryAdvice()
+    return None
+
+
+telegram_dispatcher = MessageDispatcher(
+    "telegram",
+    rate=TELEGRAM_SEND_RATE_PER_SECOND,
+    classify=telegram_retry_advice,
+)
+vk_dispatcher = MessageDispatcher(
+    "vk",
+    rate=VK_SEND_RATE_PER_SECOND,
+    classify=vk_retry_advice,
+)
+
+
+__all__ = [
+    "DispatchResult",
+    "MessageDispatcher",
+    "RetryAdvice",
+    "TokenBucket",
+    "telegram_dispatcher",
+    "telegram_retry_advice",
+    "vk_dispatcher",
+    "vk_retry_advice",
+]
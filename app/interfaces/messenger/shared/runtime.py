@@ -0,0 +1,127 @@
+"""Process-wide resources shared by the Telegram and VK bots."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from config import CALENDAR_CACHE_SYNC_INTERVAL_SECONDS, CALENDAR_CACHE_SYNC_JITTER_SECONDS, REDIS_URL
+from app.bootstrap import install_asyncio_exception_handler
+from app.bootstrap.scheduler import IntervalTrigger, Scheduler
+from app.core.modules.booking.admin_notifications import build_failed_booking_admin_notifications
+from app.integrations.local.calendar.cache_sync import run_calendar_cache_sync, sync_calendar_cache
+from app.integrations.local.calendar.executor import calendar_executor
+from app.integrations.local.calendar.outbox import calendar_outbox_worker
+from app.integrations.local.calendar.outbox_repo import CalendarOutboxEntry
+from app.integrations.local.calendar.service import reload_calendar_indexes
+from app.integrations.local.db import db_manager, scheduler_job_repo
+from app.integrations.local.invalidation import invalidation_bus
+from app.integrations.local.leader import leader_election
+from app.interfaces.messenger.shared.admin_notifier import admin_notifier
+
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_CACHE_SYNC_JOB = "calendar_cache_sync"
+
+
+async def _reload_indexes_if_follower() -> None:
+    if not leader_election.is_leader(CALENDAR_CACHE_SYNC_JOB):
+        await reload_calendar_indexes()
+
+
+async def alert_admins_about_failed_booking(entry: CalendarOutboxEntry, error: str) -> None:
+    """Tell admins that a booking confirmed to the client was dropped by the outbox."""
+    telegram, vk = build_failed_booking_admin_notifications(
+        title=entry.title,
+        start_time=entry.start_time,
+        end_time=entry.end_time,
+        description=entry.description,
+        error=error,
+    )
+    await admin_notifier.notify(telegram=telegram, vk=vk)
+
+
+@asynccontextmanager
+async def messenger_runtime(
+    owner_name: str,
+    *,
+    background_jobs: bool = True,
+    require_redis: bool = False,
+) -> AsyncIterator[Scheduler | None]:
+    """Open the database, invalidation bus and calendar background work once per process.
+
+    With ``background_jobs`` the periodic calendar sync and the outbox run,
+    and the started scheduler is yielded so each bot can add its reminder
+    jobs to it. Scheduled jobs run only in the process that leads them, and
+    only the leader of the calendar sync syncs the cache at start; the
+    others see its changes through ``calendar_event_changed``, or re-read
+    the shared cache periodically when Redis is unavailable. Bots hosted
+    in the same process share all of this; without background jobs ``None``
+    is yielded.
+
+    Processes started without background jobs never re-read the cache on
+    their own, so with ``require_redis`` an unreachable Redis fails the
+    start instead of leaving them with a stale busy index.
+    """
+    install_asyncio_exception_handler(asyncio.get_running_loop())
+    await db_manager.init_database()
+    logger.info("База данных инициализирована")
+    if not await invalidation_bus.connect(REDIS_URL) and require_redis:
+        await db_manager.close()
+        raise RuntimeError(f"Redis недоступен по REDIS_URL={REDIS_URL}, а инвалидация кэшей нужна всем воркерам")
+
+    scheduler = None
+    local_scheduler = None
+    if background_jobs:
+        await leader_election.connect(REDIS_URL)
+        scheduler = Scheduler(scheduler_job_repo, leadership=leader_election)
+        leader_election.add_listener(scheduler.wake)
+        # One job name across processes, so only one of them syncs the shared cache.
+        scheduler.add_job(
+            CALENDAR_CACHE_SYNC_JOB,
+            lambda: run_calendar_cache_sync(owner_name),
+            IntervalTrigger(CALENDAR_CACHE_SYNC_INTERVAL_SECONDS),
+            jitter_seconds=CALENDAR_CACHE_SYNC_JITTER_SECONDS,
+        )
+        await leader_election.start()
+        if leader_election.is_leader(CALENDAR_CACHE_SYNC_JOB):
+            try:
+                synced_count = await sync_calendar_cache(force=True)
+                logger.info("Календарный кэш инициализирован: %s событий", synced_count)
+            except Exception:
+                logger.exception("Не удалось выполнить первичную синхронизацию календарного кэша")
+        else:
+            logger.info("Календарный кэш синхронизирует процесс-лидер")
+        scheduler.start()
+        calendar_outbox_worker.on_failed = alert_admins_about_failed_booking
+        calendar_outbox_worker.start()
+        if not invalidation_bus.is_distributed:
+            # Without Redis the leader's sync is not announced to other processes,
+            # so followers re-read the shared cache on the sync interval instead.
+            local_scheduler = Scheduler()
+            local_scheduler.add_job(
+                "calendar_index_reload",
+                _reload_indexes_if_follower,
+                IntervalTrigger(CALENDAR_CACHE_SYNC_INTERVAL_SECONDS),
+            )
+            local_scheduler.start()
+
+    try:
+        yield scheduler
+    finally:
+        if local_scheduler is not None:
+            await local_scheduler.stop()
+        if scheduler is not None:
+            await scheduler.stop()
+            await leader_election.stop()
+            await calendar_outbox_worker.stop()
+        await admin_notifier.close()
+        await invalidation_bus.close()
+        await db_manager.close()
+        calendar_executor.shutdown()
+
+
+__all__ = ["alert_admins_about_failed_booking", "messenger_runtime"]
@@ -20,10 +20,14 @@ from app.interfaces.messenger.tg.services.calendar_queries import (
     is_calendar_available,
     list_events as svc_list_events,
     get_event as svc_get_event,
+    get_booking_contact as svc_get_booking_contact,
+    list_linked_event_ids as svc_list_linked_event_ids,
     delete_event as svc_delete_event,
 )
-from app.interfaces.messenger.tg.services.contact_utils import (
+from app.integrations.local.calendar.projection import (
     extract_booking_contact_details as svc_extract_booking_contact_details,
+)
+from app.interfaces.messenger.tg.services.contact_utils import (
     normalize_phone as svc_normalize_phone,
     format_phone_plus7 as svc_format_phone_plus7,
 )
@@ -423,6 +427,7 @@ async def admin_booking_open(callback: CallbackQuery, is_admin: bool):
         extract_contact_details=_extract_booking_contact_details,
         normalize_phone=_normalize_phone,
         client_repo=client_repo,
+        get_booking_contact=svc_get_booking_contact,
     )
     if result.status != "ok":
         await callback.answer(result.text, show_alert=True)
@@ -453,7 +458,7 @@ async def admin_booking_cancel(callback: CallbackQuery, is_admin: bool):
     result = await cancel_admin_booking_event(
         event_id=event_id,
         is_calendar_available=is_calendar_available,
-        list_events=svc_list_events,
+        list_linked_event_ids=svc_list_linked_event_ids,
         delete_event=svc_delete_event,
     )
     if result == "calendar_unavailable":
@@ -17,9 +17,13 @@ from app.interfaces.messenger.tg.keyboards import (
 )
 from app.interfaces.messenger.tg.states import BookingStates
 from app.core.modules.booking.availability import (
+    SLOT_HELD_MESSAGE,
     build_default_time_slots as svc_build_default_time_slots,
+    get_availability_for_range as svc_get_availability_for_range,
     get_time_slots_for_date as svc_get_time_slots_for_date,
+    hold_booking_slot,
     is_booking_available as svc_is_booking_available,
+    release_booking_slot,
 )
 from app.core.modules.booking.extra_services import (
     build_extra_service_booking_label,
@@ -79,6 +83,7 @@ from app.core.modules.booking.presentation import (
     build_telegram_calendar_description,
     build_telegram_confirmation_text,
 )
+from app.core.modules.booking.calendar_event import CalendarSlotTakenError
 from app.core.modules.booking.use_case import create_booking_use_case
 from app.core.modules.booking.validation import (
     normalize_and_format_phone,
@@ -96,19 +101,19 @@ from app.interfaces.messenger.tg.services.booking_formatters import (
     format_booking_guests as svc_format_booking_guests,
     format_extras_display as svc_format_extras_display,
 )
-from app.interfaces.messenger.tg.services.admin_notifications import send_telegram_admin_notification
-from app.interfaces.messenger.vk.services.admin_notifications import send_vk_admin_notification
-from app.integrations.local.db import extra_service_repo, service_repo
+from app.interfaces.messenger.shared.admin_notifier import admin_notifier
+from app.integrations.local.db import catalog
 
 logger = logging.getLogger(__name__)
 
 # Опциональный импорт Google Calendar
 try:
-    from app.integrations.local.calendar.service import GoogleCalendarService
+    from app.integrations.local.calendar.service import GoogleCalendarService, get_calendar_service
     CALENDAR_AVAILABLE = True
     logger.info("Google Calendar импортирован успешно")
 except ImportError as e:
     GoogleCalendarService = None
+    get_calendar_service = None
     CALENDAR_AVAILABLE = False
     logger.warning("Google Calendar недоступен: %s", e)
     logger.info("Установите зависимости: pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib")
@@ -132,12 +137,17 @@ def _get_max_guests_from_state(data: dict) -> int:
 def _build_default_time_slots(duration_minutes: int = 60, all_day: bool = False) -> list[dict]:
     return svc_build_default_time_slots(duration_minutes=duration_minutes, all_day=all_day)
 
+def _slot_holder(state: FSMContext) -> str:
+    return f"telegram:{state.key.user_id}"
+
+
 async def _get_time_slots_for_date(
     target_date: date,
     service_id: int,
     service_name: str | None,
     duration_minutes: int = 60,
     all_day: bool = False,
+    holder: str | None = None,
 ) -> tuple[list[dict], bool, str | None]:
     return await svc_get_time_slots_for_date(
         target_date=target_date,
@@ -145,6 +155,20 @@ async def _get_time_slots_for_date(
         service_name=service_name,
         duration_minutes=duration_minutes,
         all_day=all_day,
+        holder=holder,
+    )
+
+
+async def _get_week_availability(state: FSMContext, week_offset: int = 0) -> dict[date, int] | None:
+    data = await state.get_data()
+    booking_data = data.get("booking_data", {})
+    start_date = datetime.now().date() + timedelta(days=week_offset * 7)
+    return await svc_get_availability_for_range(
+        start_date,
+        7,
+        duration_minutes=booking_data.get("duration") or _get_min_duration_from_state(data),
+        all_day=bool(booking_data.get("is_all_day")),
+        holder=_slot_holder(state),
     )
 
 
@@ -154,6 +178,7 @@ async def _is_booking_available(
     duration_minutes: int,
     service_id: int,
     service_name: str | None,
+    holder: str | None = None,
 ) -> tuple[bool, str | None]:
     return await svc_is_booking_available(
         target_date=target_date,
@@ -161,6 +186,7 @@ async def _is_booking_available(
         duration_minutes=duration_minutes,
         service_id=service_id,
         service_name=service_name,
+        holder=holder,
     )
 
 def _format_booking_date(date_value) -> str:
@@ -283,7 +309,7 @@ async def _update_booking_data_and_show_form(message: Message, state: FSMContext
 async def start_booking(callback: CallbackQuery, state: FSMContext):
     """Начало бронирования."""
     service_id = int(callback.data.split("_")[2])
-    service = await service_repo.get_by_id(service_id)
+    service = await catalog.get_service(service_id)
     
     if not service:
         await callback.answer("Услуга не найдена", show_alert=True)
@@ -394,7 +420,7 @@ async def _show_time_selection_for_date(
         duration_minutes = booking_data.get("duration") or _get_min_duration_from_state(data)
         is_all_day = bool(booking_data.get("is_all_day"))
         time_slots, used_calendar, calendar_error = await _get_time_slots_for_date(
-            selected_date_obj, service_id, service_name, duration_minutes, all_day=is_all_day
+            selected_date_obj, service_id, service_name, duration_minutes, all_day=is_all_day, holder=_slot_holder(state)
         )
 
         if not time_slots and used_calendar:
@@ -448,7 +474,7 @@ async def select_date(callback: CallbackQuery, state: FSMContext):
     
     await callback.message.edit_text(
         build_date_selection_text(html=True),
-        reply_markup=get_date_selection_keyboard(service_id),
+        reply_markup=get_date_selection_keyboard(service_id, availability=await _get_week_availability(state)),
         parse_mode="HTML"
     )
 
@@ -491,7 +517,11 @@ async def date_prev_week(callback: CallbackQuery, state: FSMContext):
     
     await callback.message.edit_text(
         build_date_selection_text(html=True),
-        reply_markup=get_date_selection_keyboard(service_id, week_offset),
+        reply_markup=get_date_selection_keyboard(
+            service_id,
+            week_offset,
+            availability=await _get_week_availability(state, week_offset),
+        ),
         parse_mode="HTML"
     )
 
@@ -503,7 +533,11 @@ async def date_next_week(callback: CallbackQuery, state: FSMContext):
     
     await callback.message.edit_text(
         build_date_selection_text(html=True),
-        reply_markup=get_date_selection_keyboard(service_id, week_offset),
+        reply_markup=get_date_selection_keyboard(
+            service_id,
+            week_offset,
+            availability=await _get_week_availability(state, week_offset),
+        ),
         parse_mode="HTML"
     )
 
@@ -602,6 +636,10 @@ async def confirm_time_selection(callback: CallbackQuery, state: FSMContext):
             print(f"Ошибка пересчета режима 'весь день': {e}")
     if 'service_name' not in booking_data:
         booking_data['service_name'] = data.get('service_name', '')
+    held, reason = await hold_booking_slot(_slot_holder(state), booking_data, _get_min_duration_from_state(data))
+    if not held:
+        await callback.answer(reason, show_alert=True)
+        return
     await state.update_data(booking_data=booking_data)
     
     await show_booking_form(callback, state)
@@ -807,7 +845,7 @@ async def process_guests_count_input(message: Message, state: FSMContext):
     service_id = data.get('service_id')
     max_guests = _get_max_guests_from_state(data)
     if service_id:
-        service = await service_repo.get_by_id(service_id)
+        service = await catalog.get_service(service_id)
         if service:
             max_guests = _normalize_max_guests(service.max_num_clients)
             await state.update_data(max_num_clients=max_guests)
@@ -826,9 +864,7 @@ async def start_duration_input(callback: CallbackQuery, state: FSMContext):
     parts = callback.data.split("_")
     service_id = int(parts[2])
 
-    from app.integrations.local.db import service_repo
-
-    service = await service_repo.get_by_id(service_id)
+    service = await catalog.get_service(service_id)
     
     if service:
         min_duration = _normalize_min_duration_minutes(service.min_duration_minutes)
@@ -871,7 +907,7 @@ async def select_duration_option(callback: CallbackQuery, state: FSMContext):
         await callback.answer("Длительность должна быть кратна 60 минутам", show_alert=True)
         return
 
-    service = await service_repo.get_by_id(service_id)
+    service = await catalog.get_service(service_id)
     min_duration = _get_min_duration_from_state(data)
     if service:
         min_duration = _normalize_min_duration_minutes(service.min_duration_minutes)
@@ -907,6 +943,7 @@ async def select_duration_option(callback: CallbackQuery, state: FSMContext):
                 duration_for_check,
                 service_id,
                 service_name,
+                holder=_slot_holder(state),
             )
             if not ok:
                 await callback.answer(
@@ -931,6 +968,10 @@ async def select_duration_option(callback: CallbackQuery, state: FSMContext):
         booking_data['duration'] = duration
     if 'service_name' not in booking_data:
         booking_data['service_name'] = data.get('service_name', '')
+    held, reason = await hold_booking_slot(_slot_holder(state), booking_data, duration)
+    if not held:
+        await callback.answer(reason, show_alert=True)
+        return
     await state.update_data(booking_data=booking_data)
     await state.set_state(BookingStates.filling_form)
     await show_booking_form(callback, state)
@@ -975,7 +1016,7 @@ async def process_duration_input(message: Message, state: FSMContext):
     service_id = data.get('service_id')
 
     if service_id:
-        service = await service_repo.get_by_id(service_id)
+        service = await catalog.get_service(service_id)
         min_duration = _get_min_duration_from_state(data)
         if service:
             min_duration = _normalize_min_duration_minutes(service.min_duration_minutes)
@@ -1001,6 +1042,7 @@ async def process_duration_input(message: Message, state: FSMContext):
                 duration,
                 service_id or 0,
                 service_name,
+                holder=_slot_holder(state),
             )
             if not ok:
                 await message.answer(
@@ -1018,6 +1060,13 @@ async def process_duration_input(message: Message, state: FSMContext):
     booking_data['is_all_day'] = False
     if 'service_name' not in booking_data:
         booking_data['service_name'] = data.get('service_name', '')
+    held, reason = await hold_booking_slot(_slot_holder(state), booking_data, duration)
+    if not held:
+        await message.answer(
+            f"⚠️ {reason}",
+            reply_markup=get_booking_form_keyboard(service_id, booking_data),
+        )
+        return
     await state.update_data(booking_data=booking_data)
 
     await state.set_state(BookingStates.filling_form)
@@ -1077,7 +1126,7 @@ async def start_extras_input(callback: CallbackQuery, state: FSMContext):
         for extra_id in booking_data.get("extras", [])
         if isinstance(extra_id, int) or (isinstance(extra_id, str) and extra_id.isdigit())
     ]
-    available_extras = await extra_service_repo.get_all_active()
+    available_extras = await catalog.get_active_extra_services()
     extra_labels = build_extra_service_label_map(available_extras)
     booking_data["extra_labels"] = extra_labels
     await state.update_data(booking_data=booking_data)
@@ -1198,7 +1247,7 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
 
     missing_names = get_missing_booking_field_labels(booking_data)
 
-    service = await service_repo.get_by_id(service_id)
+    service = await catalog.get_service(service_id)
     if service and booking_data.get('guests_count'):
         max_guests = _normalize_max_guests(service.max_num_clients)
         if int(booking_data['guests_count']) > max_guests:
@@ -1227,7 +1276,7 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
     
     if CALENDAR_AVAILABLE and GoogleCalendarService:
         try:
-            calendar_service = GoogleCalendarService()
+            calendar_service = get_calendar_service()
             
             ok, reason = await _is_booking_available(
                 selected_date,
@@ -1235,6 +1284,7 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
                 duration_minutes,
                 service_id,
                 service_name,
+                holder=_slot_holder(state),
             )
             if not ok:
                 await callback.answer(
@@ -1266,7 +1316,7 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
     if CALENDAR_AVAILABLE and GoogleCalendarService:
         print(f"[CALENDAR] Попытка создания события в календаре для {_format_full_name(booking_data)}")
         print(f"[CALENDAR] Создание события: {event_start} - {event_end}")
-        print("[CALENDAR] Вызов calendar_service.create_event...")
+        print("[CALENDAR] Вызов calendar_service.reserve_event...")
     else:
         print(f"[WARNING] Календарь недоступен. CALENDAR_AVAILABLE={CALENDAR_AVAILABLE}, GoogleCalendarService={GoogleCalendarService}")
 
@@ -1281,6 +1331,7 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
     phone_display = booking_data['phone']
     phone_html = f"<code>{phone_display}</code>"
 
+    slot_taken = False
     try:
         use_case_result = await create_booking_use_case(
             booking_data=booking_data,
@@ -1292,9 +1343,10 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
             event_start=event_start,
             event_end=event_end,
             calendar_available=CALENDAR_AVAILABLE,
-            calendar_service_cls=GoogleCalendarService,
+            calendar_service_factory=get_calendar_service,
             calendar_description=build_telegram_calendar_description(preview_summary, telegram_link=telegram_link),
             sync_client=_sync_client,
+            slot_holder=_slot_holder(state),
             admin_notification_builder=lambda summary: build_telegram_booking_admin_notification(
                 summary=summary,
                 phone_html=phone_html,
@@ -1304,6 +1356,7 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
         )
         summary = use_case_result.summary
         calendar_result = use_case_result.finalize_result.calendar_result
+        slot_taken = isinstance(calendar_result.error, CalendarSlotTakenError)
         notification = use_case_result.admin_notification
         vk_notification = build_telegram_booking_admin_notification_for_vk(
             summary=summary,
@@ -1311,7 +1364,7 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
             username=username,
         )
         if calendar_result.created:
-            print(f"[CALENDAR] Событие успешно создано в календаре: {calendar_result.payload.get('htmlLink', 'N/A')}")
+            print(f"[CALENDAR] Слот забронирован, событие {calendar_result.payload['id']} ждёт отправки в календарь")
         elif calendar_result.error:
             print(f"[ERROR] Ошибка создания события в календаре: {calendar_result.error}")
             print(f"[ERROR] Тип ошибки: {type(calendar_result.error).__name__ if calendar_result.error else 'unknown'}")
@@ -1330,18 +1383,17 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
             username=username,
         )
 
-    try:
-        await send_telegram_admin_notification(
-            notification=notification,
-            bot=callback.bot,
-        )
-    except Exception as e:
-        print(f"Ошибка админского уведомления: {e}")
+    if slot_taken:
+        # Слот заняли раньше: бронирование не состоялось, форма остаётся для выбора другого времени
+        await release_booking_slot(_slot_holder(state))
+        await callback.answer(SLOT_HELD_MESSAGE, show_alert=True)
+        return
 
-    try:
-        await send_vk_admin_notification(notification=vk_notification)
-    except Exception as e:
-        print(f"Ошибка VK-уведомления администраторам: {e}")
+    admin_notifier.notify_in_background(
+        telegram=notification,
+        vk=vk_notification,
+        telegram_bot=callback.bot,
+    )
 
     await callback.message.edit_text(
         build_telegram_confirmation_text(summary),
@@ -1352,6 +1404,7 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 async def cancel_booking(callback: CallbackQuery, state: FSMContext):
     """Отмена бронирования."""
+    await release_booking_slot(_slot_holder(state))
     await state.clear()
     await callback.message.edit_text(
         "❌ <b>Бронирование отменено</b>\n\n"
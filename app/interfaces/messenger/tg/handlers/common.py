@@ -10,7 +10,7 @@ from app.interfaces.messenger.tg.keyboards import (
     get_clients_management_keyboard, get_admins_management_keyboard
 )
 from app.interfaces.messenger.tg.states import SupportStates
-from app.integrations.local.db import admin_repo, support_repo, faq_repo
+from app.integrations.local.db import admin_directory, support_repo, faq_repo
 from app.core.modules.support.common import (
     build_faq_list_text,
     get_faq_page_data,
@@ -155,7 +155,7 @@ async def faq_contact_callback(callback: CallbackQuery, state: FSMContext):
 async def support_user_message(message: Message, state: FSMContext):
     """Сообщение пользователя в поддержку"""
     support_request = await prepare_telegram_support_request(
-        admin_repo=admin_repo,
+        admin_repo=admin_directory,
         support_repo=support_repo,
         user_id=message.from_user.id,
         chat_id=message.chat.id,
@@ -229,7 +229,7 @@ async def support_end_callback(callback: CallbackQuery, state: FSMContext):
 
     # Уведомляем администраторов о завершении диалога
     try:
-        admins = await admin_repo.get_all()
+        admins = await admin_directory.get_all()
         active_admins = [a for a in admins if a.is_active and a.telegram_id]
         if active_admins:
             end_text = (
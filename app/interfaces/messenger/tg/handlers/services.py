@@ -9,7 +9,7 @@ from app.interfaces.messenger.tg.keyboards import (
     get_service_details_keyboard,
 )
 from app.core.modules.services.details import build_service_details_text
-from app.integrations.local.db import service_repo
+from app.integrations.local.db import catalog
 from app.interfaces.messenger.tg.services.service_media import (
     send_service_cover,
     send_service_gallery,
@@ -23,7 +23,7 @@ logger = logging.getLogger(__name__)
 async def show_service_details(callback: CallbackQuery, state: FSMContext):
     """Показ деталей услуги."""
     service_id = int(callback.data.split("_")[1])
-    service = await service_repo.get_by_id(service_id)
+    service = await catalog.get_service(service_id)
 
     if not service:
         await callback.answer("Услуга не найдена", show_alert=True)
@@ -59,7 +59,7 @@ async def show_service_details(callback: CallbackQuery, state: FSMContext):
 async def show_photos(callback: CallbackQuery):
     """Показ фотографий услуги."""
     service_id = int(callback.data.split("_")[1])
-    service = await service_repo.get_by_id(service_id)
+    service = await catalog.get_service(service_id)
 
     if not service:
         await callback.answer("Услуга не найдена", show_alert=True)
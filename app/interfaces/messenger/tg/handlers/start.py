@@ -12,12 +12,12 @@ from app.interfaces.messenger.tg.keyboards import (
     get_active_booking_actions_keyboard,
 )
 from app.interfaces.messenger.tg.states import BookingStates
-from app.integrations.local.db import client_service, service_repo
+from app.integrations.local.db import catalog, client_service
 from app.interfaces.messenger.tg.services.calendar_queries import (
     is_calendar_available,
     get_user_calendar_events_by_telegram_id,
     delete_event,
-    list_events,
+    list_linked_event_ids,
 )
 
 async def start_command(message: Message, state: FSMContext, is_admin: bool = False):
@@ -63,7 +63,7 @@ async def main_menu_callback(callback: CallbackQuery, state: FSMContext, is_admi
         return
     elif callback.data == "services":
         # Показываем услуги
-        services = await service_repo.get_all_active()
+        services = await catalog.get_active_services()
         text = "📸 <b>Наши услуги:</b>\n\nВыберите услугу для бронирования:"
         try:
             await callback.message.edit_text(
@@ -269,17 +269,8 @@ async def active_booking_cancel_callback(callback: CallbackQuery):
 
         # Удаляем связанную доп. услугу (Service ID: 9), если найдется
         try:
-            all_events = await list_events(period_start, period_end)
-            marker = f"Связано с событием: {event_id}"
-            linked_events = [
-                e for e in all_events
-                if marker in (e.get("description") or "")
-                and "Service ID: 9" in (e.get("description") or "")
-            ]
-            for linked in linked_events:
-                linked_id = linked.get("id")
-                if linked_id:
-                    await delete_event(linked_id)
+            for linked_id in await list_linked_event_ids(event_id):
+                await delete_event(linked_id)
         except Exception as e:
             print(f"Ошибка удаления связанной услуги id=9: {e}")
 
@@ -99,8 +99,15 @@ def get_booking_other_keyboard(service_id: int, booking_data: dict = None) -> In
         ])
     keyboard.append([InlineKeyboardButton(text="🔙 К форме", callback_data=f"booking_back_from_other_{service_id}")])
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
-def get_date_selection_keyboard(service_id: int, week_offset: int = 0) -> InlineKeyboardMarkup:
-    """Клавиатура выбора даты с перелистыванием"""
+def get_date_selection_keyboard(
+    service_id: int,
+    week_offset: int = 0,
+    availability: dict | None = None,
+) -> InlineKeyboardMarkup:
+    """Клавиатура выбора даты с перелистыванием.
+
+    ``availability`` — число свободных слотов по датам; дни без слотов помечаются.
+    """
     keyboard = []
     
     # Вычисляем даты для текущей недели
@@ -113,11 +120,15 @@ def get_date_selection_keyboard(service_id: int, week_offset: int = 0) -> Inline
         day_name = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"][date.weekday()]
         date_str = date.strftime("%d.%m")
         
+        is_full = availability is not None and availability.get(date) == 0
+        icon = "🚫" if is_full else "📅"
         # Выделяем сегодняшний день
         if date == today:
-            text = f"📅 {day_name} {date_str} (сегодня)"
+            text = f"{icon} {day_name} {date_str} (сегодня)"
         else:
-            text = f"📅 {day_name} {date_str}"
+            text = f"{icon} {day_name} {date_str}"
+        if is_full:
+            text = f"{text} — нет мест"
         
         keyboard.append([
             InlineKeyboardButton(
@@ -1,63 +1,106 @@
 import asyncio
 import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
-from config import TELEGRAM_BOT_TOKEN
-from app.bootstrap import install_asyncio_exception_handler
-from app.integrations.local.db import db_manager
-from app.integrations.local.calendar.cache_sync import run_calendar_cache_sync_loop, sync_calendar_cache
+from config import (
+    REDIS_URL,
+    TELEGRAM_BOT_TOKEN,
+    TG_REDIS_KEY_PREFIX,
+    TG_REDIS_STATE_TTL_SECONDS,
+)
+from app.bootstrap.scheduler import Scheduler
+from app.interfaces.messenger.shared.runtime import messenger_runtime
 from app.interfaces.messenger.tg.handlers import register_handlers
 from app.interfaces.messenger.tg.middlewares import register_middlewares
-from app.interfaces.messenger.tg.services.booking_reminders import run_booking_reminder_loop, send_telegram_booking_reminders
+from app.interfaces.messenger.tg.services.booking_reminders import schedule_booking_reminders, send_telegram_booking_reminders
+from app.interfaces.messenger.tg.state_storage import build_events_isolation, build_state_storage
 
 logger = logging.getLogger(__name__)
 
-async def main():
-    """Главная функция запуска бота"""
-    install_asyncio_exception_handler(asyncio.get_running_loop())
-    # Инициализация базы данных
-    await db_manager.init_database()
-    logger.info("База данных инициализирована")
-    try:
-        synced_count = await sync_calendar_cache(force=True)
-        logger.info("Календарный кэш инициализирован: %s событий", synced_count)
-    except Exception:
-        logger.exception("Не удалось выполнить первичную синхронизацию календарного кэша")
-    
+
+@dataclass
+class TelegramRuntime:
+    bot: Bot
+    dp: Dispatcher
+
+
+@asynccontextmanager
+async def telegram_bot(
+    scheduler: Scheduler | None = None,
+    *,
+    require_redis: bool = False,
+) -> AsyncIterator[TelegramRuntime]:
+    """Бот и диспетчер Telegram поверх уже открытых общих ресурсов процесса.
+
+    Если передан ``scheduler``, в него добавляются напоминания Telegram.
+    С ``require_redis`` бот не запускается без Redis для состояний FSM.
+    """
     # Создание бота и диспетчера
     bot = Bot(token=TELEGRAM_BOT_TOKEN)
-    
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
-    
+
+    storage = await build_state_storage(
+        REDIS_URL,
+        TG_REDIS_KEY_PREFIX,
+        TG_REDIS_STATE_TTL_SECONDS,
+        require_redis=require_redis,
+    )
+    events_isolation = build_events_isolation(storage)
+    dp = Dispatcher(storage=storage, events_isolation=events_isolation)
+
     # Регистрация middleware и обработчиков
     register_middlewares(dp)
     register_handlers(dp)
-    reminder_task = asyncio.create_task(
-        run_booking_reminder_loop(
-            sender_name="telegram",
-            send_callback=lambda: send_telegram_booking_reminders(bot),
-        )
-    )
-    calendar_cache_task = asyncio.create_task(run_calendar_cache_sync_loop("telegram"))
-    
-    logger.info("Telegram бот запущен")
-    
+    if scheduler is not None:
+        schedule_booking_reminders(scheduler, "telegram", lambda: send_telegram_booking_reminders(bot))
+
     try:
-        # Запуск бота
-        await dp.start_polling(bot)
+        yield TelegramRuntime(bot=bot, dp=dp)
     finally:
-        reminder_task.cancel()
-        calendar_cache_task.cancel()
-        try:
-            await reminder_task
-        except asyncio.CancelledError:
-            pass
-        try:
-            await calendar_cache_task
-        except asyncio.CancelledError:
-            pass
         await bot.session.close()
+        await events_isolation.close()
+        await storage.close()
+
+
+@asynccontextmanager
+async def telegram_runtime(
+    *,
+    background_jobs: bool = True,
+    require_redis: bool = False,
+) -> AsyncIterator[TelegramRuntime]:
+    """Бот, диспетчер и общие ресурсы процесса Telegram.
+
+    ``background_jobs`` включает синхронизацию календаря, напоминания и outbox.
+    Воркеры вебхука, которых несколько, запускаются без них: фоновые задачи
+    выполняет один отдельный процесс. Им же нужен ``require_redis``: без Redis
+    у каждого воркера были бы свои состояния и свой устаревший индекс занятости.
+    """
+    async with messenger_runtime("telegram", background_jobs=background_jobs, require_redis=require_redis) as scheduler:
+        async with telegram_bot(scheduler, require_redis=require_redis) as runtime:
+            yield runtime
+
+
+async def main():
+    """Главная функция запуска бота"""
+    async with telegram_runtime() as runtime:
+        logger.info("Telegram бот запущен")
+        await poll_updates(runtime)
+
+
+async def poll_updates(runtime: TelegramRuntime, *, handle_signals: bool = True) -> None:
+    """Long polling Telegram; ``handle_signals=False``, когда сигналами управляет вызывающий."""
+    # getUpdates не работает, пока у бота установлен вебхук
+    await runtime.bot.delete_webhook()
+    await runtime.dp.start_polling(runtime.bot, handle_signals=handle_signals)
+
+
+async def run_background_jobs():
+    """Фоновые задачи Telegram без приёма апдейтов, для режима вебхука с несколькими воркерами."""
+    async with telegram_runtime(require_redis=True):
+        logger.info("Фоновые задачи Telegram запущены")
+        await asyncio.Event().wait()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -2,6 +2,7 @@ from aiogram import Dispatcher
 from .database import DatabaseMiddleware
 from .admin import AdminMiddleware
 from .parse_mode import ParseModeMiddleware
+from .state_batch import StateBatchMiddleware
 
 def register_middlewares(dp: Dispatcher):
     """Регистрация всех middleware"""
@@ -11,3 +12,5 @@ def register_middlewares(dp: Dispatcher):
     dp.callback_query.middleware(AdminMiddleware())
     dp.message.middleware(ParseModeMiddleware())
     dp.callback_query.middleware(ParseModeMiddleware())
+    dp.message.middleware(StateBatchMiddleware())
+    dp.callback_query.middleware(StateBatchMiddleware())
@@ -2,7 +2,7 @@ from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
 from typing import Callable, Dict, Any, Awaitable
 
-from app.integrations.local.db import admin_repo
+from app.integrations.local.db import admin_directory
 
 class AdminMiddleware(BaseMiddleware):
     """Middleware для проверки прав администратора"""
@@ -17,7 +17,7 @@ class AdminMiddleware(BaseMiddleware):
         user_id = event.from_user.id if hasattr(event, 'from_user') else None
         
         if user_id:
-            admin = await admin_repo.get_by_telegram_id(user_id)
+            admin = await admin_directory.get_by_telegram_id(user_id)
             data["is_admin"] = admin is not None
             data["admin"] = admin
         else:
@@ -0,0 +1,27 @@
+from aiogram import BaseMiddleware
+from aiogram.fsm.context import FSMContext
+from aiogram.types import Message, CallbackQuery
+from typing import Callable, Dict, Any, Awaitable
+
+from app.interfaces.messenger.tg.state_storage import BufferedFSMContext
+
+class StateBatchMiddleware(BaseMiddleware):
+    """Middleware, которое читает FSM-состояние один раз за апдейт и сохраняет один раз в конце"""
+    
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message | CallbackQuery,
+        data: Dict[str, Any]
+    ) -> Any:
+        state = data.get("state")
+        if not isinstance(state, FSMContext) or isinstance(state, BufferedFSMContext):
+            return await handler(event, data)
+
+        # raw_state уже прочитан FSMContextMiddleware, повторно в хранилище не ходим
+        buffered = BufferedFSMContext(state.storage, state.key, raw_state=data.get("raw_state"))
+        data["state"] = buffered
+        try:
+            return await handler(event, data)
+        finally:
+            await buffered.flush()
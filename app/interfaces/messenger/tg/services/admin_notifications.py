@@ -3,7 +3,8 @@ from __future__ import annotations
 from aiogram import Bot as TelegramBot
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from app.integrations.local.db import admin_repo
+from app.integrations.local.db import admin_directory
+from app.interfaces.messenger.shared.dispatch import DispatchResult, telegram_dispatcher
 
 
 def _build_reply_markup(notification) -> InlineKeyboardMarkup | None:
@@ -21,8 +22,7 @@ def _build_reply_markup(notification) -> InlineKeyboardMarkup | None:
 
 
 async def _get_active_admin_telegram_ids() -> list[int]:
-    admins = await admin_repo.get_all()
-    return [admin.telegram_id for admin in admins if admin.is_active and admin.telegram_id]
+    return await admin_directory.active_targets("telegram")
 
 
 async def send_telegram_admin_notification(
@@ -30,29 +30,29 @@ async def send_telegram_admin_notification(
     notification,
     bot: TelegramBot | None = None,
     bot_token: str | None = None,
-) -> None:
+) -> list[DispatchResult]:
+    """Send ``notification`` to every active Telegram admin; one result per admin."""
     if not notification:
-        return
+        return []
 
     admin_ids = await _get_active_admin_telegram_ids()
     if not admin_ids:
-        return
+        return []
 
     own_bot = bot is None
     telegram_bot = bot or TelegramBot(token=bot_token)
     reply_markup = _build_reply_markup(notification)
 
+    def build_job(admin_id: int):
+        return lambda: telegram_bot.send_message(
+            admin_id,
+            notification.text,
+            reply_markup=reply_markup,
+            parse_mode="HTML",
+        )
+
     try:
-        for admin_id in admin_ids:
-            try:
-                await telegram_bot.send_message(
-                    admin_id,
-                    notification.text,
-                    reply_markup=reply_markup,
-                    parse_mode="HTML",
-                )
-            except Exception as exc:
-                print(f"Не удалось отправить уведомление админу {admin_id}: {exc}")
+        return await telegram_dispatcher.send_all((admin_id, build_job(admin_id)) for admin_id in admin_ids)
     finally:
         if own_bot:
             await telegram_bot.session.close()
@@ -1,21 +1,22 @@
 ﻿from __future__ import annotations
 
-import asyncio
 import logging
+import random
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta
 from zoneinfo import ZoneInfo
 
+from app.bootstrap.scheduler import DailyTrigger, Scheduler
 from app.integrations.local.db import booking_reminder_log_repo, client_repo
-from app.interfaces.messenger.tg.services.calendar_queries import list_events
-from app.interfaces.messenger.tg.services.contact_utils import extract_booking_contact_details, normalize_phone
+from app.interfaces.messenger.shared.dispatch import MessageDispatcher, telegram_dispatcher, vk_dispatcher
+from app.interfaces.messenger.tg.services.calendar_queries import list_bookings
 from config import REMINDER_HOUR_MSK
 
 
 logger = logging.getLogger(__name__)
 
 MOSCOW_TZ = ZoneInfo("Europe/Moscow")
-CHECK_INTERVAL_SECONDS = 30
+REMINDER_MISFIRE_GRACE_SECONDS = 3600
 
 
 @dataclass
@@ -28,24 +29,6 @@ class ReminderEvent:
     end: datetime | None
 
 
-def _is_primary_booking_event(description: str) -> bool:
-    text = description or ""
-    if "Linked Service ID:" in text:
-        return False
-    if "Service ID: 9" in text and "Связано с событием:" in text:
-        return False
-    return True
-
-
-def _event_matches_channel(description: str, channel: str) -> bool:
-    text = description or ""
-    if channel == "telegram":
-        return "Telegram:" in text or "Telegram ID:" in text
-    if channel == "vk":
-        return "VK ID:" in text
-    return False
-
-
 def _build_reminder_text(events: list[ReminderEvent]) -> str:
     events_sorted = sorted(events, key=lambda item: item.start)
     first = events_sorted[0] if events_sorted else None
@@ -83,153 +66,168 @@ def _build_reminder_text(events: list[ReminderEvent]) -> str:
     )
 
 
-async def collect_tomorrow_reminder_events(channel: str) -> dict[int, list[ReminderEvent]]:
-    now_msk = datetime.now(MOSCOW_TZ)
-    reminder_date = now_msk.date().isoformat()
-    target_date = (now_msk + timedelta(days=1)).date()
-    period_start = datetime.combine(target_date, time.min, tzinfo=MOSCOW_TZ)
-    period_end = datetime.combine(target_date + timedelta(days=1), time.min, tzinfo=MOSCOW_TZ)
+@dataclass
+class _ParsedReminderEvent:
+    event_id: str
+    summary: str
+    start: datetime
+    end: datetime | None
+    chat_id: int | None
+    phone: str | None
 
-    events = await list_events(period_start, period_end, max_results=250)
-    grouped: dict[int, list[ReminderEvent]] = {}
 
+def _parse_reminder_events(events: list[dict], channel: str) -> list[_ParsedReminderEvent]:
+    parsed = []
     for event in events:
-        description = event.get("description") or ""
-        if not _is_primary_booking_event(description):
-            continue
-        if not _event_matches_channel(description, channel):
-            continue
-
         start = event.get("start")
         event_id = event.get("id")
         if not start or not event_id:
             continue
 
-        details = extract_booking_contact_details(description)
-        phone = normalize_phone(details.get("phone"))
-        client = None
-        chat_id = None
+        booking = event["booking"]
+        parsed.append(
+            _ParsedReminderEvent(
+                event_id=event_id,
+                summary=event.get("summary") or "Бронирование",
+                start=start,
+                end=event.get("end"),
+                chat_id=booking.vk_id if channel == "vk" else booking.tg_id,
+                phone=booking.phone10,
+            )
+        )
+    return parsed
+
+
+async def collect_tomorrow_reminder_events(channel: str) -> dict[int, list[ReminderEvent]]:
+    """Group tomorrow's unsent booking events by client.
+
+    Bookings come parsed from the projection table; already-sent events and
+    clients are resolved with one batched query each, so the DB cost does not
+    grow per event.
+    """
+    now_msk = datetime.now(MOSCOW_TZ)
+    reminder_date = now_msk.date().isoformat()
+    target_date = (now_msk + timedelta(days=1)).date()
+    period_start = datetime.combine(target_date, time.min, tzinfo=MOSCOW_TZ)
+    period_end = datetime.combine(target_date + timedelta(days=1), time.min, tzinfo=MOSCOW_TZ)
+
+    events = await list_bookings(period_start, period_end, channel=channel, primary_only=True, max_results=250)
+    parsed = _parse_reminder_events(events, channel)
+    if not parsed:
+        return {}
 
-        if channel == "vk":
-            vk_id = details.get("vk_id")
-            if vk_id and str(vk_id).isdigit():
-                chat_id = int(vk_id)
-                client = await client_repo.get_by_vk_id(chat_id)
+    sent_event_ids = await booking_reminder_log_repo.get_sent_event_ids(
+        channel,
+        [item.event_id for item in parsed],
+        reminder_date,
+    )
+    parsed = [item for item in parsed if item.event_id not in sent_event_ids]
 
-        elif channel == "telegram":
-            telegram_id = details.get("telegram_id")
-            if telegram_id and str(telegram_id).isdigit():
-                chat_id = int(telegram_id)
-                client = await client_repo.get_by_telegram_id(chat_id)
+    chat_ids = [item.chat_id for item in parsed if item.chat_id is not None]
+    if channel == "vk":
+        clients_by_chat = await client_repo.get_by_vk_ids(chat_ids)
+    else:
+        clients_by_chat = await client_repo.get_by_telegram_ids(chat_ids)
 
-        if not client and phone:
-            client = await client_repo.get_by_phone_for_channel(phone, channel)
+    fallback_phones = [item.phone for item in parsed if item.phone and item.chat_id not in clients_by_chat]
+    clients_by_phone = await client_repo.get_by_phones_for_channel(fallback_phones, channel)
 
+    grouped: dict[int, list[ReminderEvent]] = {}
+    for item in parsed:
+        client = clients_by_chat.get(item.chat_id) or clients_by_phone.get(item.phone)
         if not client:
             continue
 
+        chat_id = item.chat_id
         if chat_id is None:
             chat_id = client.telegram_id if channel == "telegram" else client.vk_id
         if not chat_id:
             continue
 
-        if await booking_reminder_log_repo.was_sent(channel, event_id, reminder_date):
-            continue
-
         grouped.setdefault(client.id, []).append(
             ReminderEvent(
                 client_id=client.id,
                 chat_id=chat_id,
-                event_id=event_id,
-                summary=event.get("summary") or "Бронирование",
-                start=start,
-                end=event.get("end"),
+                event_id=item.event_id,
+                summary=item.summary,
+                start=item.start,
+                end=item.end,
             )
         )
 
     return grouped
 
 
-async def send_telegram_booking_reminders(bot) -> int:
-    reminders_by_client = await collect_tomorrow_reminder_events("telegram")
+async def _send_booking_reminders(channel: str, dispatcher: MessageDispatcher, build_job) -> int:
+    """Send tomorrow's reminders through ``dispatcher``.
+
+    ``build_job(chat_id, text)`` returns the zero-argument coroutine function
+    the dispatcher calls, once per attempt.
+    """
+    reminders_by_client = await collect_tomorrow_reminder_events(channel)
     reminder_date = datetime.now(MOSCOW_TZ).date().isoformat()
-    sent_events_count = 0
+    delivered: list[tuple[str, int, str]] = []
 
-    for events in reminders_by_client.values():
-        try:
-            await bot.send_message(
-                chat_id=events[0].chat_id,
-                text=_build_reminder_text(events),
-            )
-        except Exception as exc:
-            logger.warning("Не удалось отправить Telegram-напоминание chat_id=%s: %s", events[0].chat_id, exc)
-            continue
+    try:
+        results = await dispatcher.send_all(
+            (client_id, build_job(events[0].chat_id, _build_reminder_text(events)))
+            for client_id, events in reminders_by_client.items()
+        )
+        for result in results:
+            if result.ok:
+                delivered.extend(
+                    (event.event_id, event.client_id, event.start.date().isoformat())
+                    for event in reminders_by_client[result.key]
+                )
+    finally:
+        # One bulk insert per run; still recorded if the wave is cancelled midway.
+        sent_events_count = await booking_reminder_log_repo.mark_sent(channel, reminder_date, delivered)
+    return sent_events_count
 
-        for event in events:
-            if await booking_reminder_log_repo.mark_sent(
-                "telegram",
-                event.event_id,
-                event.client_id,
-                event.start.date().isoformat(),
-                reminder_date,
-            ):
-                sent_events_count += 1
 
-    return sent_events_count
+async def send_telegram_booking_reminders(bot) -> int:
+    def build_job(chat_id: int, text: str):
+        return lambda: bot.send_message(chat_id=chat_id, text=text)
 
+    return await _send_booking_reminders("telegram", telegram_dispatcher, build_job)
 
-async def send_vk_booking_reminders(bot) -> int:
-    reminders_by_client = await collect_tomorrow_reminder_events("vk")
-    reminder_date = datetime.now(MOSCOW_TZ).date().isoformat()
-    sent_events_count = 0
-
-    for events in reminders_by_client.values():
-        try:
-            await bot.api.messages.send(
-                peer_id=events[0].chat_id,
-                random_id=0,
-                message=_build_reminder_text(events),
-            )
-        except Exception as exc:
-            logger.warning("Не удалось отправить VK-напоминание peer_id=%s: %s", events[0].chat_id, exc)
-            continue
 
-        for event in events:
-            if await booking_reminder_log_repo.mark_sent(
-                "vk",
-                event.event_id,
-                event.client_id,
-                event.start.date().isoformat(),
-                reminder_date,
-            ):
-                sent_events_count += 1
+async def send_vk_booking_reminders(bot) -> int:
+    def build_job(peer_id: int, text: str):
+        # A fixed random_id per message lets VK drop duplicates of a retried send.
+        random_id = random.randint(1, 2**31 - 1)
+        return lambda: bot.api.messages.send(peer_id=peer_id, random_id=random_id, message=text)
 
-    return sent_events_count
+    return await _send_booking_reminders("vk", vk_dispatcher, build_job)
 
 
-async def run_booking_reminder_loop(sender_name: str, send_callback) -> None:
-    last_processed_date = None
+async def run_booking_reminders(sender_name: str, send_callback) -> int:
+    now_msk = datetime.now(MOSCOW_TZ)
+    sent_count = await send_callback()
     logger.info(
-        "Запущен reminder-loop для %s: проверка каждые %s сек., час отправки Europe/Moscow=%s",
+        "Напоминания %s обработаны: %s событий, дата=%s, час=%s",
         sender_name,
-        CHECK_INTERVAL_SECONDS,
-        REMINDER_HOUR_MSK,
+        sent_count,
+        now_msk.date(),
+        now_msk.hour,
     )
+    return sent_count
 
-    while True:
-        now_msk = datetime.now(MOSCOW_TZ)
-        if now_msk.hour == REMINDER_HOUR_MSK and last_processed_date != now_msk.date():
-            try:
-                sent_count = await send_callback()
-                logger.info(
-                    "Напоминания %s обработаны: %s событий, дата=%s, час=%s",
-                    sender_name,
-                    sent_count,
-                    now_msk.date(),
-                    now_msk.hour,
-                )
-            except Exception:
-                logger.exception("Ошибка фоновой рассылки напоминаний для %s", sender_name)
-            last_processed_date = now_msk.date()
 
-        await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+def schedule_booking_reminders(scheduler: Scheduler, sender_name: str, send_callback) -> None:
+    """Run the reminder wave daily at ``REMINDER_HOUR_MSK``.
+
+    A wave missed by less than an hour (e.g. a restart around the reminder
+    hour) still runs; the last run is persisted, so it never runs twice a day.
+    """
+    scheduler.add_job(
+        f"booking_reminders:{sender_name}",
+        lambda: run_booking_reminders(sender_name, send_callback),
+        DailyTrigger(REMINDER_HOUR_MSK, tz=MOSCOW_TZ),
+        misfire_grace_seconds=REMINDER_MISFIRE_GRACE_SECONDS,
+    )
+    logger.info(
+        "Напоминания для %s запланированы на %s:00 Europe/Moscow",
+        sender_name,
+        REMINDER_HOUR_MSK,
+    )
@@ -1,13 +1,14 @@
 from datetime import datetime
 
 from app.integrations.local.db import client_repo
-from app.interfaces.messenger.tg.services.contact_utils import format_phone_for_search
+from app.interfaces.messenger.tg.services.contact_utils import normalize_phone
 
 try:
-    from app.integrations.local.calendar.service import GoogleCalendarService
+    from app.integrations.local.calendar.service import GoogleCalendarService, get_calendar_service
     CALENDAR_AVAILABLE = True
 except Exception:
     GoogleCalendarService = None
+    get_calendar_service = None
     CALENDAR_AVAILABLE = False
 
 
@@ -23,7 +24,7 @@ async def list_events(
 ) -> list[dict]:
     if not is_calendar_available():
         return []
-    calendar_service = GoogleCalendarService()
+    calendar_service = get_calendar_service()
     return await calendar_service.list_events(
         period_start,
         period_end,
@@ -32,17 +33,57 @@ async def list_events(
     )
 
 
+async def list_bookings(
+    period_start: datetime,
+    period_end: datetime,
+    *,
+    channel: str | None = None,
+    primary_only: bool = False,
+    phone10: str | None = None,
+    telegram_id: int | None = None,
+    vk_id: int | None = None,
+    max_results: int = 250,
+) -> list[dict]:
+    if not is_calendar_available():
+        return []
+    calendar_service = get_calendar_service()
+    return await calendar_service.list_bookings(
+        period_start,
+        period_end,
+        channel=channel,
+        primary_only=primary_only,
+        phone10=phone10,
+        telegram_id=telegram_id,
+        vk_id=vk_id,
+        max_results=max_results,
+    )
+
+
+async def get_booking_contact(event_id: str) -> dict | None:
+    if not is_calendar_available():
+        return None
+    calendar_service = get_calendar_service()
+    return await calendar_service.get_booking_contact(event_id)
+
+
+async def list_linked_event_ids(event_id: str) -> list[str]:
+    if not is_calendar_available():
+        return []
+    calendar_service = get_calendar_service()
+    return await calendar_service.list_linked_event_ids(event_id)
+
+
 async def get_event(event_id: str) -> dict | None:
     if not is_calendar_available():
         return None
-    calendar_service = GoogleCalendarService()
+    calendar_service = get_calendar_service()
     return await calendar_service.get_event(event_id)
 
 
 async def delete_event(event_id: str) -> bool:
     if not is_calendar_available():
         return False
-    calendar_service = GoogleCalendarService()
+    calendar_service = get_calendar_service()
     return await calendar_service.delete_event(event_id)
 
 
@@ -55,16 +96,13 @@ async def get_user_calendar_events_by_telegram_id(
         return None, "calendar_unavailable"
 
     client = await client_repo.get_by_telegram_id(telegram_id)
-    phone_display = format_phone_for_search(client.phone if client else None)
-    if not phone_display:
-        return [], None
-
-    events = await list_events(period_start, period_end)
-    user_events = [
-        event for event in events
-        if phone_display in (event.get("description") or "")
-    ]
-    return user_events, None
+    events = await list_bookings(
+        period_start,
+        period_end,
+        phone10=normalize_phone(client.phone if client else None),
+        telegram_id=telegram_id,
+    )
+    return events, None
 
 
 async def get_user_calendar_events_by_vk_id(
@@ -76,13 +114,10 @@ async def get_user_calendar_events_by_vk_id(
         return None, "calendar_unavailable"
 
     client = await client_repo.get_by_vk_id(vk_id)
-    phone_display = format_phone_for_search(client.phone if client else None)
-    if not phone_display:
-        return [], None
-
-    events = await list_events(period_start, period_end)
-    user_events = [
-        event for event in events
-        if phone_display in (event.get("description") or "")
-    ]
-    return user_events, None
+    events = await list_bookings(
+        period_start,
+        period_end,
+        phone10=normalize_phone(client.phone if client else None),
+        vk_id=vk_id,
+    )
+    return events, None
@@ -0,0 +1,149 @@
+import json
+import logging
+from datetime import date, datetime, time
+from typing import Any, Mapping
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage, DefaultKeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
+from aiogram.fsm.storage.redis import RedisStorage
+
+
+logger = logging.getLogger(__name__)
+
+# FSM data holds time slots as ``datetime.time``; JSON keeps them tagged.
+_TEMPORAL_TYPES = (("datetime", datetime), ("date", date), ("time", time))
+
+
+def _json_default(value: Any) -> Any:
+    for tag, kind in _TEMPORAL_TYPES:
+        if isinstance(value, kind):
+            return {"__fsm_type__": tag, "value": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_object_hook(value: dict) -> Any:
+    tag = value.get("__fsm_type__")
+    for name, kind in _TEMPORAL_TYPES:
+        if tag == name:
+            return kind.fromisoformat(value["value"])
+    return value
+
+
+def dumps_state_data(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+
+def loads_state_data(raw: str | bytes) -> Any:
+    return json.loads(raw, object_hook=_json_object_hook)
+
+
+async def build_state_storage(
+    redis_url: str,
+    key_prefix: str,
+    ttl_seconds: int,
+    *,
+    require_redis: bool = False,
+) -> BaseStorage:
+    """Redis FSM storage shared by all Telegram workers, or process memory when Redis is down.
+
+    With ``require_redis`` an unreachable Redis is an error: several workers
+    with their own memory storage would each see a different FSM state.
+    """
+    storage = RedisStorage.from_url(
+        redis_url,
+        key_builder=DefaultKeyBuilder(prefix=key_prefix),
+        state_ttl=ttl_seconds,
+        data_ttl=ttl_seconds,
+        json_dumps=dumps_state_data,
+        json_loads=loads_state_data,
+    )
+    try:
+        await storage.redis.ping()
+    except Exception as e:
+        await storage.close()
+        if require_redis:
+            raise RuntimeError(f"Redis недоступен по REDIS_URL={redis_url}, а FSM storage нужен всем воркерам") from e
+        logger.warning(
+            "Redis недоступен по REDIS_URL=%s. Telegram бот будет запущен с in-memory FSM storage. "
+            "Состояния Telegram не переживут перезапуск процесса. Ошибка: %s",
+            redis_url,
+            e,
+        )
+        return MemoryStorage()
+    return storage
+
+
+def build_events_isolation(storage: BaseStorage) -> BaseEventIsolation:
+    """Per-user lock around each update: a Redis lock when the storage is shared between workers."""
+    if isinstance(storage, RedisStorage):
+        return storage.create_isolation()
+    return SimpleEventIsolation()
+
+
+class BufferedFSMContext(FSMContext):
+    """FSM context that reads the storage once per update and writes back once.
+
+    Handlers may call ``get_data``/``update_data`` as often as they like; the
+    changes stay in memory until :meth:`flush`, which the state batching
+    middleware calls when the handler is done.
+    """
+
+    _UNLOADED = object()
+
+    def __init__(self, storage: BaseStorage, key: StorageKey, raw_state: Any = _UNLOADED) -> None:
+        super().__init__(storage=storage, key=key)
+        self._state = raw_state
+        self._data: dict[str, Any] | None = None
+        self._state_changed = False
+        self._data_changed = False
+
+    async def get_state(self) -> str | None:
+        if self._state is self._UNLOADED:
+            self._state = await self.storage.get_state(key=self.key)
+        return self._state
+
+    async def set_state(self, state: StateType = None) -> None:
+        self._state = state.state if isinstance(state, State) else state
+        self._state_changed = True
+
+    async def _load_data(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = dict(await self.storage.get_data(key=self.key))
+        return self._data
+
+    async def get_data(self) -> dict[str, Any]:
+        return dict(await self._load_data())
+
+    async def get_value(self, key: str, default: Any | None = None) -> Any | None:
+        return (await self._load_data()).get(key, default)
+
+    async def set_data(self, data: Mapping[str, Any]) -> None:
+        self._data = dict(data)
+        self._data_changed = True
+
+    async def update_data(self, data: Mapping[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        if data:
+            kwargs.update(data)
+        current = await self._load_data()
+        current.update(kwargs)
+        self._data_changed = True
+        return dict(current)
+
+    async def flush(self) -> None:
+        if self._state_changed:
+            await self.storage.set_state(key=self.key, state=self._state)
+            self._state_changed = False
+        if self._data_changed:
+            await self.storage.set_data(key=self.key, data=self._data or {})
+            self._data_changed = False
+
+
+__all__ = [
+    "BufferedFSMContext",
+    "build_events_isolation",
+    "build_state_storage",
+    "dumps_state_data",
+    "loads_state_data",
+]
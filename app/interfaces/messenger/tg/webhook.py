@@ -0,0 +1,119 @@
+import asyncio
+import hmac
+import logging
+from contextlib import asynccontextmanager
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from fastapi import FastAPI, Request, Response
+from pydantic import ValidationError
+
+from config import TELEGRAM_BOT_TOKEN, TG_WEBHOOK_PATH, TG_WEBHOOK_SECRET, TG_WEBHOOK_URL, TG_WEBHOOK_WORKERS
+from app.interfaces.messenger.tg.main import telegram_runtime
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class TelegramWebhookHandler:
+    """Принимает апдейт из HTTP-запроса и передаёт его диспетчеру.
+
+    В фоновом режиме Telegram сразу получает 200 и не повторяет доставку,
+    пока обработчик ходит в календарь.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        dp: Dispatcher,
+        *,
+        secret: str | None = TG_WEBHOOK_SECRET,
+        handle_in_background: bool = True,
+    ):
+        self.bot = bot
+        self.dp = dp
+        self.secret = secret
+        self.handle_in_background = handle_in_background
+        self._tasks: set[asyncio.Task] = set()
+
+    async def handle(self, request: Request) -> Response:
+        if self.secret and not hmac.compare_digest(request.headers.get(SECRET_HEADER, ""), self.secret):
+            return Response(status_code=403)
+        try:
+            update = Update.model_validate(await request.json(), context={"bot": self.bot})
+        except (ValueError, ValidationError) as e:
+            # 400, а не 500: иначе Telegram будет повторять доставку того же тела.
+            logger.warning("Некорректный апдейт Telegram отклонён: %s", e)
+            return Response(status_code=400)
+        if self.handle_in_background:
+            task = asyncio.create_task(self._feed(update))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            await self._feed(update)
+        return Response(status_code=200)
+
+    async def _feed(self, update: Update) -> None:
+        try:
+            await self.dp.feed_update(self.bot, update)
+        except Exception:
+            logger.exception("Ошибка обработки апдейта Telegram id=%s", update.update_id)
+
+    async def close(self) -> None:
+        """Дожидается апдейтов, которые ещё обрабатываются."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def create_app(
+    runtime_factory=telegram_runtime,
+    *,
+    background_jobs: bool | None = None,
+    handle_in_background: bool = True,
+) -> FastAPI:
+    """ASGI-приложение вебхука; uvicorn вызывает фабрику в каждом воркере.
+
+    Когда воркеров несколько, фоновые задачи в них выключены: их выполняет
+    отдельный процесс точки входа. Состояния FSM и инвалидация кэшей тогда
+    идут через Redis, и без него воркер не запускается. Один воркер может
+    работать и без Redis, в памяти процесса.
+    """
+    if background_jobs is None:
+        background_jobs = TG_WEBHOOK_WORKERS <= 1
+    require_redis = TG_WEBHOOK_WORKERS > 1
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with runtime_factory(background_jobs=background_jobs, require_redis=require_redis) as runtime:
+            handler = TelegramWebhookHandler(runtime.bot, runtime.dp, handle_in_background=handle_in_background)
+            app.state.webhook_handler = handler
+            logger.info("Воркер вебхука Telegram запущен")
+            try:
+                yield
+            finally:
+                await handler.close()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post(TG_WEBHOOK_PATH)
+    async def receive_update(request: Request) -> Response:
+        return await request.app.state.webhook_handler.handle(request)
+
+    return app
+
+
+async def register_webhook() -> None:
+    """Сообщает Telegram адрес вебхука; без TG_WEBHOOK_URL (локальный запуск) ничего не делает."""
+    if not TG_WEBHOOK_URL:
+        logger.warning("TG_WEBHOOK_URL не задан, вебхук в Telegram не регистрируется")
+        return
+    bot = Bot(token=TELEGRAM_BOT_TOKEN)
+    try:
+        await bot.set_webhook(TG_WEBHOOK_URL, secret_token=TG_WEBHOOK_SECRET or None)
+        logger.info("Вебхук Telegram зарегистрирован: %s", TG_WEBHOOK_URL)
+    finally:
+        await bot.session.close()
+
+
+__all__ = ["TelegramWebhookHandler", "create_app", "register_webhook"]
@@ -1,3 +1,3 @@
-from app.interfaces.messenger.vk.main import build_bot, run_forever
+from app.interfaces.messenger.vk.main import main
 
-__all__ = ["build_bot", "run_forever"]
+__all__ = ["main"]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from config import ADMIN_IDS_VK
-from app.integrations.local.db import admin_repo
+from app.integrations.local.db import admin_directory
 
 
 def _parse_admin_ids(value: str) -> set[int]:
@@ -19,5 +19,5 @@ async def is_vk_admin_id(vk_id: int | None) -> bool:
     if normalized_vk_id in ENV_ADMIN_IDS:
         return True
 
-    admin = await admin_repo.get_by_vk_id(normalized_vk_id)
+    admin = await admin_directory.get_by_vk_id(normalized_vk_id)
     return bool(admin)
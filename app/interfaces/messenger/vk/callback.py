@@ -0,0 +1,124 @@
+import asyncio
+import hmac
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse
+from vkbottle import Bot
+
+from config import VK_CALLBACK_CONFIRMATION, VK_CALLBACK_PATH, VK_CALLBACK_SECRET, VK_CALLBACK_WORKERS, VK_GROUP_ID
+from app.interfaces.messenger.vk.main import process_event, vk_runtime
+
+logger = logging.getLogger(__name__)
+
+
+class VkCallbackHandler:
+    """Принимает событие Callback API и передаёт его обработчикам vkbottle.
+
+    VK ждёт ответ ``ok`` не дольше нескольких секунд и иначе повторяет
+    доставку, поэтому в фоновом режиме событие обрабатывается после ответа.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        *,
+        confirmation: str | None = VK_CALLBACK_CONFIRMATION,
+        secret: str | None = VK_CALLBACK_SECRET,
+        group_id: int | str | None = VK_GROUP_ID,
+        handle_in_background: bool = True,
+    ):
+        self.bot = bot
+        self.confirmation = confirmation
+        self.secret = secret
+        self.group_id = str(group_id) if group_id else None
+        self.handle_in_background = handle_in_background
+        self._tasks: set[asyncio.Task] = set()
+
+    async def handle(self, request: Request) -> Response:
+        try:
+            event = await request.json()
+        except ValueError as e:
+            logger.warning("Некорректное тело Callback API VK отклонено: %s", e)
+            return Response(status_code=400)
+        if not isinstance(event, dict):
+            logger.warning("Событие Callback API VK не является объектом: %s", type(event).__name__)
+            return Response(status_code=400)
+        if self.group_id and str(event.get("group_id")) != self.group_id:
+            return Response(status_code=403)
+        if event.get("type") == "confirmation":
+            if not self.confirmation:
+                logger.error("VK запросил подтверждение сервера, но VK_CALLBACK_CONFIRMATION не задан")
+                return Response(status_code=503)
+            return PlainTextResponse(self.confirmation)
+        if self.secret and not hmac.compare_digest(str(event.pop("secret", "")), self.secret):
+            return Response(status_code=403)
+        if self.handle_in_background:
+            task = asyncio.create_task(process_event(self.bot, event))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            await process_event(self.bot, event)
+        return PlainTextResponse("ok")
+
+    async def close(self) -> None:
+        """Дожидается событий, которые ещё обрабатываются."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+async def _resolve_confirmation(bot: Bot) -> str | None:
+    """Код подтверждения из настроек, а если его нет — из API сообщества."""
+    if VK_CALLBACK_CONFIRMATION or not VK_GROUP_ID:
+        return VK_CALLBACK_CONFIRMATION
+    try:
+        response = await bot.api.groups.get_callback_confirmation_code(group_id=int(VK_GROUP_ID))
+        return response.code
+    except Exception:
+        logger.exception("Не удалось получить код подтверждения Callback API для группы %s", VK_GROUP_ID)
+        return None
+
+
+def create_app(
+    runtime_factory=vk_runtime,
+    *,
+    background_jobs: bool | None = None,
+    handle_in_background: bool = True,
+) -> FastAPI:
+    """ASGI-приложение Callback API; uvicorn вызывает фабрику в каждом воркере.
+
+    Когда воркеров несколько, фоновые задачи в них выключены: их выполняет
+    отдельный процесс точки входа. Состояния VK и инвалидация кэшей тогда
+    идут через Redis, и без него воркер не запускается. Один воркер может
+    работать и без Redis, в памяти процесса.
+    """
+    if background_jobs is None:
+        background_jobs = VK_CALLBACK_WORKERS <= 1
+    require_redis = VK_CALLBACK_WORKERS > 1
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with runtime_factory(background_jobs=background_jobs, require_redis=require_redis) as bot:
+            handler = VkCallbackHandler(
+                bot,
+                confirmation=await _resolve_confirmation(bot),
+                handle_in_background=handle_in_background,
+            )
+            app.state.callback_handler = handler
+            logger.info("Воркер Callback API VK запущен")
+            try:
+                yield
+            finally:
+                await handler.close()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post(VK_CALLBACK_PATH)
+    async def receive_event(request: Request) -> Response:
+        return await request.app.state.callback_handler.handle(request)
+
+    return app
+
+
+__all__ = ["VkCallbackHandler", "create_app"]
@@ -39,12 +39,14 @@ from app.core.modules.support.admin_faq_use_case import (
 from app.integrations.local.db import admin_repo, client_repo, faq_repo, service_repo
 from app.interfaces.messenger.tg.services.calendar_queries import (
     delete_event as svc_delete_event,
+    get_booking_contact as svc_get_booking_contact,
     get_event as svc_get_event,
     is_calendar_available,
     list_events as svc_list_events,
+    list_linked_event_ids as svc_list_linked_event_ids,
 )
+from app.integrations.local.calendar.projection import extract_booking_contact_details
 from app.interfaces.messenger.tg.services.contact_utils import (
-    extract_booking_contact_details,
     format_phone_plus7,
     normalize_phone,
 )
@@ -315,6 +317,7 @@ async def _show_admin_booking_detail(message: Message, token: str, page: int = 0
         extract_contact_details=extract_booking_contact_details,
         normalize_phone=normalize_phone,
         client_repo=client_repo,
+        get_booking_contact=svc_get_booking_contact,
     )
     if result.status != "ok":
         await message.answer(_plain(result.text), keyboard=get_admin_bookings_keyboard())
@@ -339,7 +342,7 @@ async def _cancel_admin_booking(message: Message, token: str, page: int = 0) ->
     result = await cancel_admin_booking_event(
         event_id=event_id,
         is_calendar_available=is_calendar_available,
-        list_events=svc_list_events,
+        list_linked_event_ids=svc_list_linked_event_ids,
         delete_event=svc_delete_event,
     )
     if result == "calendar_unavailable":
@@ -6,10 +6,13 @@ from enum import Enum
 from vkbottle import BaseStateGroup, Keyboard, KeyboardButtonColor, Text
 from vkbottle.bot import Bot, Message
 
-from config import TELEGRAM_BOT_TOKEN
 from app.core.modules.booking.availability import (
+    SLOT_HELD_MESSAGE,
+    get_availability_for_range as svc_get_availability_for_range,
     get_time_slots_for_date as svc_get_time_slots_for_date,
+    hold_booking_slot,
     is_booking_available as svc_is_booking_available,
+    release_booking_slot,
 )
 from app.core.modules.booking.extra_services import (
     build_extra_service_booking_label,
@@ -65,6 +68,7 @@ from app.core.modules.booking.presentation import (
     build_vk_calendar_description,
     build_vk_confirmation_text,
 )
+from app.core.modules.booking.calendar_event import CalendarSlotTakenError
 from app.core.modules.booking.use_case import create_booking_use_case
 from app.core.modules.booking.validation import (
     normalize_and_format_phone,
@@ -76,7 +80,7 @@ from app.core.modules.booking.validation import (
     validate_person_name,
 )
 from app.core.modules.services.details import build_service_details_text
-from app.integrations.local.db import client_repo, extra_service_repo, service_repo
+from app.integrations.local.db import catalog, client_repo
 from app.integrations.local.db.models import Client
 from app.interfaces.messenger.tg.services.booking_formatters import (
     format_booking_date,
@@ -84,18 +88,18 @@ from app.interfaces.messenger.tg.services.booking_formatters import (
     format_booking_guests,
     format_extras_display,
 )
-from app.interfaces.messenger.tg.services.admin_notifications import send_telegram_admin_notification
+from app.interfaces.messenger.shared.admin_notifier import admin_notifier
 from app.interfaces.messenger.vk.auth import is_vk_admin_id
 from app.interfaces.messenger.vk.keyboards import get_main_menu_keyboard
-from app.interfaces.messenger.vk.services.admin_notifications import send_vk_admin_notification
 from app.interfaces.messenger.vk.services.service_media import send_service_details
 
 try:
-    from app.integrations.local.calendar.service import GoogleCalendarService
+    from app.integrations.local.calendar.service import GoogleCalendarService, get_calendar_service
 
     CALENDAR_AVAILABLE = True
 except Exception:
     GoogleCalendarService = None
+    get_calendar_service = None
     CALENDAR_AVAILABLE = False
 
 
@@ -224,19 +228,35 @@ def _get_other_keyboard(service_id: int, booking_data: dict) -> str:
     return kb.get_json()
 
 
-def _get_date_keyboard(service_id: int, week_offset: int) -> str:
+def _slot_holder(message: Message) -> str:
+    return f"vk:{message.from_id}"
+
+
+async def _get_week_availability(data: dict, week_offset: int, holder: str | None = None) -> dict | None:
+    start_date = datetime.now().date() + timedelta(days=week_offset * 7)
+    return await svc_get_availability_for_range(
+        start_date,
+        7,
+        duration_minutes=int(data.get("duration") or 60),
+        all_day=bool(data.get("is_all_day")),
+        holder=holder,
+    )
+
+
+def _get_date_keyboard(service_id: int, week_offset: int, availability: dict | None = None) -> str:
     kb = Keyboard(one_time=False, inline=False)
     today = datetime.now().date()
     start_date = today + timedelta(days=week_offset * 7)
     for i in range(7):
         d = start_date + timedelta(days=i)
         lbl = d.strftime("%d.%m.%Y")
+        is_full = availability is not None and availability.get(d) == 0
         kb.add(
             Text(
-                f"📅 {lbl}",
+                f"🚫 {lbl} — нет мест" if is_full else f"📅 {lbl}",
                 payload={"a": "bk_date_set", "sid": service_id, "d": d.strftime("%Y-%m-%d")},
             ),
-            color=KeyboardButtonColor.PRIMARY,
+            color=KeyboardButtonColor.SECONDARY if is_full else KeyboardButtonColor.PRIMARY,
         ).row()
     kb.add(Text("⬅️ Неделя", payload={"a": "bk_date_week", "sid": service_id, "w": week_offset - 1}), color=KeyboardButtonColor.SECONDARY)
     kb.add(Text("➡️ Неделя", payload={"a": "bk_date_week", "sid": service_id, "w": week_offset + 1}), color=KeyboardButtonColor.SECONDARY).row()
@@ -425,6 +445,7 @@ async def _show_time_selection_screen(bot: Bot, message: Message, data: dict, da
         service_name=service_name,
         duration_minutes=duration,
         all_day=is_all_day,
+        holder=_slot_holder(message),
     )
     normalized_slots = [
         {"start": slot["start_time"].strftime("%H:%M"), "end": slot["end_time"].strftime("%H:%M")}
@@ -495,7 +516,7 @@ def register_booking_handlers(bot: Bot):
     async def booking_start(message: Message):
         payload = message.get_payload_json() or {}
         service_id = int(payload.get("sid"))
-        service = await service_repo.get_by_id(service_id)
+        service = await catalog.get_service(service_id)
         if not service:
             await message.answer("Услуга не найдена.", keyboard=get_main_menu_keyboard(is_admin=await is_vk_admin_id(message.from_id)))
             return
@@ -506,7 +527,7 @@ def register_booking_handlers(bot: Bot):
     async def booking_service_confirm(message: Message):
         payload = message.get_payload_json() or {}
         service_id = int(payload.get("sid"))
-        service = await service_repo.get_by_id(service_id)
+        service = await catalog.get_service(service_id)
         if not service:
             await message.answer("Услуга не найдена.", keyboard=get_main_menu_keyboard(is_admin=await is_vk_admin_id(message.from_id)))
             return
@@ -551,7 +572,7 @@ def register_booking_handlers(bot: Bot):
         data = _get_booking_data(message)
         await message.answer(
             build_date_selection_text(html=False),
-            keyboard=_get_date_keyboard(int(data["service_id"]), 0),
+            keyboard=_get_date_keyboard(int(data["service_id"]), 0, await _get_week_availability(data, 0, _slot_holder(message))),
         )
 
     @bot.on.message(payload_contains={"a": "bk_date_week"}, state=VkBookingState.filling_form)
@@ -559,7 +580,8 @@ def register_booking_handlers(bot: Bot):
         payload = message.get_payload_json() or {}
         sid = int(payload.get("sid"))
         week = int(payload.get("w", 0))
-        await message.answer(build_date_selection_text(html=False), keyboard=_get_date_keyboard(sid, week))
+        availability = await _get_week_availability(_get_booking_data(message), week, _slot_holder(message))
+        await message.answer(build_date_selection_text(html=False), keyboard=_get_date_keyboard(sid, week, availability))
 
     @bot.on.message(payload_contains={"a": "bk_date_set"}, state=VkBookingState.filling_form)
     async def booking_date_set(message: Message):
@@ -600,13 +622,17 @@ def register_booking_handlers(bot: Bot):
             end_dt = datetime.combine(selected_date, datetime.strptime("21:00", "%H:%M").time())
             data["duration"] = int((end_dt - start_dt).total_seconds() // 60)
             data["time"] = f"{s} - 21:00"
+        held, reason = await hold_booking_slot(_slot_holder(message), data)
+        if not held:
+            await message.answer(f"❌ {reason}", keyboard=_get_current_form_keyboard(data))
+            return
         await _show_form(bot, message, data)
 
     @bot.on.message(payload_contains={"a": "bk_duration"}, state=VkBookingState.filling_form)
     @bot.on.message(text="⏰ Длительность", state=VkBookingState.filling_form)
     async def booking_duration(message: Message):
         data = _get_booking_data(message)
-        service = await service_repo.get_by_id(int(data["service_id"]))
+        service = await catalog.get_service(int(data["service_id"]))
         min_duration = _normalize_min_duration_minutes(service.min_duration_minutes if service else 60)
         await message.answer(
             build_duration_prompt(min_duration=min_duration, html=False, detailed=False),
@@ -617,7 +643,7 @@ def register_booking_handlers(bot: Bot):
     async def booking_duration_set(message: Message):
         payload = message.get_payload_json() or {}
         data = _get_booking_data(message)
-        service = await service_repo.get_by_id(int(data["service_id"]))
+        service = await catalog.get_service(int(data["service_id"]))
         min_duration = _normalize_min_duration_minutes(service.min_duration_minutes if service else 60)
         duration = int(payload.get("m", min_duration))
         if validate_duration_minutes(duration, min_duration=min_duration) == "too_small":
@@ -633,13 +659,17 @@ def register_booking_handlers(bot: Bot):
             data["time"] = f"{s} - 21:00"
         else:
             data["duration"] = duration
+        held, reason = await hold_booking_slot(_slot_holder(message), data)
+        if not held:
+            await message.answer(f"❌ {reason}", keyboard=_get_current_form_keyboard(data))
+            return
         await _show_form(bot, message, data)
 
     @bot.on.message(payload_contains={"a": "bk_guests"}, state=VkBookingState.filling_form)
     @bot.on.message(text="👥 Гости", state=VkBookingState.filling_form)
     async def booking_guests(message: Message):
         data = _get_booking_data(message)
-        service = await service_repo.get_by_id(int(data["service_id"]))
+        service = await catalog.get_service(int(data["service_id"]))
         max_guests = _normalize_max_guests(service.max_num_clients if service else data.get("max_num_clients", 1))
         data["max_num_clients"] = max_guests
         await _set_state(bot, message, VkBookingState.filling_form, data)
@@ -649,7 +679,7 @@ def register_booking_handlers(bot: Bot):
     async def booking_guests_set(message: Message):
         payload = message.get_payload_json() or {}
         data = _get_booking_data(message)
-        service = await service_repo.get_by_id(int(data["service_id"]))
+        service = await catalog.get_service(int(data["service_id"]))
         max_guests = _normalize_max_guests(service.max_num_clients if service else data.get("max_num_clients", 1))
         data["max_num_clients"] = max_guests
         guests_count = int(payload.get("g"))
@@ -663,7 +693,7 @@ def register_booking_handlers(bot: Bot):
     @bot.on.message(text="➕ Доп. услуги", state=VkBookingState.filling_form)
     async def booking_extras(message: Message):
         data = _get_booking_data(message)
-        extra_services = await extra_service_repo.get_all_active()
+        extra_services = await catalog.get_active_extra_services()
         data["extra_labels"] = build_extra_service_label_map(extra_services)
         selected_extras = [
             int(extra_id)
@@ -686,7 +716,7 @@ def register_booking_handlers(bot: Bot):
     async def booking_extra_toggle(message: Message):
         payload = message.get_payload_json() or {}
         data = _get_booking_data(message)
-        extra_services = await extra_service_repo.get_all_active()
+        extra_services = await catalog.get_active_extra_services()
         data["extra_labels"] = build_extra_service_label_map(extra_services)
         extra_id = int(payload.get("x"))
         extras = [
@@ -821,7 +851,7 @@ def register_booking_handlers(bot: Bot):
             return
 
         service_id = int(data["service_id"])
-        service = await service_repo.get_by_id(service_id)
+        service = await catalog.get_service(service_id)
         if service and validate_guests_count(
             int(data.get("guests_count") or 0),
             max_guests=_normalize_max_guests(service.max_num_clients),
@@ -840,6 +870,7 @@ def register_booking_handlers(bot: Bot):
             duration_minutes=duration,
             service_id=service_id,
             service_name=service_name,
+            holder=_slot_holder(message),
         )
         if not ok:
             await message.answer(f"❌ Время недоступно: {reason}", keyboard=_get_current_form_keyboard(data))
@@ -875,44 +906,41 @@ def register_booking_handlers(bot: Bot):
             event_start=event_start,
             event_end=event_end,
             calendar_available=CALENDAR_AVAILABLE,
-            calendar_service_cls=GoogleCalendarService,
+            calendar_service_factory=get_calendar_service,
             calendar_description=build_vk_calendar_description(preview_summary, vk_id=message.from_id),
             sync_client=_sync_client,
+            slot_holder=_slot_holder(message),
             admin_notification_builder=lambda summary: build_vk_booking_admin_notification_for_telegram(
                 summary=summary,
                 vk_id=message.from_id,
             ),
         )
+        calendar_result = use_case_result.finalize_result.calendar_result
+        if isinstance(calendar_result.error, CalendarSlotTakenError):
+            # Слот заняли раньше: бронирование не состоялось, форма остаётся для выбора другого времени
+            await release_booking_slot(_slot_holder(message))
+            await message.answer(f"❌ Время недоступно: {SLOT_HELD_MESSAGE}", keyboard=_get_current_form_keyboard(data))
+            return
+
         summary = use_case_result.summary
         notification = use_case_result.admin_notification
         vk_notification = build_vk_booking_admin_notification(
             summary=summary,
             vk_id=message.from_id,
         )
-        created = use_case_result.finalize_result.calendar_result.created
-        if use_case_result.finalize_result.calendar_result.error:
+        created = calendar_result.created
+        if calendar_result.error:
             await message.answer(
-                f"⚠️ Не удалось создать событие в календаре: {use_case_result.finalize_result.calendar_result.error}",
+                f"⚠️ Не удалось создать событие в календаре: {calendar_result.error}",
                 keyboard=_get_current_form_keyboard(data),
             )
 
-        # Уведомляем администраторов в Telegram о брони из VK
-        try:
-            if TELEGRAM_BOT_TOKEN:
-                await send_telegram_admin_notification(
-                    notification=notification,
-                    bot_token=TELEGRAM_BOT_TOKEN,
-                )
-        except Exception:
-            pass
-
-        try:
-            await send_vk_admin_notification(
-                notification=vk_notification,
-                api=message.ctx_api,
-            )
-        except Exception:
-            pass
+        # Уведомляем администраторов в Telegram и VK, не задерживая ответ клиенту
+        admin_notifier.notify_in_background(
+            telegram=notification,
+            vk=vk_notification,
+            vk_api=message.ctx_api,
+        )
 
         text = build_vk_confirmation_text(summary, calendar_event_created=created)
         await _clear_state(bot, message)
@@ -924,6 +952,7 @@ def register_booking_handlers(bot: Bot):
     @bot.on.message(payload_contains={"a": "bk_cancel"})
     @bot.on.message(text="❌ Отменить")
     async def booking_cancel(message: Message):
+        await release_booking_slot(_slot_holder(message))
         await _clear_state(bot, message)
         await message.answer("❌ Бронирование отменено.", keyboard=get_main_menu_keyboard(is_admin=await is_vk_admin_id(message.from_id)))
 
@@ -6,7 +6,7 @@ from vkbottle import BaseStateGroup, Keyboard, KeyboardButtonColor, Text
 from vkbottle.bot import Bot, Message
 
 from config import VK_GROUP_ID
-from app.integrations.local.db import admin_repo, faq_repo, support_repo
+from app.integrations.local.db import admin_directory, faq_repo, support_repo
 from app.core.modules.support.common import (
     build_faq_list_text,
     get_faq_page_data,
@@ -69,7 +69,7 @@ async def forward_question_to_vk_admins(message: Message) -> bool:
     dialog_link = f"https://vk.com/gim{VK_GROUP_ID}/convo/{message.from_id}?entrypoint=list_all"
 
     support_request = await prepare_vk_support_request(
-        admin_repo=admin_repo,
+        admin_repo=admin_directory,
         support_repo=support_repo,
         user_id=message.from_id,
         chat_id=message.peer_id,
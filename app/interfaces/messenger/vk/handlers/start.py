@@ -2,12 +2,12 @@
 
 from vkbottle.bot import Bot, Message
 
-from app.integrations.local.db import client_service, service_repo
+from app.integrations.local.db import catalog, client_service
 from app.interfaces.messenger.tg.services.calendar_queries import (
     delete_event,
     get_user_calendar_events_by_vk_id,
     is_calendar_available,
-    list_events,
+    list_linked_event_ids,
 )
 from app.interfaces.messenger.vk.auth import is_vk_admin_id
 from app.interfaces.messenger.vk.handlers.booking import get_services_booking_keyboard
@@ -66,7 +66,7 @@ async def _send_main_menu(message: Message):
 
 
 async def _send_services(message: Message):
-    services = await service_repo.get_all_active()
+    services = await catalog.get_active_services()
     if not services:
         await message.answer(
             "📸 Сейчас нет доступных услуг.",
@@ -219,21 +219,9 @@ async def _cancel_active_booking(message: Message, event_id: str):
         await message.answer("Бронирование не найдено.", keyboard=get_my_bookings_keyboard())
         return
 
-    now = datetime.now()
-    period_start = now
-    period_end = now + timedelta(days=90)
     try:
-        all_events = await list_events(period_start, period_end)
-        marker = f"Связано с событием: {event_id}"
-        linked_events = [
-            item for item in all_events
-            if marker in (item.get("description") or "")
-            and "Service ID: 9" in (item.get("description") or "")
-        ]
-        for linked in linked_events:
-            linked_id = linked.get("id")
-            if linked_id:
-                await delete_event(linked_id)
+        for linked_id in await list_linked_event_ids(event_id):
+            await delete_event(linked_id)
         await delete_event(event_id)
     except Exception:
         await message.answer("Не удалось отменить бронирование.", keyboard=get_my_bookings_keyboard())
@@ -1,16 +1,22 @@
 import asyncio
 import logging
 import ssl
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 import certifi
 from aiohttp import TCPConnector
 from vkbottle import API, AiohttpClient, Bot
 
-from config import REDIS_URL, VK_BOT_TOKEN, VK_REDIS_KEY_PREFIX, VK_REDIS_STATE_TTL_SECONDS
-from app.bootstrap import install_asyncio_exception_handler
-from app.integrations.local.calendar.cache_sync import run_calendar_cache_sync_loop, sync_calendar_cache
-from app.integrations.local.db import db_manager
-from app.interfaces.messenger.tg.services.booking_reminders import run_booking_reminder_loop, send_vk_booking_reminders
+from config import (
+    REDIS_URL,
+    VK_BOT_TOKEN,
+    VK_REDIS_KEY_PREFIX,
+    VK_REDIS_STATE_TTL_SECONDS,
+)
+from app.bootstrap.scheduler import Scheduler
+from app.interfaces.messenger.shared.runtime import messenger_runtime
+from app.interfaces.messenger.tg.services.booking_reminders import schedule_booking_reminders, send_vk_booking_reminders
 from app.interfaces.messenger.vk.handlers import register_handlers
 from app.interfaces.messenger.vk.state_dispenser import MemoryStateDispenser, RedisStateDispenser
 
@@ -24,19 +30,7 @@ def _build_vk_api() -> API:
     return API(token=VK_BOT_TOKEN, http_client=http_client)
 
 
-async def build_bot() -> Bot:
-    install_asyncio_exception_handler(asyncio.get_running_loop())
-    if not VK_BOT_TOKEN:
-        raise RuntimeError("VK_BOT_TOKEN/VK_GROUP_TOKEN не задан в .env")
-
-    await db_manager.init_database()
-    logger.info("База данных инициализирована")
-    try:
-        synced_count = await sync_calendar_cache(force=True)
-        logger.info("Календарный кэш инициализирован: %s событий", synced_count)
-    except Exception:
-        logger.exception("Не удалось выполнить первичную синхронизацию календарного кэша")
-
+async def _build_state_dispenser(*, require_redis: bool = False) -> RedisStateDispenser | MemoryStateDispenser:
     state_dispenser = RedisStateDispenser(
         redis_url=REDIS_URL,
         key_prefix=VK_REDIS_KEY_PREFIX,
@@ -45,6 +39,9 @@ async def build_bot() -> Bot:
     try:
         await state_dispenser.healthcheck()
     except Exception as e:
+        if require_redis:
+            await state_dispenser.close()
+            raise RuntimeError(f"Redis недоступен по REDIS_URL={REDIS_URL}, а состояния VK нужны всем воркерам") from e
         logger.warning(
             "Redis недоступен по REDIS_URL=%s. VK бот будет запущен с in-memory state dispenser. "
             "Состояния VK не переживут перезапуск процесса. Ошибка: %s",
@@ -52,24 +49,84 @@ async def build_bot() -> Bot:
             e,
         )
         state_dispenser = MemoryStateDispenser(ttl_seconds=VK_REDIS_STATE_TTL_SECONDS)
+    return state_dispenser
 
+
+@asynccontextmanager
+async def vk_bot(scheduler: Scheduler | None = None, *, require_redis: bool = False) -> AsyncIterator[Bot]:
+    """VK бот поверх уже открытых общих ресурсов процесса.
+
+    Если передан ``scheduler``, в него добавляются напоминания VK.
+    С ``require_redis`` бот не запускается без Redis для состояний.
+    """
+    if not VK_BOT_TOKEN:
+        raise RuntimeError("VK_BOT_TOKEN/VK_GROUP_TOKEN не задан в .env")
+
+    state_dispenser = await _build_state_dispenser(require_redis=require_redis)
     bot = Bot(api=_build_vk_api(), state_dispenser=state_dispenser)
     register_handlers(bot)
+    if scheduler is not None:
+        schedule_booking_reminders(scheduler, "vk", lambda: send_vk_booking_reminders(bot))
 
-    async def _vk_reminder_task():
-        await run_booking_reminder_loop(
-            sender_name="vk",
-            send_callback=lambda: send_vk_booking_reminders(bot),
-        )
+    try:
+        yield bot
+    finally:
+        await state_dispenser.close()
+        await bot.api.http_client.close()
+
+
+@asynccontextmanager
+async def vk_runtime(*, background_jobs: bool = True, require_redis: bool = False) -> AsyncIterator[Bot]:
+    """VK бот и общие ресурсы процесса VK.
+
+    ``background_jobs`` включает синхронизацию календаря, напоминания и outbox.
+    Воркеры Callback API, которых несколько, запускаются без них: фоновые
+    задачи выполняет один отдельный процесс. Им же нужен ``require_redis``:
+    без Redis у каждого воркера были бы свои состояния и свой устаревший
+    индекс занятости.
+    """
+    async with messenger_runtime("vk", background_jobs=background_jobs, require_redis=require_redis) as scheduler:
+        async with vk_bot(scheduler, require_redis=require_redis) as bot:
+            yield bot
+
+
+async def process_event(bot: Bot, event: dict) -> None:
+    """Передаёт событие VK обработчикам бота; общее для Long Poll и Callback API."""
+    try:
+        await bot.process_event(event)
+    except Exception:
+        logger.exception("Ошибка обработки события VK type=%s id=%s", event.get("type"), event.get("event_id"))
+
+
+async def poll_events(bot: Bot) -> None:
+    """Long Poll VK в текущем event loop.
+
+    ``bot.run_forever`` заводит собственный цикл через ``loop_wrapper``, поэтому
+    рядом с другим ботом события читаются здесь, а каждое обрабатывается
+    отдельной задачей, как в vkbottle.
+    """
+    tasks: set[asyncio.Task] = set()
+    try:
+        async for response in bot.polling.listen():
+            for event in response.get("updates", []):
+                task = asyncio.create_task(process_event(bot, event))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+    finally:
+        # Как и вебхуки, дожидаемся уже принятых событий перед закрытием бота.
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-    async def _vk_calendar_cache_task():
-        await run_calendar_cache_sync_loop("vk")
 
-    bot.loop_wrapper.add_task(_vk_reminder_task)
-    bot.loop_wrapper.add_task(_vk_calendar_cache_task)
-    return bot
+async def main():
+    """Запуск VK бота через Long Poll."""
+    async with vk_runtime() as bot:
+        logger.info("VK bot запущен (Long Poll)")
+        await poll_events(bot)
 
 
-def run_forever(bot: Bot):
-    logger.info("VK bot запущен (Long Poll)")
-    bot.run_forever()
+async def run_background_jobs():
+    """Фоновые задачи VK без приёма событий, для Callback API с несколькими воркерами."""
+    async with vk_runtime(require_redis=True):
+        logger.info("Фоновые задачи VK запущены")
+        await asyncio.Event().wait()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import random
 import ssl
 
 import certifi
@@ -7,46 +8,46 @@ from aiohttp import TCPConnector
 from vkbottle import API, AiohttpClient
 
 from config import VK_BOT_TOKEN
-from app.core.modules.support.common import get_active_admin_targets
-from app.integrations.local.db import admin_repo
+from app.integrations.local.db import admin_directory
+from app.interfaces.messenger.shared.dispatch import DispatchResult, vk_dispatcher
 
 
-def _build_vk_api() -> API:
+def build_vk_api() -> API:
     ssl_context = ssl.create_default_context(cafile=certifi.where())
     http_client = AiohttpClient(connector=TCPConnector(ssl=ssl_context))
     return API(token=VK_BOT_TOKEN, http_client=http_client)
 
 
 async def _get_active_admin_vk_ids() -> list[int]:
-    admins = await admin_repo.get_all()
-    return get_active_admin_targets(admins, channel="vk")
+    return await admin_directory.active_targets("vk")
 
 
 async def send_vk_admin_notification(
     *,
     notification,
     api: API | None = None,
-) -> None:
+) -> list[DispatchResult]:
+    """Send ``notification`` to every active VK admin; one result per admin."""
     text = getattr(notification, "text", None)
     if not text or not VK_BOT_TOKEN:
-        return
+        return []
 
     admin_ids = await _get_active_admin_vk_ids()
     if not admin_ids:
-        return
+        return []
 
     own_api = api is None
-    vk_api = api or _build_vk_api()
+    vk_api = api or build_vk_api()
+    def build_job(admin_id: int):
+        random_id = random.randint(1, 2**31 - 1)
+        return lambda: vk_api.messages.send(
+            peer_id=admin_id,
+            random_id=random_id,
+            message=text,
+        )
+
     try:
-        for admin_id in admin_ids:
-            try:
-                await vk_api.messages.send(
-                    peer_id=admin_id,
-                    random_id=0,
-                    message=text,
-                )
-            except Exception as exc:
-                print(f"Не удалось отправить VK-уведомление админу {admin_id}: {exc}")
+        return await vk_dispatcher.send_all((admin_id, build_job(admin_id)) for admin_id in admin_ids)
     finally:
         if own_api:
             await vk_api.http_client.close()
@@ -39,7 +39,7 @@ class RedisStateDispenser(ABCStateDispenser):
         await self._redis.delete(self._key(peer_id))
 
     async def close(self):
-        await self._redis.close()
+        await self._redis.aclose()
 
     async def healthcheck(self) -> bool:
         return bool(await self._redis.ping())
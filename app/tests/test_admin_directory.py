@@ -0,0 +1,89 @@
+import asyncio
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.integrations.local.db.admin_directory import AdminDirectory
+from app.integrations.local.db.database import DatabaseManager
+from app.integrations.local.db.models import Admin
+from app.integrations.local.db.repositories import AdminRepository
+from app.integrations.local.invalidation import InvalidationEvent, invalidation_bus
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+
+
+class TestAdminDirectory(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.repo = AdminRepository(self.manager)
+        self.directory = AdminDirectory(self.repo, ttl_seconds=3600)
+        self.directory.subscribe()
+        self.addCleanup(
+            invalidation_bus.unsubscribe,
+            InvalidationEvent.ADMIN_CHANGED,
+            self.directory._on_admin_changed,
+        )
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_lookups_are_served_from_snapshot(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self.repo.create(Admin(telegram_id=101, vk_id=201))
+            await self.repo.create(Admin(telegram_id=102, is_active=False))
+            with patch.object(self.repo, "get_all", wraps=self.repo.get_all) as get_all:
+                results = (
+                    await self.directory.get_by_telegram_id(101),
+                    await self.directory.get_by_telegram_id(102),
+                    await self.directory.get_by_vk_id(201),
+                    await self.directory.active_targets("telegram"),
+                    await self.directory.active_targets("vk"),
+                )
+            return results, get_all.call_count
+
+        (tg_admin, inactive, vk_admin, tg_targets, vk_targets), loads = asyncio.run(scenario())
+        self.assertEqual(101, tg_admin.telegram_id)
+        self.assertIsNone(inactive)
+        self.assertEqual(201, vk_admin.vk_id)
+        self.assertEqual([101], tg_targets)
+        self.assertEqual([201], vk_targets)
+        self.assertEqual(1, loads)
+
+    def test_admin_writes_refresh_the_snapshot(self):
+        async def scenario():
+            await self.manager.init_database()
+            admin_id = await self.repo.create(Admin(telegram_id=101))
+            before = await self.directory.active_targets("telegram")
+            await self.repo.update(Admin(id=admin_id, telegram_id=101, is_active=False))
+            after_update = await self.directory.active_targets("telegram")
+            await self.repo.create(Admin(telegram_id=103))
+            return before, after_update, await self.directory.active_targets("telegram")
+
+        before, after_update, after_create = asyncio.run(scenario())
+        self.assertEqual([101], before)
+        self.assertEqual([], after_update)
+        self.assertEqual([103], after_create)
+
+    def test_snapshot_expires_after_ttl(self):
+        self.directory.ttl_seconds = 0
+
+        async def scenario():
+            await self.manager.init_database()
+            with patch.object(self.repo, "get_all", wraps=self.repo.get_all) as get_all:
+                await self.directory.get_by_telegram_id(1)
+                await self.directory.get_by_telegram_id(1)
+            return get_all.call_count
+
+        self.assertEqual(2, asyncio.run(scenario()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.interfaces.messenger.shared import admin_notifier as notifier_module
+from app.interfaces.messenger.shared.admin_notifier import AdminNotifier
+from app.interfaces.messenger.shared.dispatch import DispatchResult
+from app.interfaces.messenger.tg.services import admin_notifications as tg_notifications
+from app.interfaces.messenger.vk.services import admin_notifications as vk_notifications
+
+
+class TestAdminNotifier(unittest.TestCase):
+    def setUp(self):
+        self.notification = SimpleNamespace(text="Новая бронь")
+
+    def test_fans_out_to_both_platforms_concurrently(self):
+        started = []
+
+        async def send_telegram(*, notification, bot):
+            started.append("telegram")
+            await asyncio.sleep(0.05)
+            return [DispatchResult(key=1, ok=True, attempts=1), DispatchResult(key=2, ok=False, attempts=1)]
+
+        async def send_vk(*, notification, api):
+            started.append("vk")
+            await asyncio.sleep(0.05)
+            return [DispatchResult(key=10, ok=True, attempts=1)]
+
+        notifier = AdminNotifier(telegram_bot_token="token", vk_token="token")
+        with patch.object(tg_notifications, "send_telegram_admin_notification", send_telegram), patch.object(
+            vk_notifications, "send_vk_admin_notification", send_vk
+        ):
+            async def scenario():
+                loop = asyncio.get_running_loop()
+                began = loop.time()
+                report = await notifier.notify(
+                    telegram=self.notification,
+                    vk=self.notification,
+                    telegram_bot=MagicMock(),
+                    vk_api=MagicMock(),
+                )
+                return report, loop.time() - began
+
+            report, elapsed = asyncio.run(scenario())
+
+        self.assertEqual({"telegram", "vk"}, set(started))
+        self.assertLess(elapsed, 0.09)
+        self.assertEqual(2, report.delivered)
+        self.assertEqual([2], [result.key for result in report.failed])
+
+    def test_reuses_one_telegram_bot_and_closes_it(self):
+        bot = MagicMock()
+        bot.session.close = AsyncMock()
+        send_telegram = AsyncMock(return_value=[])
+        notifier = AdminNotifier(telegram_bot_token="token", vk_token=None)
+
+        with patch.object(notifier_module, "TelegramBot", return_value=bot) as bot_cls, patch.object(
+            tg_notifications, "send_telegram_admin_notification", send_telegram
+        ):
+            async def scenario():
+                await notifier.notify(telegram=self.notification)
+                await notifier.notify(telegram=self.notification)
+                await notifier.close()
+
+            asyncio.run(scenario())
+
+        bot_cls.assert_called_once_with(token="token")
+        self.assertEqual(2, send_telegram.await_count)
+        bot.session.close.assert_awaited_once()
+
+    def test_close_waits_for_background_notifications(self):
+        delivered = []
+
+        async def send_vk(*, notification, api):
+            await asyncio.sleep(0.01)
+            delivered.append(notification.text)
+            return [DispatchResult(key=10, ok=True, attempts=1)]
+
+        notifier = AdminNotifier(telegram_bot_token=None, vk_token="token")
+        with patch.object(vk_notifications, "send_vk_admin_notification", send_vk):
+            async def scenario():
+                notifier.notify_in_background(vk=self.notification, vk_api=MagicMock())
+                self.assertEqual([], delivered)
+                await notifier.close()
+
+            asyncio.run(scenario())
+
+        self.assertEqual(["Новая бронь"], delivered)
+
+
+if __name__ == "__main__":
+    unittest.main()
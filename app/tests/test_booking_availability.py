@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from app.core.modules.booking import availability
+from app.integrations.local.calendar.busy_index import BusyIndex
+
+
+TZ = ZoneInfo("Europe/Moscow")
+
+
+class TestAvailabilityForRange(unittest.TestCase):
+    def setUp(self):
+        index = BusyIndex(TZ)
+        index.load(
+            [
+                ("full", datetime(2026, 4, 11, 8, tzinfo=TZ), datetime(2026, 4, 11, 22, tzinfo=TZ)),
+                ("noon", datetime(2026, 4, 12, 12, tzinfo=TZ), datetime(2026, 4, 12, 13, tzinfo=TZ)),
+            ]
+        )
+
+        async def get_busy_index():
+            return index
+
+        self.holds = []
+
+        async def list_holds(start, end, exclude_holder=None):
+            return [
+                (hold_start, hold_end)
+                for holder, hold_start, hold_end in self.holds
+                if holder != exclude_holder and hold_start < end and hold_end > start
+            ]
+
+        calendar_service = SimpleNamespace(
+            time_zone="Europe/Moscow",
+            get_busy_index=get_busy_index,
+            list_holds=list_holds,
+        )
+        patcher = patch.object(availability, "get_calendar_service", return_value=calendar_service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counts_match_per_day_slot_lookup(self):
+        async def scenario():
+            counts = await availability.get_availability_for_range(date(2026, 4, 10), 3, duration_minutes=120)
+            per_day = {}
+            for target_date in counts:
+                slots, _, _ = await availability.get_time_slots_for_date(target_date, 1, None, 120)
+                per_day[target_date] = len(slots)
+            return counts, per_day
+
+        counts, per_day = asyncio.run(scenario())
+        self.assertEqual(per_day, counts)
+        self.assertEqual(0, counts[date(2026, 4, 11)])
+        self.assertGreater(counts[date(2026, 4, 10)], counts[date(2026, 4, 12)])
+
+    def test_holds_of_other_clients_remove_slots(self):
+        self.holds.append(("vk:1", datetime(2026, 4, 10, 12, tzinfo=TZ), datetime(2026, 4, 10, 13, tzinfo=TZ)))
+
+        async def scenario():
+            held = await availability.get_availability_for_range(date(2026, 4, 10), 1, holder="telegram:2")
+            own = await availability.get_availability_for_range(date(2026, 4, 10), 1, holder="vk:1")
+            slots, _, _ = await availability.get_time_slots_for_date(date(2026, 4, 10), 1, None, 60, holder="telegram:2")
+            available, reason = await availability.is_booking_available(
+                date(2026, 4, 10), datetime(2026, 4, 10, 12), 60, 1, None, holder="telegram:2"
+            )
+            return held, own, slots, available, reason
+
+        held, own, slots, available, reason = asyncio.run(scenario())
+        day = date(2026, 4, 10)
+        self.assertEqual(own[day] - 1, held[day])
+        self.assertNotIn(12, [slot["start_time"].hour for slot in slots])
+        self.assertFalse(available)
+        self.assertEqual(availability.SLOT_HELD_MESSAGE, reason)
+
+    def test_returns_none_when_calendar_fails(self):
+        async def failing_index():
+            raise RuntimeError("not synced")
+
+        broken = SimpleNamespace(time_zone="Europe/Moscow", get_busy_index=failing_index)
+        with patch.object(availability, "get_calendar_service", return_value=broken):
+            result = asyncio.run(availability.get_availability_for_range(date(2026, 4, 10), 7))
+
+        self.assertIsNone(result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import shutil
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.integrations.local.calendar import cache_repo
+from app.integrations.local.calendar.cache_repo import CalendarCacheRepository
+from app.integrations.local.calendar.projection import parse_booking_projection
+from app.integrations.local.db.database import DatabaseManager
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+TZ = ZoneInfo("Europe/Moscow")
+PERIOD_START = datetime(2026, 4, 1, tzinfo=TZ)
+PERIOD_END = datetime(2026, 5, 1, tzinfo=TZ)
+
+TG_DESCRIPTION = (
+    "<b>Кто забронировал</b>\nАнна Петрова\nemail: anna@example.com\n+7 999 123 45 67\n"
+    "Telegram: https://t.me/anna_photo\n\nService ID: 3"
+)
+VK_DESCRIPTION = "<b>Кто забронировал</b>\nБорис\n8 (912) 000-11-22\nVK ID: 40506735\n\nService ID: 4"
+EXTRA_DESCRIPTION = "Service ID: 9\nСвязано с событием: tg-main\n+7 999 123 45 67\nTelegram ID: 111"
+
+
+class TestBookingProjectionParser(unittest.TestCase):
+    def test_telegram_booking_fields(self):
+        booking = parse_booking_projection(TG_DESCRIPTION)
+        self.assertEqual("telegram", booking.channel)
+        self.assertTrue(booking.is_primary)
+        self.assertEqual("Анна Петрова", booking.client_name)
+        self.assertEqual("9991234567", booking.phone10)
+        self.assertEqual("anna_photo", booking.tg_username)
+        self.assertEqual(3, booking.service_id)
+        self.assertIsNone(booking.linked_event_id)
+
+    def test_linked_extra_service_is_not_primary(self):
+        booking = parse_booking_projection(EXTRA_DESCRIPTION)
+        self.assertFalse(booking.is_primary)
+        self.assertEqual(9, booking.service_id)
+        self.assertEqual("tg-main", booking.linked_event_id)
+        self.assertEqual(111, booking.tg_id)
+
+
+class TestBookingProjectionRepository(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.repo = CalendarCacheRepository(self.manager)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    @staticmethod
+    def _row(event_id: str, day: int, description: str) -> dict:
+        start = datetime(2026, 4, day, 12, 0, tzinfo=TZ)
+        return {
+            "event_id": event_id,
+            "summary": f"Hall {event_id}",
+            "description": description,
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=1)).isoformat(),
+            "raw_event": json.dumps({"id": event_id}),
+            "etag": "1",
+            "updated": None,
+        }
+
+    async def _seed(self) -> None:
+        await self.manager.init_database()
+        await self.repo.replace_period(
+            calendar_id="cal",
+            period_start=PERIOD_START,
+            period_end=PERIOD_END,
+            rows=[
+                self._row("tg-main", 2, TG_DESCRIPTION),
+                self._row("tg-extra", 2, EXTRA_DESCRIPTION),
+                self._row("vk-main", 3, VK_DESCRIPTION),
+            ],
+        )
+
+    def _bookings(self, **filters):
+        return self.repo.list_bookings(
+            calendar_id="cal",
+            period_start=PERIOD_START,
+            period_end=PERIOD_END,
+            **filters,
+        )
+
+    def test_filters_by_channel_and_owner(self):
+        async def scenario():
+            await self._seed()
+            return (
+                await self._bookings(channel="telegram", primary_only=True),
+                await self._bookings(phone10="9991234567"),
+                await self._bookings(phone10="0000000000", vk_id=40506735),
+            )
+
+        reminders, by_phone, by_vk_id = asyncio.run(scenario())
+        self.assertEqual(["tg-main"], [event["id"] for event in reminders])
+        self.assertEqual("anna@example.com", reminders[0]["booking"].email)
+        self.assertEqual(["tg-main", "tg-extra"], [event["id"] for event in by_phone])
+        self.assertEqual(["vk-main"], [event["id"] for event in by_vk_id])
+
+    def test_linked_events_and_contact_lookup(self):
+        async def scenario():
+            await self._seed()
+            return await self.repo.list_linked_event_ids("tg-main"), await self.repo.get_booking("vk-main")
+
+        linked, booking = asyncio.run(scenario())
+        self.assertEqual(["tg-extra"], linked)
+        self.assertEqual("40506735", booking.contact_details()["vk_id"])
+        self.assertEqual("8 (912) 000-11-22", booking.contact_details()["phone"])
+
+    def test_projection_follows_deleted_events(self):
+        async def scenario():
+            await self._seed()
+            await self.repo.delete_event("tg-extra")
+            await self.repo.replace_period(
+                calendar_id="cal",
+                period_start=PERIOD_START,
+                period_end=PERIOD_END,
+                rows=[self._row("tg-main", 2, TG_DESCRIPTION)],
+            )
+            return await self.repo.list_linked_event_ids("tg-main"), await self.repo.get_booking("vk-main")
+
+        linked, vk_booking = asyncio.run(scenario())
+        self.assertEqual([], linked)
+        self.assertIsNone(vk_booking)
+
+    def test_only_changed_events_are_projected_again(self):
+        async def scenario():
+            await self._seed()
+            changed = self._row("vk-main", 3, VK_DESCRIPTION.replace("Борис", "Борис Б."))
+            changed["etag"] = "2"
+            with patch.object(cache_repo, "parse_booking_projection", wraps=parse_booking_projection) as parse:
+                await self.repo.replace_period(
+                    calendar_id="cal",
+                    period_start=PERIOD_START,
+                    period_end=PERIOD_END,
+                    rows=[
+                        self._row("tg-main", 2, TG_DESCRIPTION),
+                        self._row("tg-extra", 2, EXTRA_DESCRIPTION),
+                        changed,
+                    ],
+                )
+                await self.repo.apply_changes(
+                    calendar_id="cal",
+                    rows=[self._row("tg-main", 2, TG_DESCRIPTION)],
+                    deleted_event_ids=[],
+                )
+            return [call.args[0] for call in parse.call_args_list], await self.repo.get_booking("vk-main")
+
+        parsed, vk_booking = asyncio.run(scenario())
+        self.assertEqual([VK_DESCRIPTION.replace("Борис", "Борис Б.")], parsed)
+        self.assertEqual("Борис Б.", vk_booking.client_name)
+
+    def test_unchanged_events_without_projection_are_backfilled(self):
+        async def scenario():
+            await self._seed()
+            await self.manager.execute_write("DELETE FROM calendar_booking_projection")
+            await self.repo.apply_changes(
+                calendar_id="cal",
+                rows=[self._row("tg-main", 2, TG_DESCRIPTION)],
+                deleted_event_ids=[],
+            )
+            return await self.repo.get_booking("tg-main")
+
+        self.assertEqual("Анна Петрова", asyncio.run(scenario()).client_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
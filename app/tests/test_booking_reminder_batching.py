@@ -0,0 +1,120 @@
+import asyncio
+import shutil
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.integrations.local.calendar.projection import parse_booking_projection
+from app.integrations.local.db.database import DatabaseManager
+from app.integrations.local.db.models import Client
+from app.integrations.local.db.repositories import BookingReminderLogRepository, ClientRepository
+from app.interfaces.messenger.tg.services import booking_reminders
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
+
+
+def _event(event_id: str, description: str, hour: int) -> dict:
+    return {
+        "id": event_id,
+        "summary": f"Hall {event_id}",
+        "description": description,
+        "start": datetime(2026, 3, 14, hour, 0, tzinfo=MOSCOW_TZ),
+        "end": datetime(2026, 3, 14, hour + 1, 0, tzinfo=MOSCOW_TZ),
+        "booking": parse_booking_projection(description),
+    }
+
+
+def _list_bookings(events: list[dict]):
+    async def list_bookings(period_start, period_end, *, channel=None, primary_only=False, max_results=250):
+        return [
+            event for event in events
+            if event["booking"].channel == channel and (event["booking"].is_primary or not primary_only)
+        ]
+
+    return list_bookings
+
+
+class TestBookingReminderBatching(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.client_repo = ClientRepository(self.manager)
+        self.log_repo = BookingReminderLogRepository(self.manager)
+        for name, value in (("client_repo", self.client_repo), ("booking_reminder_log_repo", self.log_repo)):
+            patcher = patch.object(booking_reminders, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _collect(self, events, *, already_sent=()):
+        async def scenario():
+            await self.manager.init_database()
+            by_id = await self.client_repo.create(Client(name="Anna", telegram_id=111, phone="9111234567"))
+            by_phone = await self.client_repo.create(Client(name="Boris", telegram_id=222, phone="9997654321"))
+            await self.log_repo.mark_sent(
+                "telegram",
+                datetime.now(MOSCOW_TZ).date().isoformat(),
+                [(event_id, by_id, "2026-03-14") for event_id in already_sent],
+            )
+            with patch.object(booking_reminders, "list_bookings", _list_bookings(events)), patch.object(
+                self.manager, "reader", wraps=self.manager.reader
+            ) as reader:
+                grouped = await booking_reminders.collect_tomorrow_reminder_events("telegram")
+            return grouped, reader.call_count, by_id, by_phone
+
+        return asyncio.run(scenario())
+
+    def test_clients_and_sent_log_are_resolved_in_batches(self):
+        events = [
+            _event("e1", "Service ID: 3\nTelegram ID: 111", 10),
+            _event("e2", "Service ID: 3\nTelegram ID: 111", 12),
+            _event("e3", "Service ID: 3\n+7 999 765 43 21\nTelegram: https://t.me/borisb", 14),
+            _event("e4", "Service ID: 3\nTelegram ID: 999", 16),
+            _event("e5", "Service ID: 3\nVK ID: 111", 18),
+        ]
+
+        grouped, queries, anna_id, boris_id = self._collect(events)
+
+        self.assertEqual(3, queries)
+        self.assertEqual(["e1", "e2"], [item.event_id for item in grouped[anna_id]])
+        self.assertEqual(222, grouped[boris_id][0].chat_id)
+        self.assertEqual({anna_id, boris_id}, set(grouped))
+
+    def test_already_sent_events_are_skipped(self):
+        events = [
+            _event("e1", "Service ID: 3\nTelegram ID: 111", 10),
+            _event("e2", "Service ID: 3\nTelegram ID: 111", 12),
+        ]
+
+        grouped, _queries, anna_id, _boris_id = self._collect(events, already_sent=["e1"])
+
+        self.assertEqual(["e2"], [item.event_id for item in grouped[anna_id]])
+
+    def test_mark_sent_inserts_rows_once(self):
+        async def scenario():
+            await self.manager.init_database()
+            client_id = await self.client_repo.create(Client(name="Anna", telegram_id=111))
+            entries = [("e1", client_id, "2026-03-14"), ("e2", client_id, "2026-03-14")]
+            first = await self.log_repo.mark_sent("telegram", "2026-03-13", entries)
+            second = await self.log_repo.mark_sent("telegram", "2026-03-13", entries)
+            sent = await self.log_repo.get_sent_event_ids("telegram", ["e1", "e2", "e3"], "2026-03-13")
+            return first, second, sent
+
+        first, second, sent = asyncio.run(scenario())
+        self.assertEqual(2, first)
+        self.assertEqual(0, second)
+        self.assertEqual({"e1", "e2"}, sent)
+
+
+if __name__ == "__main__":
+    unittest.main()
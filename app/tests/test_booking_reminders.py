@@ -7,26 +7,27 @@ from app.core.modules.booking.presentation import (
     build_telegram_calendar_description,
     build_vk_calendar_description,
 )
+from app.integrations.local.calendar.projection import (
+    extract_booking_contact_details,
+    parse_booking_projection,
+)
 from app.interfaces.messenger.tg.services.booking_reminders import (
     ReminderEvent,
     _build_reminder_text,
-    _event_matches_channel,
-    _is_primary_booking_event,
 )
-from app.interfaces.messenger.tg.services.contact_utils import extract_booking_contact_details
 
 
 class TestBookingReminders(unittest.TestCase):
     def test_primary_booking_event_filters_extra_slot(self):
         description = "Service ID: 9\nLinked Service ID: 3\nСвязано с событием: abc123"
-        self.assertFalse(_is_primary_booking_event(description))
-        self.assertTrue(_is_primary_booking_event("Service ID: 3\nTelegram: https://t.me/testuser"))
+        self.assertFalse(parse_booking_projection(description).is_primary)
+        self.assertTrue(parse_booking_projection("Service ID: 3\nTelegram: https://t.me/testuser").is_primary)
 
     def test_event_matches_expected_channel(self):
-        self.assertTrue(_event_matches_channel("Telegram: https://t.me/testuser", "telegram"))
-        self.assertFalse(_event_matches_channel("VK ID: 123", "telegram"))
-        self.assertTrue(_event_matches_channel("VK ID: 123", "vk"))
-        self.assertFalse(_event_matches_channel("Telegram: https://t.me/testuser", "vk"))
+        self.assertEqual("telegram", parse_booking_projection("Telegram: https://t.me/testuser").channel)
+        self.assertEqual("telegram", parse_booking_projection("Telegram ID: 123").channel)
+        self.assertEqual("vk", parse_booking_projection("VK ID: 123").channel)
+        self.assertIsNone(parse_booking_projection("Service ID: 3").channel)
 
     def test_extract_booking_contact_details_parses_vk_id(self):
         details = extract_booking_contact_details(
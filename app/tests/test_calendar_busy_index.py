@@ -0,0 +1,112 @@
+import random
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from app.integrations.local.calendar.busy_index import BusyIndex
+from app.integrations.local.calendar.freebusy import compute_free_slots
+
+
+TZ = ZoneInfo("Europe/Moscow")
+DAY = date(2026, 4, 10)
+
+
+def _at(hour: int, minute: int = 0, day: date = DAY) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=TZ)
+
+
+class TestBusyIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = BusyIndex(TZ)
+
+    def test_free_slots_match_compute_free_slots(self):
+        rng = random.Random(7)
+        day_start, day_end = _at(9), _at(21)
+        for _ in range(50):
+            events = []
+            for number in range(rng.randint(0, 6)):
+                start = day_start + timedelta(minutes=rng.randrange(-120, 12 * 60, 15))
+                events.append((f"e{number}", start, start + timedelta(minutes=rng.randrange(15, 240, 15))))
+            self.index.load(events)
+
+            # compute_free_slots only ever saw events starting inside the working day.
+            busy = [(start, end) for _, start, end in events if day_start <= start < day_end]
+            if any(start < day_start for _, start, _ in events):
+                continue
+            expected = compute_free_slots(busy, day_start, day_end, slot_minutes=120, step_minutes=60)
+            actual = self.index.free_slots(day_start, day_end, slot_minutes=120, step_minutes=60)
+            self.assertEqual(expected, actual)
+
+    def test_is_busy_uses_half_open_intervals(self):
+        self.index.load([("e1", _at(12), _at(13))])
+
+        self.assertTrue(self.index.is_busy(_at(12, 30), _at(14)))
+        self.assertFalse(self.index.is_busy(_at(13), _at(14)))
+        self.assertFalse(self.index.is_busy(_at(11), _at(12)))
+
+    def test_event_spanning_midnight_blocks_both_days(self):
+        next_day = DAY + timedelta(days=1)
+        self.index.load([("night", _at(22), _at(10, day=next_day))])
+
+        self.assertTrue(self.index.is_busy(_at(9, day=next_day), _at(10, day=next_day)))
+        self.assertEqual(
+            [(_at(10, day=next_day), _at(11, day=next_day))],
+            self.index.free_slots(
+                _at(9, day=next_day), _at(11, day=next_day), slot_minutes=60, step_minutes=60
+            ),
+        )
+
+    def test_upsert_and_remove_update_lookups(self):
+        self.index.load([])
+        self.index.upsert("e1", _at(12), _at(13))
+        self.assertTrue(self.index.is_busy(_at(12), _at(13)))
+
+        self.index.upsert("e1", _at(15), _at(16))
+        self.assertFalse(self.index.is_busy(_at(12), _at(13)))
+        self.assertTrue(self.index.is_busy(_at(15), _at(16)))
+
+        self.index.remove("e1")
+        self.assertFalse(self.index.is_busy(_at(15), _at(16)))
+
+    def test_all_day_slots_run_to_day_end(self):
+        self.index.load([("e1", _at(14), _at(15))])
+
+        slots = self.index.free_slots(_at(9), _at(21), slot_minutes=60, step_minutes=60, all_day=True)
+
+        self.assertEqual([(_at(15), _at(21)), (_at(16), _at(21)), (_at(17), _at(21)), (_at(18), _at(21)),
+                          (_at(19), _at(21)), (_at(20), _at(21))], slots)
+
+    def test_slot_lists_are_cached_until_their_day_changes(self):
+        next_day = DAY + timedelta(days=1)
+        self.index.load([("e1", _at(12), _at(13))])
+        free_slots = lambda day: self.index.free_slots(
+            _at(9, day=day), _at(21, day=day), slot_minutes=60, step_minutes=60
+        )
+        first = free_slots(DAY)
+        free_slots(next_day)
+
+        with patch.object(BusyIndex, "_merged_for_day", side_effect=AssertionError("recomputed")):
+            self.assertEqual(first, free_slots(DAY))
+
+        self.index.upsert("e2", _at(15, day=next_day), _at(16, day=next_day))
+        with patch.object(BusyIndex, "_merged_for_day", side_effect=AssertionError("recomputed")):
+            self.assertEqual(first, free_slots(DAY))
+        self.assertNotIn((_at(15, day=next_day), _at(16, day=next_day)), free_slots(next_day))
+
+        self.index.remove("e1")
+        self.assertIn((_at(12), _at(13)), free_slots(DAY))
+
+    def test_slot_cache_entries_expire(self):
+        index = BusyIndex(TZ, slot_cache_ttl=0)
+        index.load([])
+        index.free_slots(_at(9), _at(21), slot_minutes=60, step_minutes=60)
+
+        with patch.object(BusyIndex, "_merged_for_day", return_value=([], [])) as merged_for_day:
+            index.free_slots(_at(9), _at(21), slot_minutes=60, step_minutes=60)
+
+        merged_for_day.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
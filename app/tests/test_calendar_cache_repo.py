@@ -0,0 +1,98 @@
+import asyncio
+import json
+import shutil
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.integrations.local.calendar.cache_repo import CalendarCacheRepository
+from app.integrations.local.db.database import DatabaseManager
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+TZ = ZoneInfo("Europe/Moscow")
+PERIOD_START = datetime(2026, 4, 1, tzinfo=TZ)
+PERIOD_END = datetime(2026, 5, 1, tzinfo=TZ)
+
+
+def _row(event_id: str, day: int, etag: str) -> dict:
+    start = datetime(2026, 4, day, 12, 0, tzinfo=TZ)
+    event = {"id": event_id, "etag": etag, "summary": f"Event {event_id}"}
+    return {
+        "event_id": event_id,
+        "summary": event["summary"],
+        "description": "",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+        "raw_event": json.dumps(event),
+        "etag": etag,
+        "updated": None,
+    }
+
+
+class TestCalendarCacheReplacePeriod(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.repo = CalendarCacheRepository(self.manager)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _replace(self, rows: list[dict]) -> int:
+        return self.repo.replace_period(
+            calendar_id="cal",
+            period_start=PERIOD_START,
+            period_end=PERIOD_END,
+            rows=rows,
+        )
+
+    def test_unchanged_rows_are_not_rewritten(self):
+        async def scenario():
+            await self.manager.init_database()
+            first = await self._replace([_row("a", 2, "1"), _row("b", 3, "1")])
+            second = await self._replace([_row("a", 2, "1"), _row("b", 3, "1")])
+            third = await self._replace([_row("a", 2, "2"), _row("b", 3, "1")])
+            return first, second, third, await self.repo.get_event("a")
+
+        first, second, third, event = asyncio.run(scenario())
+        self.assertEqual(2, first)
+        self.assertEqual(0, second)
+        self.assertEqual(1, third)
+        self.assertEqual("2", event["etag"])
+
+    def test_events_missing_from_sync_are_removed(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._replace([_row("a", 2, "1"), _row("b", 3, "1")])
+            changed = await self._replace([_row("b", 3, "1")])
+            events = await self.repo.list_events(
+                calendar_id="cal",
+                period_start=PERIOD_START,
+                period_end=PERIOD_END,
+            )
+            return changed, [event["id"] for event in events]
+
+        changed, event_ids = asyncio.run(scenario())
+        self.assertEqual(1, changed)
+        self.assertEqual(["b"], event_ids)
+
+    def test_bulk_window_is_ingested_in_one_pass(self):
+        rows = [_row(f"e{index}", 1 + index % 28, "1") for index in range(3000)]
+
+        async def scenario():
+            await self.manager.init_database()
+            return await self._replace(rows), await self._replace(rows)
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(3000, first)
+        self.assertEqual(0, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from app.integrations.local.calendar.executor import CalendarCallTimeout, CalendarExecutor
+
+
+class CalendarExecutorTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.executor = CalendarExecutor(max_workers=2, timeout=0.2)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+
+    async def test_runs_call_in_worker_thread(self):
+        thread_name = await self.executor.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(thread_name.startswith("google-calendar"))
+
+    async def test_slow_call_times_out_without_blocking_loop(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            with self.assertRaises(CalendarCallTimeout):
+                await self.executor.run(time.sleep, 1, timeout=0.1)
+        finally:
+            ticker_task.cancel()
+
+        self.assertGreater(ticks, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import shutil
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.integrations.local.calendar.cache_repo import CalendarCacheRepository
+from app.integrations.local.calendar.fake import FakeCalendarService
+from app.integrations.local.calendar.outbox_repo import CalendarOutboxRepository
+from app.integrations.local.calendar.service import GoogleCalendarService
+from app.integrations.local.db.database import DatabaseManager
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+TZ = ZoneInfo("Europe/Moscow")
+PERIOD_START = datetime(2026, 4, 1, tzinfo=TZ)
+PERIOD_END = datetime(2026, 5, 1, tzinfo=TZ)
+
+
+class TestCalendarIncrementalSync(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.repo = CalendarCacheRepository(self.manager)
+        repo_patcher = patch("app.integrations.local.calendar.service.calendar_cache_repo", self.repo)
+        repo_patcher.start()
+        self.addCleanup(repo_patcher.stop)
+        outbox_patcher = patch(
+            "app.integrations.local.calendar.service.calendar_outbox_repo",
+            CalendarOutboxRepository(self.manager),
+        )
+        outbox_patcher.start()
+        self.addCleanup(outbox_patcher.stop)
+
+        self.fake = FakeCalendarService(page_size=2)
+        for index in range(3):
+            start = datetime(2026, 4, 10 + index, 12, 0, tzinfo=TZ)
+            self.fake.add_event(f"Event {index}", start, start + timedelta(hours=1), event_id=f"e{index}")
+        self.service = GoogleCalendarService(calendar_id="fake", service=self.fake)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _sync(self, **kwargs) -> int:
+        return self.service.sync_cache(period_start=PERIOD_START, period_end=PERIOD_END, **kwargs)
+
+    async def _cached_ids(self) -> list[str]:
+        events = await self.repo.list_events(calendar_id="fake", period_start=PERIOD_START, period_end=PERIOD_END)
+        return [event["id"] for event in events]
+
+    def test_second_sync_fetches_only_changes(self):
+        async def scenario():
+            await self.manager.init_database()
+            full_count = await self._sync()
+            self.fake.update_event("e1", summary="Renamed")
+            self.fake.events().delete(calendarId="fake", eventId="e2").execute()
+            incremental_count = await self._sync()
+            return full_count, incremental_count, await self._cached_ids(), await self.repo.get_event("e1")
+
+        full_count, incremental_count, cached_ids, renamed = asyncio.run(scenario())
+        self.assertEqual(3, full_count)
+        self.assertEqual(2, incremental_count)
+        self.assertEqual(["e0", "e1"], cached_ids)
+        self.assertEqual("Renamed", renamed["summary"])
+        last_call = self.fake.list_calls[-1]
+        self.assertIn("syncToken", last_call)
+        self.assertNotIn("timeMin", last_call)
+
+    def test_expired_token_triggers_full_resync(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._sync()
+            self.fake.expire_sync_tokens()
+            start = datetime(2026, 4, 20, 12, 0, tzinfo=TZ)
+            self.fake.add_event("Late", start, start + timedelta(hours=1), event_id="late")
+            count = await self._sync()
+            return count, await self._cached_ids(), await self.repo.get_sync_token("fake")
+
+        count, cached_ids, token = asyncio.run(scenario())
+        self.assertEqual(4, count)
+        self.assertEqual(["e0", "e1", "e2", "late"], cached_ids)
+        self.assertIsNotNone(token)
+        self.assertIn("timeMin", self.fake.list_calls[-1])
+
+    def test_busy_index_follows_sync_and_deletes(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._sync()
+            index = await self.service.get_busy_index()
+            e0_busy = index.is_busy(datetime(2026, 4, 10, 12, 30, tzinfo=TZ), datetime(2026, 4, 10, 13, tzinfo=TZ))
+
+            await self.service.delete_event("e2")
+            e2_busy = index.is_busy(datetime(2026, 4, 12, 12, tzinfo=TZ), datetime(2026, 4, 12, 13, tzinfo=TZ))
+
+            start = datetime(2026, 4, 20, 15, 0, tzinfo=TZ)
+            self.fake.add_event("Late", start, start + timedelta(hours=1), event_id="late")
+            await self._sync()
+            late_busy = index.is_busy(start, start + timedelta(minutes=30))
+            return e0_busy, e2_busy, late_busy
+
+        e0_busy, e2_busy, late_busy = asyncio.run(scenario())
+        self.assertTrue(e0_busy)
+        self.assertFalse(e2_busy)
+        self.assertTrue(late_busy)
+
+    def test_never_synced_cache_is_filled_from_google(self):
+        start = datetime.now(TZ).replace(microsecond=0) + timedelta(days=2)
+        self.fake.add_event("Soon", start, start + timedelta(hours=1), event_id="soon")
+
+        async def scenario():
+            await self.manager.init_database()
+            busy = (await self.service.get_busy_index()).is_busy(start, start + timedelta(minutes=30))
+            reserved = await self.service.reserve_event("Other", "", start, start + timedelta(hours=1))
+            return busy, reserved, await self.repo.get_last_sync("fake")
+
+        busy, reserved, last_sync = asyncio.run(scenario())
+        self.assertTrue(busy)
+        self.assertIsNone(reserved)
+        self.assertIsNotNone(last_sync)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+import asyncio
+import shutil
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from app.core.modules.booking.calendar_event import CalendarSlotTakenError, create_booking_calendar_event
+from app.integrations.local.calendar.cache_repo import CalendarCacheRepository
+from app.integrations.local.calendar.fake import FakeCalendarService
+from app.integrations.local.calendar.outbox import CalendarOutboxWorker
+from app.integrations.local.calendar.outbox_repo import (
+    OUTBOX_DONE,
+    OUTBOX_FAILED,
+    CalendarOutboxRepository,
+)
+from app.integrations.local.calendar.service import GoogleCalendarService
+from app.integrations.local.db.database import DatabaseManager
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+TZ = ZoneInfo("Europe/Moscow")
+SLOT_START = datetime(2026, 4, 10, 12, 0, tzinfo=TZ)
+SLOT_END = SLOT_START + timedelta(hours=1)
+
+
+class _FlakyCalendar(FakeCalendarService):
+    """Fails the first ``failures`` inserts after storing the event, like a lost response."""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def _insert(self, *, calendarId: str, body: dict) -> dict:
+        event = super()._insert(calendarId=calendarId, body=body)
+        if self.failures:
+            self.failures -= 1
+            raise TimeoutError("response lost")
+        return event
+
+
+class _RejectingCalendar(FakeCalendarService):
+    """Rejects every insert as a bad request, which is never retried."""
+
+    def _insert(self, *, calendarId: str, body: dict) -> dict:
+        raise HttpError(httplib2.Response({"status": 400}), b"invalid event")
+
+
+class TestCalendarOutbox(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.cache_repo = CalendarCacheRepository(self.manager)
+        self.outbox_repo = CalendarOutboxRepository(self.manager)
+        for target, value in (
+            ("app.integrations.local.calendar.service.calendar_cache_repo", self.cache_repo),
+            ("app.integrations.local.calendar.service.calendar_outbox_repo", self.outbox_repo),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _service(self, fake: FakeCalendarService) -> GoogleCalendarService:
+        return GoogleCalendarService(calendar_id="fake", service=fake)
+
+    def _worker(self, service: GoogleCalendarService, **kwargs) -> CalendarOutboxWorker:
+        return CalendarOutboxWorker(self.outbox_repo, service_factory=lambda _calendar_id: service, **kwargs)
+
+    async def _status(self, event_id: str) -> tuple[str, int]:
+        async with self.manager.reader() as db:
+            cursor = await db.execute("SELECT status, attempts FROM calendar_outbox WHERE event_id = ?", (event_id,))
+            return tuple(await cursor.fetchone())
+
+    def test_reserve_rejects_overlapping_slot(self):
+        async def scenario():
+            await self.manager.init_database()
+            service = self._service(FakeCalendarService())
+            first = await service.reserve_event("A", "", SLOT_START, SLOT_END)
+            overlapping = await service.reserve_event("B", "", SLOT_START + timedelta(minutes=30), SLOT_END)
+            adjacent = await service.reserve_event("C", "", SLOT_END, SLOT_END + timedelta(hours=1))
+            return first, overlapping, adjacent
+
+        first, overlapping, adjacent = asyncio.run(scenario())
+        self.assertIsNotNone(first)
+        self.assertIsNone(overlapping)
+        self.assertIsNotNone(adjacent)
+
+    def test_reserve_rejects_slot_taken_in_cache(self):
+        async def scenario():
+            await self.manager.init_database()
+            fake = FakeCalendarService()
+            fake.add_event("Busy", SLOT_START, SLOT_END, event_id="busy")
+            service = self._service(fake)
+            await service.sync_cache(period_start=SLOT_START - timedelta(days=1), period_end=SLOT_END + timedelta(days=1))
+            return await create_booking_calendar_event(
+                calendar_available=True,
+                calendar_service_factory=lambda: service,
+                title="A",
+                description="",
+                start_time=SLOT_START,
+                end_time=SLOT_END,
+            )
+
+        result = asyncio.run(scenario())
+        self.assertFalse(result.created)
+        self.assertIsInstance(result.error, CalendarSlotTakenError)
+
+    def test_booking_is_confirmed_with_reserved_event_id(self):
+        calendar = SimpleNamespace(reserve_event=AsyncMock(return_value="e1"))
+
+        result = asyncio.run(
+            create_booking_calendar_event(
+                calendar_available=True,
+                calendar_service_factory=lambda: calendar,
+                title="A",
+                description="",
+                start_time=SLOT_START,
+                end_time=SLOT_END,
+                slot_holder="vk:1",
+            )
+        )
+
+        self.assertTrue(result.created)
+        self.assertEqual({"id": "e1", "status": "pending"}, result.payload)
+        self.assertEqual("vk:1", calendar.reserve_event.await_args.kwargs["holder"])
+
+    def test_reservation_is_busy_before_worker_runs(self):
+        async def scenario():
+            await self.manager.init_database()
+            service = self._service(FakeCalendarService())
+            await service.sync_cache(period_start=SLOT_START - timedelta(days=1), period_end=SLOT_END + timedelta(days=1))
+            await service.reserve_event("A", "", SLOT_START, SLOT_END)
+            busy_now = (await service.get_busy_index()).is_busy(SLOT_START, SLOT_END)
+            service._busy_index.loaded = False
+            busy_after_reload = (await service.get_busy_index()).is_busy(SLOT_START, SLOT_END)
+            return busy_now, busy_after_reload
+
+        self.assertEqual((True, True), asyncio.run(scenario()))
+
+    def test_worker_pushes_reservation_and_caches_event(self):
+        async def scenario():
+            await self.manager.init_database()
+            fake = FakeCalendarService()
+            service = self._service(fake)
+            event_id = await service.reserve_event("A", "desc", SLOT_START, SLOT_END)
+            delivered = await self._worker(service).process_due()
+            return event_id, delivered, fake, await self._status(event_id), await self.cache_repo.get_event(event_id)
+
+        event_id, delivered, fake, status, cached = asyncio.run(scenario())
+        self.assertEqual(1, delivered)
+        self.assertEqual((OUTBOX_DONE, 1), status)
+        self.assertEqual("A", fake.events().get(calendarId="fake", eventId=event_id).execute()["summary"])
+        self.assertEqual(event_id, cached["id"])
+
+    def test_retry_after_lost_response_does_not_duplicate_event(self):
+        async def scenario():
+            await self.manager.init_database()
+            fake = _FlakyCalendar(failures=1)
+            service = self._service(fake)
+            event_id = await service.reserve_event("A", "", SLOT_START, SLOT_END)
+            # Zero backoff makes the retry due at once, so one pass delivers it.
+            delivered = await self._worker(service, backoff_base=0, backoff_max=0).process_due()
+            return delivered, await self._status(event_id), fake
+
+        delivered, status, fake = asyncio.run(scenario())
+        self.assertEqual(1, delivered)
+        self.assertEqual((OUTBOX_DONE, 2), status)
+        self.assertEqual(1, len(fake._events))
+
+    def test_exhausted_entry_fails_and_frees_slot(self):
+        async def scenario():
+            await self.manager.init_database()
+            service = self._service(_FlakyCalendar(failures=5))
+            await service.sync_cache(period_start=SLOT_START - timedelta(days=1), period_end=SLOT_END + timedelta(days=1))
+            event_id = await service.reserve_event("A", "", SLOT_START, SLOT_END)
+            await self._worker(service, max_attempts=1).process_due()
+            busy = (await service.get_busy_index()).is_busy(SLOT_START, SLOT_END)
+            retaken = await service.reserve_event("B", "", SLOT_START, SLOT_END)
+            return await self._status(event_id), busy, retaken
+
+        status, busy, retaken = asyncio.run(scenario())
+        self.assertEqual((OUTBOX_FAILED, 1), status)
+        self.assertFalse(busy)
+        self.assertIsNotNone(retaken)
+
+    def test_rejected_confirmed_booking_alerts_admins(self):
+        on_failed = AsyncMock()
+
+        async def scenario():
+            await self.manager.init_database()
+            service = self._service(_RejectingCalendar())
+            event_id = await service.reserve_event("Фотосессия", "Анна, +79990000000", SLOT_START, SLOT_END)
+            await self._worker(service, on_failed=on_failed).process_due()
+            return event_id, await self._status(event_id)
+
+        event_id, status = asyncio.run(scenario())
+        self.assertEqual((OUTBOX_FAILED, 1), status)
+        on_failed.assert_awaited_once()
+        entry, error = on_failed.await_args.args
+        self.assertEqual(
+            (event_id, "Фотосессия", "Анна, +79990000000", SLOT_START),
+            (entry.event_id, entry.title, entry.description, entry.start_time),
+        )
+        self.assertIn("invalid event", error)
+
+    def test_claim_skips_entries_scheduled_for_later(self):
+        async def scenario():
+            await self.manager.init_database()
+            entry = await self.outbox_repo.reserve(
+                event_id="e1",
+                calendar_id="fake",
+                title="A",
+                description="",
+                start_time=SLOT_START,
+                end_time=SLOT_END,
+            )
+            await self.outbox_repo.schedule_retry(entry.id, error="boom", delay_seconds=60)
+            now = datetime.now(timezone.utc)
+            early = await self.outbox_repo.claim_due(now=now)
+            late = await self.outbox_repo.claim_due(now=now + timedelta(minutes=2))
+            requeued = await self.outbox_repo.requeue_processing()
+            return early, late, requeued
+
+        early, late, requeued = asyncio.run(scenario())
+        self.assertEqual([], early)
+        self.assertEqual(["e1"], [entry.event_id for entry in late])
+        self.assertEqual(1, requeued)
+
+
+if __name__ == "__main__":
+    unittest.main()
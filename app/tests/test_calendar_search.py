@@ -0,0 +1,107 @@
+import asyncio
+import shutil
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.integrations.local.calendar.cache_repo import CalendarCacheRepository
+from app.integrations.local.calendar.search import build_match_query, extract_contact_terms
+from app.integrations.local.db.database import DatabaseManager
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+TZ = ZoneInfo("Europe/Moscow")
+PERIOD_START = datetime(2026, 4, 1, tzinfo=TZ)
+PERIOD_END = datetime(2026, 5, 1, tzinfo=TZ)
+
+
+class TestSearchTerms(unittest.TestCase):
+    def test_phones_are_indexed_by_their_last_ten_digits(self):
+        text = "Иван\n+7 999 123 45 67\nTelegram: https://t.me/ivan_photo\nзапасной 8 (912) 000-11-22"
+        self.assertEqual("9991234567 9120001122 ivan_photo", extract_contact_terms(text))
+
+    def test_query_words_become_quoted_prefixes(self):
+        self.assertEqual('"Иван"* "9991234567"*', build_match_query('Иван 89991234567'))
+        self.assertEqual('"OR"* "x"*', build_match_query('OR "x'))
+        self.assertIsNone(build_match_query("  -- "))
+
+
+class TestCalendarCacheSearch(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.repo = CalendarCacheRepository(self.manager)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    async def _upsert(self, event_id: str, day: int, summary: str, description: str, etag: str = "1") -> None:
+        start = datetime(2026, 4, day, 12, 0, tzinfo=TZ)
+        await self.repo.upsert_event(
+            event_id=event_id,
+            calendar_id="cal",
+            summary=summary,
+            description=description,
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            raw_event={"id": event_id, "etag": etag},
+        )
+
+    async def _search(self, query: str) -> list[str]:
+        events = await self.repo.list_events(
+            calendar_id="cal",
+            period_start=PERIOD_START,
+            period_end=PERIOD_END,
+            query=query,
+        )
+        return [event["id"] for event in events]
+
+    def test_prefix_and_phone_search(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._upsert("a", 2, "Фотосессия Петрова", "Петрова Анна\n+7 999 123 45 67")
+            await self._upsert("b", 3, "Белый зал", "Сидоров\n8 (912) 000-11-22")
+            return (
+                await self._search("петр"),
+                await self._search("89120001122"),
+                await self._search("+7 999 123 45 67"),
+                await self._search("петр сидор"),
+            )
+
+        by_name, by_phone, by_display_phone, both = asyncio.run(scenario())
+        self.assertEqual(["a"], by_name)
+        self.assertEqual(["b"], by_phone)
+        self.assertEqual(["a"], by_display_phone)
+        self.assertEqual([], both)
+
+    def test_summary_hits_rank_above_description_hits(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._upsert("early", 2, "Белый зал", "Комментарий: свадьба, много текста " * 5)
+            await self._upsert("late", 20, "Свадьба", "Иванов")
+            return await self._search("свадьба")
+
+        self.assertEqual(["late", "early"], asyncio.run(scenario()))
+
+    def test_index_follows_updates_and_deletes(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._upsert("a", 2, "Черный зал", "")
+            await self._upsert("a", 2, "Белый зал", "", etag="2")
+            renamed = await self._search("черный"), await self._search("белый")
+            await self.repo.delete_event("a")
+            return renamed, await self._search("белый")
+
+        (old_name, new_name), after_delete = asyncio.run(scenario())
+        self.assertEqual([], old_name)
+        self.assertEqual(["a"], new_name)
+        self.assertEqual([], after_delete)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from app.integrations.local.calendar import freebusy
+from app.integrations.local.calendar.service import get_calendar_service
+
+
+class CalendarServiceRegistryTests(unittest.TestCase):
+    def setUp(self):
+        freebusy.reset_calendar_service()
+        self.addCleanup(freebusy.reset_calendar_service)
+
+    def _credentials(self, expires_in: timedelta):
+        creds = MagicMock()
+        creds.token = "token"
+        creds.valid = True
+        creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + expires_in
+        return creds
+
+    def test_client_is_built_once_from_static_discovery(self):
+        creds = self._credentials(timedelta(hours=1))
+        with patch.object(freebusy, "_load_credentials", return_value=creds) as load_credentials:
+            first = freebusy.build_calendar_service()
+            second = freebusy.build_calendar_service()
+
+        self.assertIs(first, second)
+        load_credentials.assert_called_once()
+        self.assertTrue(hasattr(first, "events"))
+        creds.refresh.assert_not_called()
+
+    def test_token_is_refreshed_before_expiry(self):
+        creds = self._credentials(timedelta(seconds=30))
+        with patch.object(freebusy, "_load_credentials", return_value=creds):
+            freebusy.build_calendar_service()
+            freebusy.build_calendar_service()
+
+        creds.refresh.assert_called_once()
+
+    def test_failed_early_refresh_keeps_valid_token(self):
+        creds = self._credentials(timedelta(seconds=30))
+        creds.refresh.side_effect = OSError("network down")
+        with patch.object(freebusy, "_load_credentials", return_value=creds):
+            first = freebusy.build_calendar_service()
+            second = freebusy.build_calendar_service()
+
+        self.assertIs(first, second)
+
+    def test_services_are_shared_per_calendar_id(self):
+        self.assertIs(get_calendar_service("calendar-a"), get_calendar_service("calendar-a"))
+        self.assertIsNot(get_calendar_service("calendar-a"), get_calendar_service("calendar-b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
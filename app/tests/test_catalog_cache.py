@@ -0,0 +1,87 @@
+import asyncio
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.integrations.local.db.catalog import CatalogCache
+from app.integrations.local.db.database import DatabaseManager
+from app.integrations.local.db.models import ExtraService, Service
+from app.integrations.local.db.repositories import ExtraServiceRepository, ServiceRepository
+from app.integrations.local.invalidation import InvalidationEvent, invalidation_bus
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+
+
+class TestCatalogCache(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.service_repo = ServiceRepository(self.manager)
+        self.extra_service_repo = ExtraServiceRepository(self.manager)
+        self.catalog = CatalogCache(self.service_repo, self.extra_service_repo, ttl_seconds=3600)
+        self.catalog.subscribe()
+        self.addCleanup(
+            invalidation_bus.unsubscribe,
+            InvalidationEvent.SERVICE_CHANGED,
+            self.catalog._on_service_changed,
+        )
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_booking_reads_hit_the_database_once(self):
+        async def scenario():
+            await self.manager.init_database()
+            service_id = await self.service_repo.create(Service(name="Zeta", max_num_clients=4))
+            await self.service_repo.create(Service(name="Hidden", is_active=False))
+            await self.extra_service_repo.create(ExtraService(name="Tea", sort_order=2))
+            await self.extra_service_repo.create(ExtraService(name="Cake", sort_order=1))
+            with patch.object(self.service_repo, "get_all", wraps=self.service_repo.get_all) as get_all:
+                service = await self.catalog.get_service(service_id)
+                active = await self.catalog.get_active_services()
+                extras = await self.catalog.get_active_extra_services()
+                await self.catalog.get_service(service_id)
+            return service, active, extras, get_all.call_count
+
+        service, active, extras, loads = asyncio.run(scenario())
+        self.assertEqual("Zeta", service.name)
+        self.assertNotIn("Hidden", [item.name for item in active])
+        names = [item.name for item in extras]
+        self.assertLess(names.index("Cake"), names.index("Tea"))
+        self.assertEqual(1, loads)
+
+    def test_returned_models_are_copies(self):
+        async def scenario():
+            await self.manager.init_database()
+            service_id = await self.service_repo.create(Service(name="Studio"))
+            service = await self.catalog.get_service(service_id)
+            service.name = "Edited locally"
+            return (await self.catalog.get_service(service_id)).name
+
+        self.assertEqual("Studio", asyncio.run(scenario()))
+
+    def test_service_writes_bump_version(self):
+        async def scenario():
+            await self.manager.init_database()
+            service_id = await self.service_repo.create(Service(name="Studio"))
+            await self.catalog.get_service(service_id)
+            version = self.catalog.version
+            service = await self.catalog.get_service(service_id)
+            service.name = "Loft"
+            await self.service_repo.update(service)
+            updated = await self.catalog.get_service(service_id)
+            return version, self.catalog.version, updated.name
+
+        before, after, name = asyncio.run(scenario())
+        self.assertEqual("Loft", name)
+        self.assertGreater(after, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import shutil
+import sqlite3
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.integrations.local.db.database import DatabaseManager
+from app.integrations.local.db.repositories import AdminRepository, ServiceRepository
+from app.integrations.local.db.models import Admin
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+
+
+def _make_temp_dir() -> Path:
+    temp_dir = TEST_TMP_ROOT / uuid4().hex
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    return temp_dir
+
+
+class TestDatabasePool(unittest.TestCase):
+    def setUp(self):
+        self.root = _make_temp_dir()
+        self.manager = DatabaseManager(str(self.root / "test.db"), pool_size=2)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_reader_connections_are_reused_and_configured(self):
+        async def scenario():
+            await self.manager.init_database()
+            async with self.manager.reader() as first:
+                cursor = await first.execute("PRAGMA journal_mode")
+                journal_mode = (await cursor.fetchone())[0]
+                cursor = await first.execute("PRAGMA foreign_keys")
+                foreign_keys = (await cursor.fetchone())[0]
+            async with self.manager.reader() as second:
+                pass
+            return first, second, journal_mode, foreign_keys
+
+        first, second, journal_mode, foreign_keys = asyncio.run(scenario())
+        self.assertIs(first, second)
+        self.assertEqual("wal", journal_mode.lower())
+        self.assertEqual(1, foreign_keys)
+
+    def test_repositories_share_pool(self):
+        async def scenario():
+            await self.manager.init_database()
+            services = await ServiceRepository(self.manager).get_all_active()
+            admins = AdminRepository(self.manager)
+            admin_id = await admins.create(Admin(telegram_id=42))
+            return services, await admins.get_by_telegram_id(42), admin_id
+
+        services, admin, admin_id = asyncio.run(scenario())
+        self.assertTrue(services)
+        self.assertEqual(admin_id, admin.id)
+        self.assertLessEqual(len(self.manager._idle_readers), 2)
+
+    def test_failed_write_is_rolled_back_without_losing_batch_neighbours(self):
+        async def failing(db):
+            await db.execute("INSERT INTO admins (telegram_id) VALUES (7)")
+            raise RuntimeError("boom")
+
+        async def scenario():
+            await self.manager.init_database()
+            results = await asyncio.gather(
+                self.manager.run_write(failing),
+                self.manager.execute_write("INSERT INTO admins (telegram_id) VALUES (8)"),
+                return_exceptions=True,
+            )
+            admins = AdminRepository(self.manager)
+            return results, await admins.get_by_telegram_id(7), await admins.get_by_telegram_id(8)
+
+        results, failed_admin, stored_admin = asyncio.run(scenario())
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertEqual(1, results[1].rowcount)
+        self.assertIsNone(failed_admin)
+        self.assertIsNotNone(stored_admin)
+
+    def test_lock_error_from_other_process_is_retried(self):
+        async def scenario():
+            await self.manager.init_database()
+            blocker = sqlite3.connect(self.manager.db_path, isolation_level=None)
+            blocker.execute("BEGIN IMMEDIATE")
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.2, blocker.execute, "COMMIT")
+            try:
+                return await self.manager.execute_write("INSERT INTO admins (vk_id) VALUES (9)")
+            finally:
+                blocker.close()
+
+        with patch("app.integrations.local.db.database.DATABASE_BUSY_TIMEOUT_MS", 10):
+            self.manager = DatabaseManager(self.manager.db_path, pool_size=2)
+            result = asyncio.run(scenario())
+        self.assertEqual(1, result.rowcount)
+
+if __name__ == "__main__":
+    unittest.main()
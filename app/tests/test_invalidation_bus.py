@@ -0,0 +1,93 @@
+import asyncio
+import json
+import unittest
+
+from app.integrations.local.invalidation import InvalidationBus, InvalidationEvent
+
+
+class _FakePubSub:
+    def __init__(self, messages):
+        self._messages = messages
+        self.closed = False
+
+    async def listen(self):
+        for message in self._messages:
+            yield message
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestInvalidationBus(unittest.TestCase):
+    def test_publish_reaches_local_handlers_without_redis(self):
+        bus = InvalidationBus(channel="test")
+        received = []
+
+        async def on_faq(message):
+            received.append(message)
+
+        bus.subscribe(InvalidationEvent.FAQ_CHANGED, on_faq)
+        bus.subscribe(InvalidationEvent.ADMIN_CHANGED, lambda message: received.append(message))
+
+        asyncio.run(bus.publish(InvalidationEvent.FAQ_CHANGED, 7))
+
+        self.assertFalse(bus.is_distributed)
+        self.assertEqual([(InvalidationEvent.FAQ_CHANGED, "7", bus.origin)],
+                         [(m.event, m.key, m.origin) for m in received])
+
+    def test_failing_handler_does_not_block_others(self):
+        bus = InvalidationBus(channel="test")
+        received = []
+
+        def broken(_message):
+            raise RuntimeError("boom")
+
+        bus.subscribe(InvalidationEvent.SERVICE_CHANGED, broken)
+        bus.subscribe(InvalidationEvent.SERVICE_CHANGED, received.append)
+
+        with self.assertLogs("app.integrations.local.invalidation.bus", level="ERROR"):
+            asyncio.run(bus.publish(InvalidationEvent.SERVICE_CHANGED, "service:1"))
+
+        self.assertEqual(1, len(received))
+
+    def test_listener_dispatches_foreign_messages_only(self):
+        bus = InvalidationBus(channel="test")
+        received = []
+        bus.subscribe(InvalidationEvent.CALENDAR_EVENT_CHANGED, received.append)
+
+        def _raw(origin, key):
+            payload = {"event": "calendar_event_changed", "key": key, "origin": origin}
+            return {"type": "message", "data": json.dumps(payload)}
+
+        pubsub = _FakePubSub([
+            _raw("other-process", "evt-1"),
+            _raw(bus.origin, "evt-2"),
+            {"type": "message", "data": "not json"},
+        ])
+
+        async def scenario():
+            listener = asyncio.create_task(bus._listen(pubsub))
+            await asyncio.sleep(0.01)
+            listener.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await listener
+
+        with self.assertLogs("app.integrations.local.invalidation.bus", level="WARNING"):
+            asyncio.run(scenario())
+
+        self.assertEqual(["evt-1"], [message.key for message in received])
+        self.assertTrue(pubsub.closed)
+
+    def test_connect_falls_back_when_redis_is_unreachable(self):
+        bus = InvalidationBus(channel="test")
+
+        with self.assertLogs("app.integrations.local.invalidation.bus", level="WARNING"):
+            connected = asyncio.run(bus.connect("redis://127.0.0.1:1/0"))
+
+        self.assertFalse(connected)
+        self.assertFalse(bus.is_distributed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import shutil
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+from app.integrations.local.db.database import DatabaseManager
+from app.integrations.local.db.repositories import LeaderLeaseRepository
+from app.integrations.local.leader import LeaderElection
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+NOW = datetime(2026, 4, 10, 12, 0, tzinfo=timezone.utc)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MemoryLeaseStore:
+    """Same rules as the Redis and SQLite stores, on a controllable clock."""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.leases = {}
+
+    async def acquire(self, name, owner, ttl_seconds):
+        current = self.leases.get(name)
+        if current is not None and current[0] != owner and current[1] > self.clock():
+            return False
+        self.leases[name] = (owner, self.clock() + ttl_seconds)
+        return True
+
+    async def release(self, name, owner):
+        if self.leases.get(name, (None,))[0] == owner:
+            del self.leases[name]
+
+
+class TestLeaderLeaseRepository(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        asyncio.run(self.manager.init_database())
+        self.leases = LeaderLeaseRepository(self.manager)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_lease_is_taken_over_only_after_expiry(self):
+        async def scenario():
+            return [
+                await self.leases.acquire("sync", "a", 15, now=NOW),
+                await self.leases.acquire("sync", "b", 15, now=NOW + timedelta(seconds=5)),
+                await self.leases.acquire("sync", "a", 15, now=NOW + timedelta(seconds=10)),
+                await self.leases.acquire("sync", "b", 15, now=NOW + timedelta(seconds=20)),
+                await self.leases.acquire("sync", "b", 15, now=NOW + timedelta(seconds=26)),
+            ]
+
+        self.assertEqual([True, False, True, False, True], asyncio.run(scenario()))
+
+    def test_release_by_other_owner_keeps_lease(self):
+        async def scenario():
+            await self.leases.acquire("sync", "a", 15, now=NOW)
+            await self.leases.release("sync", "b")
+            kept = await self.leases.acquire("sync", "b", 15, now=NOW)
+            await self.leases.release("sync", "a")
+            return kept, await self.leases.acquire("sync", "b", 15, now=NOW)
+
+        self.assertEqual((False, True), asyncio.run(scenario()))
+
+
+class TestLeaderElection(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.store = MemoryLeaseStore(self.clock)
+
+    def _election(self) -> LeaderElection:
+        election = LeaderElection(self.store, ttl_seconds=15, renew_interval_seconds=5, monotonic=self.clock)
+        election.campaign("calendar_cache_sync")
+        return election
+
+    def test_follower_takes_over_after_leader_dies(self):
+        leader, follower = self._election(), self._election()
+        changes = []
+        follower.add_listener(lambda: changes.append(follower.is_leader("calendar_cache_sync")))
+
+        async def scenario():
+            await leader.refresh()
+            await follower.refresh()
+            states = [leader.is_leader("calendar_cache_sync"), follower.is_leader("calendar_cache_sync")]
+            # The leader stops renewing; its lease runs out on both clocks.
+            self.clock.now += 16
+            await follower.refresh()
+            await leader.refresh()
+            states += [leader.is_leader("calendar_cache_sync"), follower.is_leader("calendar_cache_sync")]
+            return states
+
+        self.assertEqual([True, False, False, True], asyncio.run(scenario()))
+        self.assertEqual([True], changes)
+
+    def test_leader_that_cannot_renew_steps_down_before_expiry(self):
+        leader = self._election()
+
+        async def scenario():
+            await leader.refresh()
+            self.clock.now += 14
+            before = leader.is_leader("calendar_cache_sync")
+            self.clock.now += 1
+            return before, leader.is_leader("calendar_cache_sync")
+
+        self.assertEqual((True, False), asyncio.run(scenario()))
+
+    def test_clean_stop_hands_over_at_once(self):
+        leader, follower = self._election(), self._election()
+
+        async def scenario():
+            await leader.start()
+            await follower.refresh()
+            await leader.stop()
+            await follower.refresh()
+            return follower.is_leader("calendar_cache_sync")
+
+        self.assertTrue(asyncio.run(scenario()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import unittest
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from vkbottle import VKAPIError
+
+from app.interfaces.messenger.shared.dispatch import (
+    MessageDispatcher,
+    RetryAdvice,
+    TokenBucket,
+    telegram_retry_advice,
+    vk_retry_advice,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate_limits_after_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, capacity=5, clock=clock, sleep=clock.sleep)
+
+        async def scenario():
+            for _ in range(25):
+                await bucket.acquire()
+
+        asyncio.run(scenario())
+        # 5 tokens of burst, then 20 more at 10 per second.
+        self.assertAlmostEqual(2.0, clock.now, places=6)
+
+    def test_pause_blocks_until_deadline(self):
+        clock = FakeClock()
+        bucket = TokenBucket(100, clock=clock, sleep=clock.sleep)
+
+        async def scenario():
+            await bucket.acquire()
+            bucket.pause(3)
+            await bucket.acquire()
+
+        asyncio.run(scenario())
+        self.assertGreaterEqual(clock.now, 3.0)
+
+
+class TestMessageDispatcher(unittest.TestCase):
+    def _dispatcher(self, clock, **kwargs):
+        return MessageDispatcher(
+            "test",
+            rate=1000,
+            classify=lambda exc: RetryAdvice() if isinstance(exc, ConnectionError) else None,
+            bucket=TokenBucket(1000, clock=clock, sleep=clock.sleep),
+            sleep=clock.sleep,
+            backoff_base=1,
+            **kwargs,
+        )
+
+    def test_retries_transient_errors_and_reports_terminal_ones(self):
+        clock = FakeClock()
+        dispatcher = self._dispatcher(clock, max_attempts=3)
+        calls = {"flaky": 0, "broken": 0}
+
+        async def flaky():
+            calls["flaky"] += 1
+            if calls["flaky"] < 3:
+                raise ConnectionError("reset")
+
+        async def broken():
+            calls["broken"] += 1
+            raise ValueError("blocked by user")
+
+        results = asyncio.run(dispatcher.send_all([("flaky", flaky), ("broken", broken)]))
+
+        by_key = {result.key: result for result in results}
+        self.assertTrue(by_key["flaky"].ok)
+        self.assertEqual(3, by_key["flaky"].attempts)
+        self.assertFalse(by_key["broken"].ok)
+        self.assertEqual(1, calls["broken"])
+        self.assertIsInstance(by_key["broken"].error, ValueError)
+
+    def test_gives_up_after_max_attempts(self):
+        clock = FakeClock()
+        dispatcher = self._dispatcher(clock, max_attempts=2)
+
+        async def always_down():
+            raise ConnectionError("down")
+
+        result = asyncio.run(dispatcher.send("chat", always_down))
+
+        self.assertFalse(result.ok)
+        self.assertEqual(2, result.attempts)
+
+    def test_concurrency_is_bounded(self):
+        dispatcher = MessageDispatcher("test", rate=10_000, classify=lambda exc: None, concurrency=3)
+        active = 0
+        peak = 0
+
+        def job():
+            async def run():
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+            return run
+
+        results = asyncio.run(dispatcher.send_all((index, job()) for index in range(12)))
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(3, peak)
+
+
+class TestPlatformRetryAdvice(unittest.TestCase):
+    def test_telegram_retry_after_throttles_platform(self):
+        exc = TelegramRetryAfter(method=None, message="Flood", retry_after=7)
+        self.assertEqual(RetryAdvice(delay=7, throttle=True), telegram_retry_advice(exc))
+        self.assertIsNone(telegram_retry_advice(TelegramForbiddenError(method=None, message="blocked")))
+
+    def test_vk_flood_errors_are_retried(self):
+        self.assertEqual(RetryAdvice(throttle=True), vk_retry_advice(VKAPIError[9](error_msg="Flood control")))
+        self.assertEqual(RetryAdvice(throttle=True), vk_retry_advice(VKAPIError[6](error_msg="Too many")))
+        self.assertIsNone(vk_retry_advice(VKAPIError[901](error_msg="Can't send")))
+
+
+if __name__ == "__main__":
+    unittest.main()
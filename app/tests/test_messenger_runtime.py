@@ -0,0 +1,228 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from unittest.mock import AsyncMock, Mock, patch
+
+from vkbottle import Bot
+from vkbottle.bot import Message
+
+from app.integrations.local.calendar.outbox_repo import CalendarOutboxEntry
+from app.interfaces.messenger.shared import runtime
+from app.interfaces.messenger.vk.main import _build_state_dispenser, poll_events, vk_bot
+from app.interfaces.messenger.vk.state_dispenser import MemoryStateDispenser
+
+VK_MAIN = "app.interfaces.messenger.vk.main"
+
+
+class MemoryJobStore:
+    def __init__(self):
+        self.runs = {}
+
+    async def get_last_run(self, job_name):
+        return self.runs.get(job_name)
+
+    async def set_last_run(self, job_name, run_at):
+        self.runs[job_name] = run_at
+
+
+def _leader_election(leading: bool) -> Mock:
+    return Mock(
+        is_leader=Mock(return_value=leading),
+        connect=AsyncMock(),
+        start=AsyncMock(),
+        stop=AsyncMock(),
+    )
+
+
+class _Polling:
+    def __init__(self, responses: list[dict]):
+        self.responses = responses
+
+    async def listen(self):
+        for response in self.responses:
+            yield response
+
+
+class TestMessengerRuntime(unittest.TestCase):
+    def test_bots_share_one_sync_and_scheduler(self):
+        resources = {
+            "db_manager": AsyncMock(),
+            "invalidation_bus": AsyncMock(),
+            "admin_notifier": AsyncMock(),
+            "calendar_executor": Mock(),
+            "calendar_outbox_worker": Mock(stop=AsyncMock()),
+            "scheduler_job_repo": MemoryJobStore(),
+            "leader_election": _leader_election(leading=True),
+            "sync_calendar_cache": AsyncMock(return_value=12),
+            "run_calendar_cache_sync": AsyncMock(return_value=0),
+        }
+
+        async def scenario():
+            async with runtime.messenger_runtime("all") as scheduler:
+                async with vk_bot(scheduler):
+                    return sorted(job.name for job in scheduler.jobs)
+
+        with patch.multiple(runtime, **resources), patch(f"{VK_MAIN}.VK_BOT_TOKEN", "test"), patch(
+            f"{VK_MAIN}._build_state_dispenser", AsyncMock(return_value=MemoryStateDispenser())
+        ):
+            job_names = asyncio.run(scenario())
+
+        self.assertEqual(["booking_reminders:vk", "calendar_cache_sync"], job_names)
+        self.assertEqual(
+            ["calendar_cache_sync", "booking_reminders:vk"],
+            [call.args[0] for call in resources["leader_election"].campaign.call_args_list],
+        )
+        resources["sync_calendar_cache"].assert_awaited_once_with(force=True)
+        resources["leader_election"].stop.assert_awaited_once()
+        resources["calendar_outbox_worker"].start.assert_called_once()
+        resources["calendar_outbox_worker"].stop.assert_awaited_once()
+        resources["db_manager"].close.assert_awaited_once()
+        resources["calendar_executor"].shutdown.assert_called_once()
+
+    def test_follower_without_redis_rereads_cache_instead_of_syncing(self):
+        resources = {
+            "db_manager": AsyncMock(),
+            "invalidation_bus": AsyncMock(is_distributed=False),
+            "admin_notifier": AsyncMock(),
+            "calendar_executor": Mock(),
+            "calendar_outbox_worker": Mock(stop=AsyncMock()),
+            "scheduler_job_repo": MemoryJobStore(),
+            "leader_election": _leader_election(leading=False),
+            "sync_calendar_cache": AsyncMock(),
+            "run_calendar_cache_sync": AsyncMock(),
+            "reload_calendar_indexes": AsyncMock(),
+        }
+
+        async def scenario():
+            async with runtime.messenger_runtime("vk"):
+                for _ in range(5):
+                    await asyncio.sleep(0)
+
+        with patch.multiple(runtime, **resources):
+            asyncio.run(scenario())
+
+        resources["sync_calendar_cache"].assert_not_awaited()
+        resources["run_calendar_cache_sync"].assert_not_awaited()
+        resources["reload_calendar_indexes"].assert_awaited_once()
+
+    def test_without_background_jobs_nothing_is_scheduled(self):
+        resources = {
+            "db_manager": AsyncMock(),
+            "invalidation_bus": AsyncMock(),
+            "admin_notifier": AsyncMock(),
+            "calendar_executor": Mock(),
+            "sync_calendar_cache": AsyncMock(),
+        }
+
+        async def scenario():
+            async with runtime.messenger_runtime("vk", background_jobs=False) as scheduler:
+                return scheduler
+
+        with patch.multiple(runtime, **resources):
+            self.assertIsNone(asyncio.run(scenario()))
+        resources["sync_calendar_cache"].assert_not_awaited()
+        resources["db_manager"].close.assert_awaited_once()
+
+    def test_workers_without_redis_refuse_to_start(self):
+        resources = {
+            "db_manager": AsyncMock(),
+            "invalidation_bus": AsyncMock(connect=AsyncMock(return_value=False)),
+            "admin_notifier": AsyncMock(),
+            "calendar_executor": Mock(),
+        }
+
+        async def scenario(require_redis):
+            async with runtime.messenger_runtime("telegram", background_jobs=False, require_redis=require_redis):
+                return True
+
+        with patch.multiple(runtime, **resources):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(scenario(require_redis=True))
+            resources["db_manager"].close.assert_awaited_once()
+            # A single worker keeps running on the in-process bus.
+            self.assertTrue(asyncio.run(scenario(require_redis=False)))
+
+
+class TestFailedBookingAlert(unittest.TestCase):
+    def test_admins_get_title_time_and_description(self):
+        start = datetime(2026, 4, 10, 12, 0, tzinfo=ZoneInfo("Europe/Moscow"))
+        entry = CalendarOutboxEntry(
+            id=1,
+            event_id="e1",
+            calendar_id="cal",
+            title="Фотосессия",
+            description="<b>Кто забронировал</b>\nАнна & Co <3",
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            status="failed",
+            attempts=1,
+        )
+        notifier = AsyncMock()
+
+        with patch.object(runtime, "admin_notifier", notifier):
+            asyncio.run(runtime.alert_admins_about_failed_booking(entry, "HTTP 400"))
+
+        telegram = notifier.notify.await_args.kwargs["telegram"].text
+        vk = notifier.notify.await_args.kwargs["vk"].text
+        for text in (telegram, vk):
+            self.assertIn("Фотосессия", text)
+            self.assertIn("10.04.2026 12:00–13:00", text)
+            self.assertIn("HTTP 400", text)
+        self.assertIn("Анна &amp; Co &lt;3", telegram)
+        self.assertIn("Кто забронировал\nАнна & Co <3", vk)
+
+
+class TestVkStateDispenser(unittest.TestCase):
+    def test_callback_workers_require_redis(self):
+        with patch(f"{VK_MAIN}.REDIS_URL", "redis://127.0.0.1:1/0"):
+            single = asyncio.run(_build_state_dispenser())
+            with self.assertRaises(RuntimeError):
+                asyncio.run(_build_state_dispenser(require_redis=True))
+        self.assertIsInstance(single, MemoryStateDispenser)
+
+
+class TestVkPollEvents(unittest.TestCase):
+    def test_long_poll_updates_reach_handlers_on_current_loop(self):
+        received = []
+        bot = Bot(token="test")
+
+        @bot.on.message()
+        async def _on_message(message: Message) -> None:
+            received.append((message.peer_id, message.text))
+
+        update = {
+            "group_id": 229000001,
+            "type": "message_new",
+            "event_id": "e1",
+            "v": "5.199",
+            "object": {
+                "message": {
+                    "date": 1775800000,
+                    "from_id": 5001,
+                    "id": 121,
+                    "out": 0,
+                    "version": 10002,
+                    "attachments": [],
+                    "conversation_message_id": 78,
+                    "fwd_messages": [],
+                    "important": False,
+                    "is_hidden": False,
+                    "peer_id": 5001,
+                    "random_id": 0,
+                    "text": "Записаться",
+                },
+                "client_info": {"button_actions": ["text"], "keyboard": True, "inline_keyboard": True, "lang_id": 0},
+            },
+        }
+
+        async def scenario():
+            with patch.object(Bot, "polling", _Polling([{"ts": "2", "updates": [update]}])):
+                await poll_events(bot)
+
+        asyncio.run(scenario())
+        self.assertEqual([(5001, "Записаться")], received)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from app.bootstrap.scheduler import MAX_SLEEP_SECONDS, DailyTrigger, IntervalTrigger, Scheduler
+
+
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
+
+
+class MemoryJobStore:
+    def __init__(self, runs=None):
+        self.runs = dict(runs or {})
+
+    async def get_last_run(self, job_name):
+        return self.runs.get(job_name)
+
+    async def set_last_run(self, job_name, run_at):
+        self.runs[job_name] = run_at
+
+
+class Leadership:
+    def __init__(self, leading=()):
+        self.leading = set(leading)
+        self.campaigns = []
+
+    def campaign(self, name):
+        self.campaigns.append(name)
+
+    def is_leader(self, name):
+        return name in self.leading
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _msk(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 3, day, hour, minute, tzinfo=MOSCOW_TZ)
+
+
+class TestTriggers(unittest.TestCase):
+    def test_daily_trigger_fires_once_per_day(self):
+        trigger = DailyTrigger(10, tz=MOSCOW_TZ)
+        self.assertEqual(_msk(14, 10), trigger.next_after(_msk(14, 9, 59)))
+        self.assertEqual(_msk(15, 10), trigger.next_after(_msk(14, 10)))
+        self.assertEqual(_msk(15, 10), trigger.next_after(_msk(14, 10).astimezone(timezone.utc)))
+
+    def test_initial_due_honours_grace_window(self):
+        trigger = DailyTrigger(10, tz=MOSCOW_TZ)
+        self.assertEqual(_msk(14, 10), trigger.initial_due(_msk(14, 10, 30), 3600))
+        self.assertEqual(_msk(15, 10), trigger.initial_due(_msk(14, 10, 30), None))
+        self.assertEqual(_msk(14, 10, 30), IntervalTrigger(60).initial_due(_msk(14, 10, 30), None))
+
+
+class TestScheduler(unittest.TestCase):
+    def _run_pending(self, scheduler: Scheduler):
+        async def scenario():
+            await scheduler.run_pending()
+            tasks = [job.task for job in scheduler.jobs if job.task is not None and not job.task.done()]
+            if tasks:
+                await asyncio.gather(*tasks)
+
+        asyncio.run(scenario())
+
+    def _scheduler(self, clock, store, calls, **job_kwargs):
+        scheduler = Scheduler(store, now=clock)
+
+        async def job():
+            calls.append(clock())
+
+        scheduler.add_job("reminders", job, DailyTrigger(10, tz=MOSCOW_TZ), **job_kwargs)
+        return scheduler
+
+    def test_restart_after_todays_run_does_not_repeat_it(self):
+        clock = Clock(_msk(14, 10, 30))
+        store = MemoryJobStore({"reminders": _msk(14, 10, 0)})
+        calls = []
+
+        self._run_pending(self._scheduler(clock, store, calls, misfire_grace_seconds=3600))
+
+        self.assertEqual([], calls)
+
+    def test_missed_runs_are_coalesced_into_one(self):
+        clock = Clock(_msk(14, 12))
+        store = MemoryJobStore({"reminders": _msk(10, 10)})
+        calls = []
+        scheduler = self._scheduler(clock, store, calls)
+
+        self._run_pending(scheduler)
+        self._run_pending(scheduler)
+
+        self.assertEqual([_msk(14, 12)], calls)
+        self.assertEqual(_msk(14, 12), store.runs["reminders"])
+        self.assertEqual(_msk(15, 10), scheduler.jobs[0].due_at)
+
+    def test_run_missed_beyond_grace_is_skipped(self):
+        clock = Clock(_msk(14, 15))
+        store = MemoryJobStore({"reminders": _msk(13, 10)})
+        calls = []
+        scheduler = self._scheduler(clock, store, calls, misfire_grace_seconds=3600)
+
+        self._run_pending(scheduler)
+
+        self.assertEqual([], calls)
+        self.assertEqual(_msk(15, 10), scheduler.jobs[0].due_at)
+
+    def test_shared_store_prevents_second_process_from_running(self):
+        clock = Clock(_msk(14, 10, 1))
+        store = MemoryJobStore({"reminders": _msk(13, 10)})
+        calls = []
+        first = self._scheduler(clock, store, calls)
+        second = self._scheduler(clock, store, calls)
+
+        async def scenario():
+            await first.run_pending()
+            await second.run_pending()
+            await asyncio.gather(*(job.task for job in first.jobs + second.jobs if job.task is not None))
+
+        asyncio.run(scenario())
+
+        self.assertEqual(1, len(calls))
+
+    def test_failing_job_still_records_its_run(self):
+        clock = Clock(_msk(14, 10))
+        store = MemoryJobStore()
+        scheduler = Scheduler(store, now=clock)
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        scheduler.add_job("sync", broken, IntervalTrigger(300))
+        with self.assertLogs("app.bootstrap.scheduler", level="ERROR"):
+            self._run_pending(scheduler)
+
+        self.assertEqual(_msk(14, 10), store.runs["sync"])
+
+    def test_run_forever_sleeps_until_next_due_job(self):
+        clock = Clock(_msk(14, 9, 59))
+        calls = []
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock.now += timedelta(seconds=seconds)
+            await asyncio.sleep(0)
+
+        scheduler = Scheduler(MemoryJobStore(), now=clock, sleep=fake_sleep)
+
+        async def scenario():
+            second_run = asyncio.Event()
+
+            async def job():
+                calls.append(clock())
+                if len(calls) == 2:
+                    second_run.set()
+
+            scheduler.add_job("sync", job, IntervalTrigger(300))
+            scheduler.start()
+            await asyncio.wait_for(second_run.wait(), timeout=5)
+            await scheduler.stop()
+
+        asyncio.run(scenario())
+
+        self.assertEqual([_msk(14, 9, 59), _msk(14, 10, 4)], calls)
+        self.assertIn(300.0, sleeps)
+
+    def test_only_the_leader_runs_jobs(self):
+        clock = Clock(_msk(14, 10, 1))
+        store = MemoryJobStore({"reminders": _msk(13, 10)})
+        leadership = Leadership()
+        calls = []
+        scheduler = Scheduler(store, leadership=leadership, now=clock)
+
+        async def job():
+            calls.append(clock())
+
+        scheduler.add_job("reminders", job, DailyTrigger(10, tz=MOSCOW_TZ))
+        self._run_pending(scheduler)
+
+        self.assertEqual(["reminders"], leadership.campaigns)
+        self.assertEqual([], calls)
+        self.assertEqual(MAX_SLEEP_SECONDS, scheduler._seconds_until_next())
+
+        leadership.leading.add("reminders")
+        self._run_pending(scheduler)
+
+        self.assertEqual([_msk(14, 10, 1)], calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
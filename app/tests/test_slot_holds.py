@@ -0,0 +1,119 @@
+import asyncio
+import shutil
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.integrations.local.calendar.hold_repo import SlotHoldRepository
+from app.integrations.local.calendar.outbox_repo import CalendarOutboxRepository
+from app.integrations.local.db.database import DatabaseManager
+
+
+TEST_TMP_ROOT = Path(__file__).resolve().parent / "_tmp"
+TEST_TMP_ROOT.mkdir(exist_ok=True)
+TZ = ZoneInfo("Europe/Moscow")
+SLOT_START = datetime(2026, 4, 10, 12, 0, tzinfo=TZ)
+SLOT_END = SLOT_START + timedelta(hours=1)
+
+
+class TestSlotHolds(unittest.TestCase):
+    def setUp(self):
+        self.root = TEST_TMP_ROOT / uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manager = DatabaseManager(str(self.root / "test.db"))
+        self.holds = SlotHoldRepository(self.manager)
+        self.outbox = CalendarOutboxRepository(self.manager)
+
+    def tearDown(self):
+        asyncio.run(self.manager.close())
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _hold(self, holder: str, start: datetime = SLOT_START, end: datetime = SLOT_END, **kwargs):
+        return self.holds.hold(
+            holder=holder,
+            calendar_id="cal",
+            start_time=start,
+            end_time=end,
+            ttl_seconds=kwargs.pop("ttl_seconds", 600),
+            **kwargs,
+        )
+
+    def _reserve(self, event_id: str, holder: str | None = None):
+        return self.outbox.reserve(
+            event_id=event_id,
+            calendar_id="cal",
+            title="A",
+            description="",
+            start_time=SLOT_START,
+            end_time=SLOT_END,
+            holder=holder,
+        )
+
+    def test_second_client_cannot_hold_same_slot(self):
+        async def scenario():
+            await self.manager.init_database()
+            first = await self._hold("telegram:1")
+            rival = await self._hold("vk:2", SLOT_START + timedelta(minutes=30), SLOT_END + timedelta(minutes=30))
+            again = await self._hold("telegram:1")
+            return first, rival, again
+
+        self.assertEqual((True, False, True), asyncio.run(scenario()))
+
+    def test_new_hold_replaces_previous_one(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._hold("telegram:1")
+            await self._hold("telegram:1", SLOT_END, SLOT_END + timedelta(hours=1))
+            return await self._hold("vk:2")
+
+        self.assertTrue(asyncio.run(scenario()))
+
+    def test_expired_and_released_holds_free_the_slot(self):
+        async def scenario():
+            await self.manager.init_database()
+            past = datetime.now(timezone.utc) - timedelta(hours=1)
+            await self._hold("telegram:1", ttl_seconds=60, now=past)
+            after_expiry = await self._hold("vk:2")
+            await self.holds.release("vk:2")
+            after_release = await self._hold("telegram:3")
+            return after_expiry, after_release
+
+        self.assertEqual((True, True), asyncio.run(scenario()))
+
+    def test_hold_blocks_other_reservations_and_is_consumed_by_its_holder(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._hold("telegram:1")
+            rival = await self._reserve("rival", holder="vk:2")
+            own = await self._reserve("own", holder="telegram:1")
+            remaining = await self.holds.list_active(
+                calendar_id="cal",
+                period_start=SLOT_START - timedelta(hours=1),
+                period_end=SLOT_END + timedelta(hours=1),
+            )
+            return rival, own, remaining
+
+        rival, own, remaining = asyncio.run(scenario())
+        self.assertIsNone(rival)
+        self.assertEqual("own", own.event_id)
+        self.assertEqual([], remaining)
+
+    def test_list_active_skips_own_hold(self):
+        async def scenario():
+            await self.manager.init_database()
+            await self._hold("telegram:1")
+            window = dict(calendar_id="cal", period_start=SLOT_START, period_end=SLOT_END)
+            return (
+                await self.holds.list_active(**window, exclude_holder="telegram:1"),
+                await self.holds.list_active(**window, exclude_holder="vk:2"),
+            )
+
+        own, others = asyncio.run(scenario())
+        self.assertEqual([], own)
+        self.assertEqual([(SLOT_START, SLOT_END)], others)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.core.modules.booking.availability import SLOT_HELD_MESSAGE
+from app.core.modules.booking.calendar_event import CalendarCreateResult, CalendarSlotTakenError
+from app.core.modules.booking.finalize_booking import FinalizeBookingResult
+from app.core.modules.booking.presentation import build_booking_summary
+from app.core.modules.booking.use_case import CreateBookingUseCaseResult
+from app.interfaces.messenger.tg.handlers import booking
+from app.interfaces.messenger.tg.states import BookingStates
+
+
+BOOKING_DATA = {
+    "service_id": 3,
+    "service_name": "Зал",
+    "date": "2026-04-10",
+    "time": "12:00 - 13:00",
+    "duration": 60,
+    "name": "Анна",
+    "last_name": "Петрова",
+    "phone": "+7 999 123 45 67",
+    "guests_count": 2,
+}
+
+
+def _use_case_result(calendar_result: CalendarCreateResult) -> CreateBookingUseCaseResult:
+    summary = build_booking_summary(
+        booking_data=BOOKING_DATA,
+        service_name="Зал",
+        service_id=3,
+        date_display="10.04.2026",
+        time_range="12:00 - 13:00",
+        duration_minutes=60,
+    )
+    return CreateBookingUseCaseResult(
+        summary=summary,
+        finalize_result=FinalizeBookingResult(summary=summary, calendar_result=calendar_result),
+        admin_notification=Mock(),
+    )
+
+
+class TestConfirmBooking(unittest.TestCase):
+    def _confirm(self, calendar_result: CalendarCreateResult):
+        storage = MemoryStorage()
+        state = FSMContext(storage, StorageKey(bot_id=1, chat_id=1001, user_id=1001))
+        callback = SimpleNamespace(
+            data="booking_confirm_3",
+            from_user=SimpleNamespace(id=1001, username="anna"),
+            answer=AsyncMock(),
+            message=SimpleNamespace(edit_text=AsyncMock(), answer=AsyncMock()),
+            bot=Mock(),
+        )
+        notifier = Mock()
+        release = AsyncMock()
+
+        async def scenario():
+            await state.set_state(BookingStates.filling_form)
+            await state.update_data(booking_data=dict(BOOKING_DATA))
+            with patch.multiple(
+                booking,
+                CALENDAR_AVAILABLE=True,
+                GoogleCalendarService=Mock(),
+                get_calendar_service=Mock(),
+                catalog=Mock(get_service=AsyncMock(return_value=None)),
+                _is_booking_available=AsyncMock(return_value=(True, None)),
+                create_booking_use_case=AsyncMock(return_value=_use_case_result(calendar_result)),
+                build_telegram_confirmation_text=Mock(return_value="ok"),
+                release_booking_slot=release,
+                admin_notifier=notifier,
+            ):
+                await booking.confirm_booking(callback, state)
+            return await state.get_state()
+
+        return asyncio.run(scenario()), callback, notifier, release
+
+    def test_lost_slot_race_keeps_form_and_skips_confirmation(self):
+        taken = CalendarCreateResult(created=False, error=CalendarSlotTakenError("занято"))
+
+        current_state, callback, notifier, release = self._confirm(taken)
+
+        self.assertEqual(BookingStates.filling_form.state, current_state)
+        callback.answer.assert_awaited_once_with(SLOT_HELD_MESSAGE, show_alert=True)
+        callback.message.edit_text.assert_not_awaited()
+        notifier.notify_in_background.assert_not_called()
+        release.assert_awaited_once_with("telegram:1001")
+
+    def test_reserved_slot_is_confirmed(self):
+        reserved = CalendarCreateResult(created=True, payload={"id": "e1", "status": "pending"})
+
+        current_state, callback, notifier, release = self._confirm(reserved)
+
+        self.assertIsNone(current_state)
+        callback.message.edit_text.assert_awaited_once()
+        notifier.notify_in_background.assert_called_once()
+        release.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import unittest
+from datetime import date, time
+from unittest.mock import patch
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.interfaces.messenger.tg.middlewares.state_batch import StateBatchMiddleware
+from app.interfaces.messenger.tg.state_storage import (
+    BufferedFSMContext,
+    build_state_storage,
+    dumps_state_data,
+    loads_state_data,
+)
+
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+UNREACHABLE_REDIS = "redis://127.0.0.1:1/0"
+
+
+class _Form(StatesGroup):
+    filling = State()
+
+
+class TestStateDataCodec(unittest.TestCase):
+    def test_time_slots_survive_json(self):
+        data = {
+            "time_slots": [{"start_time": time(10, 0), "end_time": time(11, 30), "is_available": True}],
+            "booking_data": {"date": "2026-04-10", "day": date(2026, 4, 10)},
+        }
+        self.assertEqual(data, loads_state_data(dumps_state_data(data)))
+
+
+class TestBuildStateStorage(unittest.TestCase):
+    def test_single_worker_falls_back_to_memory(self):
+        storage = asyncio.run(build_state_storage(UNREACHABLE_REDIS, "tg", 60))
+        self.assertIsInstance(storage, MemoryStorage)
+
+    def test_shared_storage_requires_redis(self):
+        with self.assertRaises(RuntimeError):
+            asyncio.run(build_state_storage(UNREACHABLE_REDIS, "tg", 60, require_redis=True))
+
+
+class TestBufferedFSMContext(unittest.TestCase):
+    def test_changes_are_written_once_on_flush(self):
+        async def scenario():
+            storage = MemoryStorage()
+            await storage.set_data(key=KEY, data={"service_id": 3})
+            with patch.object(storage, "get_data", wraps=storage.get_data) as get_data, patch.object(
+                storage, "set_data", wraps=storage.set_data
+            ) as set_data:
+                state = BufferedFSMContext(storage, KEY, raw_state=None)
+                await state.update_data(booking_data={"date": "2026-04-10"})
+                data = await state.get_data()
+                await state.update_data(time_slots=[], service_id=data["service_id"] + 1)
+                await state.set_state(_Form.filling)
+                before_flush = await storage.get_data(key=KEY)
+                await state.flush()
+                await state.flush()
+                return get_data.call_count, set_data.call_count, before_flush, storage
+
+        reads, writes, before_flush, storage = asyncio.run(scenario())
+        # One read by the context plus the one made by the test before flushing.
+        self.assertEqual(2, reads)
+        self.assertEqual(1, writes)
+        self.assertEqual({"service_id": 3}, before_flush)
+        stored = asyncio.run(storage.get_data(key=KEY))
+        self.assertEqual({"service_id": 4, "booking_data": {"date": "2026-04-10"}, "time_slots": []}, stored)
+        self.assertEqual(_Form.filling.state, asyncio.run(storage.get_state(key=KEY)))
+
+    def test_clear_resets_state_and_data(self):
+        async def scenario():
+            storage = MemoryStorage()
+            await storage.set_state(key=KEY, state=_Form.filling)
+            await storage.set_data(key=KEY, data={"service_id": 3})
+            state = BufferedFSMContext(storage, KEY)
+            await state.clear()
+            await state.flush()
+            return await storage.get_state(key=KEY), await storage.get_data(key=KEY)
+
+        self.assertEqual((None, {}), asyncio.run(scenario()))
+
+
+class TestStateBatchMiddleware(unittest.TestCase):
+    def test_handler_state_is_flushed_even_when_it_fails(self):
+        async def handler(event, data):
+            await data["state"].update_data(step=data["raw_state"])
+            raise RuntimeError("boom")
+
+        async def scenario():
+            storage = MemoryStorage()
+            data = {"state": FSMContext(storage, KEY), "raw_state": "form"}
+            with self.assertRaises(RuntimeError):
+                await StateBatchMiddleware()(handler, object(), data)
+            return data["state"], await storage.get_data(key=KEY)
+
+        state, stored = asyncio.run(scenario())
+        self.assertIsInstance(state, BufferedFSMContext)
+        self.assertEqual({"step": "form"}, stored)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import unittest
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message
+
+from app.interfaces.messenger.tg.webhook import SECRET_HEADER, TelegramWebhookHandler
+
+
+# As recorded from a real webhook delivery.
+RECORDED_UPDATE = {
+    "update_id": 700001,
+    "message": {
+        "message_id": 15,
+        "date": 1775800000,
+        "chat": {"id": 1001, "type": "private", "first_name": "Anna"},
+        "from": {"id": 1001, "is_bot": False, "first_name": "Anna"},
+        "text": "/start",
+    },
+}
+
+
+class _Request:
+    def __init__(self, payload, headers: dict | None = None):
+        self.headers = headers or {}
+        self._payload = payload
+
+    async def json(self) -> dict:
+        if isinstance(self._payload, bytes):
+            return json.loads(self._payload)
+        return self._payload
+
+
+def _dispatcher(received: list) -> Dispatcher:
+    router = Router()
+
+    @router.message()
+    async def _on_message(message: Message) -> None:
+        received.append((message.chat.id, message.text))
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+class TestTelegramWebhookHandler(unittest.TestCase):
+    def setUp(self):
+        self.bot = Bot(token="42:TEST")
+
+    def tearDown(self):
+        asyncio.run(self.bot.session.close())
+
+    def test_recorded_update_reaches_dispatcher(self):
+        received = []
+        handler = TelegramWebhookHandler(self.bot, _dispatcher(received), secret=None, handle_in_background=False)
+
+        response = asyncio.run(handler.handle(_Request(RECORDED_UPDATE)))
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([(1001, "/start")], received)
+
+    def test_wrong_secret_is_rejected(self):
+        received = []
+        handler = TelegramWebhookHandler(self.bot, _dispatcher(received), secret="s3cret", handle_in_background=False)
+
+        async def scenario():
+            rejected = await handler.handle(_Request(RECORDED_UPDATE, {SECRET_HEADER: "nope"}))
+            accepted = await handler.handle(_Request(RECORDED_UPDATE, {SECRET_HEADER: "s3cret"}))
+            return rejected.status_code, accepted.status_code
+
+        self.assertEqual((403, 200), asyncio.run(scenario()))
+        self.assertEqual(1, len(received))
+
+    def test_malformed_update_is_rejected(self):
+        received = []
+        handler = TelegramWebhookHandler(self.bot, _dispatcher(received), secret=None, handle_in_background=False)
+
+        async def scenario():
+            not_json = await handler.handle(_Request(b"{not json"))
+            no_update_id = await handler.handle(_Request({"message": RECORDED_UPDATE["message"]}))
+            return not_json.status_code, no_update_id.status_code
+
+        self.assertEqual((400, 400), asyncio.run(scenario()))
+        self.assertEqual([], received)
+
+    def test_background_updates_are_drained_on_close(self):
+        received = []
+        handler = TelegramWebhookHandler(self.bot, _dispatcher(received), secret=None)
+
+        async def scenario():
+            response = await handler.handle(_Request(RECORDED_UPDATE))
+            await handler.close()
+            return response.status_code
+
+        self.assertEqual(200, asyncio.run(scenario()))
+        self.assertEqual([(1001, "/start")], received)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from vkbottle import Bot
+from vkbottle.bot import Message
+
+from app.core.modules.booking.availability import SLOT_HELD_MESSAGE
+from app.core.modules.booking.calendar_event import CalendarCreateResult, CalendarSlotTakenError
+from app.core.modules.booking.finalize_booking import FinalizeBookingResult
+from app.core.modules.booking.presentation import build_booking_summary
+from app.core.modules.booking.use_case import CreateBookingUseCaseResult
+from app.interfaces.messenger.vk.handlers import booking
+from app.interfaces.messenger.vk.state_dispenser import MemoryStateDispenser
+
+
+PEER_ID = 5001
+BOOKING_DATA = {
+    "service_id": 3,
+    "service_name": "Зал",
+    "date": "2026-04-10",
+    "time": "12:00 - 13:00",
+    "duration": 60,
+    "name": "Борис",
+    "last_name": "Петров",
+    "phone": "9121234567",
+    "guests_count": 2,
+}
+
+
+def _confirm_event() -> dict:
+    return {
+        "group_id": 229000001,
+        "type": "message_new",
+        "event_id": "e-confirm",
+        "v": "5.199",
+        "object": {
+            "message": {
+                "date": 1775800000,
+                "from_id": PEER_ID,
+                "id": 130,
+                "out": 0,
+                "version": 10003,
+                "attachments": [],
+                "conversation_message_id": 80,
+                "fwd_messages": [],
+                "important": False,
+                "is_hidden": False,
+                "peer_id": PEER_ID,
+                "random_id": 0,
+                "text": "✅ Подтвердить",
+                "payload": json.dumps({"a": "bk_confirm"}),
+            },
+            "client_info": {"button_actions": ["text"], "keyboard": True, "inline_keyboard": True, "lang_id": 0},
+        },
+    }
+
+
+def _use_case_result(calendar_result: CalendarCreateResult) -> CreateBookingUseCaseResult:
+    summary = build_booking_summary(
+        booking_data=BOOKING_DATA,
+        service_name="Зал",
+        service_id=3,
+        date_display="10.04.2026",
+        time_range="12:00 - 13:00",
+        duration_minutes=60,
+    )
+    return CreateBookingUseCaseResult(
+        summary=summary,
+        finalize_result=FinalizeBookingResult(summary=summary, calendar_result=calendar_result),
+        admin_notification=Mock(),
+    )
+
+
+class TestBookingConfirm(unittest.TestCase):
+    def _confirm(self, calendar_result: CalendarCreateResult):
+        bot = Bot(token="test", state_dispenser=MemoryStateDispenser())
+        booking.register_booking_handlers(bot)
+        answer = AsyncMock()
+        notifier = Mock()
+        release = AsyncMock()
+
+        async def scenario():
+            await bot.state_dispenser.set(
+                PEER_ID,
+                booking.VkBookingState.filling_form,
+                booking_data=dict(BOOKING_DATA),
+            )
+            with patch.object(Message, "answer", answer), patch.multiple(
+                booking,
+                CALENDAR_AVAILABLE=True,
+                get_calendar_service=Mock(),
+                catalog=Mock(get_service=AsyncMock(return_value=None)),
+                svc_is_booking_available=AsyncMock(return_value=(True, None)),
+                create_booking_use_case=AsyncMock(return_value=_use_case_result(calendar_result)),
+                is_vk_admin_id=AsyncMock(return_value=False),
+                release_booking_slot=release,
+                admin_notifier=notifier,
+            ):
+                await bot.process_event(_confirm_event())
+            return await bot.state_dispenser.get(PEER_ID)
+
+        return asyncio.run(scenario()), answer, notifier, release
+
+    def test_lost_slot_race_keeps_form_and_skips_confirmation(self):
+        taken = CalendarCreateResult(created=False, error=CalendarSlotTakenError("занято"))
+
+        state_peer, answer, notifier, release = self._confirm(taken)
+
+        self.assertIsNotNone(state_peer)
+        self.assertEqual(BOOKING_DATA, state_peer.payload["booking_data"])
+        self.assertEqual(1, answer.await_count)
+        self.assertIn(SLOT_HELD_MESSAGE, answer.await_args.args[0])
+        notifier.notify_in_background.assert_not_called()
+        release.assert_awaited_once_with(f"vk:{PEER_ID}")
+
+    def test_reserved_slot_is_confirmed(self):
+        reserved = CalendarCreateResult(created=True, payload={"id": "e1", "status": "pending"})
+
+        state_peer, answer, notifier, release = self._confirm(reserved)
+
+        self.assertIsNone(state_peer)
+        notifier.notify_in_background.assert_called_once()
+        release.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
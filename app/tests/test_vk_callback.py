@@ -0,0 +1,129 @@
+import asyncio
+import json
+import unittest
+
+from vkbottle import Bot
+from vkbottle.bot import Message
+
+from app.interfaces.messenger.vk.callback import VkCallbackHandler
+
+
+# As recorded from a real Callback API delivery.
+RECORDED_EVENT = {
+    "group_id": 229000001,
+    "type": "message_new",
+    "event_id": "4f1c0b6d2a9e7f31c8e5d0a4b3c2e1f0a9b8c7d6",
+    "v": "5.199",
+    "object": {
+        "message": {
+            "date": 1775800000,
+            "from_id": 5001,
+            "id": 120,
+            "out": 0,
+            "version": 10001,
+            "attachments": [],
+            "conversation_message_id": 77,
+            "fwd_messages": [],
+            "important": False,
+            "is_hidden": False,
+            "peer_id": 5001,
+            "random_id": 0,
+            "text": "Начать",
+        },
+        "client_info": {
+            "button_actions": ["text", "callback"],
+            "keyboard": True,
+            "inline_keyboard": True,
+            "carousel": True,
+            "lang_id": 0,
+        },
+    },
+    "secret": "s3cret",
+}
+
+
+class _Request:
+    def __init__(self, payload):
+        self.headers = {}
+        self._payload = payload
+
+    async def json(self):
+        if isinstance(self._payload, bytes):
+            return json.loads(self._payload)
+        return dict(self._payload)
+
+
+def _bot(received: list) -> Bot:
+    bot = Bot(token="test")
+
+    @bot.on.message()
+    async def _on_message(message: Message) -> None:
+        received.append((message.peer_id, message.text))
+
+    return bot
+
+
+def _handler(received: list, **kwargs) -> VkCallbackHandler:
+    kwargs.setdefault("confirmation", "a1b2c3d4")
+    kwargs.setdefault("secret", "s3cret")
+    kwargs.setdefault("group_id", 229000001)
+    return VkCallbackHandler(_bot(received), **kwargs)
+
+
+class TestVkCallbackHandler(unittest.TestCase):
+    def test_confirmation_returns_code(self):
+        handler = _handler([])
+
+        response = asyncio.run(handler.handle(_Request({"type": "confirmation", "group_id": 229000001})))
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(b"a1b2c3d4", response.body)
+
+    def test_recorded_event_reaches_handlers(self):
+        received = []
+        handler = _handler(received, handle_in_background=False)
+
+        response = asyncio.run(handler.handle(_Request(RECORDED_EVENT)))
+
+        self.assertEqual(b"ok", response.body)
+        self.assertEqual([(5001, "Начать")], received)
+
+    def test_wrong_secret_or_group_is_rejected(self):
+        received = []
+        handler = _handler(received, handle_in_background=False)
+
+        async def scenario():
+            wrong_secret = await handler.handle(_Request({**RECORDED_EVENT, "secret": "nope"}))
+            wrong_group = await handler.handle(_Request({**RECORDED_EVENT, "group_id": 1}))
+            return wrong_secret.status_code, wrong_group.status_code
+
+        self.assertEqual((403, 403), asyncio.run(scenario()))
+        self.assertEqual([], received)
+
+    def test_malformed_body_is_rejected(self):
+        received = []
+        handler = _handler(received, handle_in_background=False)
+
+        async def scenario():
+            not_json = await handler.handle(_Request(b"{not json"))
+            not_object = await handler.handle(_Request(b"[1, 2]"))
+            return not_json.status_code, not_object.status_code
+
+        self.assertEqual((400, 400), asyncio.run(scenario()))
+        self.assertEqual([], received)
+
+    def test_background_events_are_drained_on_close(self):
+        received = []
+        handler = _handler(received)
+
+        async def scenario():
+            response = await handler.handle(_Request(RECORDED_EVENT))
+            await handler.close()
+            return response.body
+
+        self.assertEqual(b"ok", asyncio.run(scenario()))
+        self.assertEqual([(5001, "Начать")], received)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,27 @@ VK_BOT_PREFIX = os.getenv("VK_BOT_PREFIX", "/")
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 VK_REDIS_KEY_PREFIX = os.getenv("VK_REDIS_KEY_PREFIX", "rona:vk:state")
 VK_REDIS_STATE_TTL_SECONDS = int(os.getenv("VK_REDIS_STATE_TTL_SECONDS", "86400"))
+TG_REDIS_KEY_PREFIX = os.getenv("TG_REDIS_KEY_PREFIX", "rona:tg:fsm")
+TG_REDIS_STATE_TTL_SECONDS = int(os.getenv("TG_REDIS_STATE_TTL_SECONDS", "86400"))
+TG_UPDATE_MODE = os.getenv("TG_UPDATE_MODE", "polling").strip().lower()
+TG_WEBHOOK_URL = os.getenv("TG_WEBHOOK_URL")
+TG_WEBHOOK_PATH = os.getenv("TG_WEBHOOK_PATH", "/tg/webhook")
+TG_WEBHOOK_SECRET = os.getenv("TG_WEBHOOK_SECRET")
+TG_WEBHOOK_HOST = os.getenv("TG_WEBHOOK_HOST", "0.0.0.0")
+TG_WEBHOOK_PORT = int(os.getenv("TG_WEBHOOK_PORT", "8080"))
+TG_WEBHOOK_WORKERS = int(os.getenv("TG_WEBHOOK_WORKERS", "1"))
+VK_UPDATE_MODE = os.getenv("VK_UPDATE_MODE", "longpoll").strip().lower()
+VK_CALLBACK_PATH = os.getenv("VK_CALLBACK_PATH", "/vk/callback")
+VK_CALLBACK_CONFIRMATION = os.getenv("VK_CALLBACK_CONFIRMATION")
+VK_CALLBACK_SECRET = os.getenv("VK_CALLBACK_SECRET")
+VK_CALLBACK_HOST = os.getenv("VK_CALLBACK_HOST", "0.0.0.0")
+VK_CALLBACK_PORT = int(os.getenv("VK_CALLBACK_PORT", "8081"))
+VK_CALLBACK_WORKERS = int(os.getenv("VK_CALLBACK_WORKERS", "1"))
+BOTS_RUN_MODE = os.getenv("BOTS_RUN_MODE", "processes").strip().lower()
+INVALIDATION_CHANNEL = os.getenv("INVALIDATION_CHANNEL", "rona:invalidation")
+LEADER_KEY_PREFIX = os.getenv("LEADER_KEY_PREFIX", "rona:leader")
+LEADER_LEASE_TTL_SECONDS = float(os.getenv("LEADER_LEASE_TTL_SECONDS", "15"))
+LEADER_RENEW_INTERVAL_SECONDS = float(os.getenv("LEADER_RENEW_INTERVAL_SECONDS", "5"))
 
 GOOGLE_CALENDAR_ID = os.getenv("GOOGLE_CALENDAR_ID")
 GOOGLE_CREDENTIALS_FILE = os.getenv(
@@ -23,14 +44,30 @@ GOOGLE_TOKEN_FILE = os.getenv(
 )
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///photostudio.db")
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "4"))
+DATABASE_BUSY_TIMEOUT_MS = int(os.getenv("DATABASE_BUSY_TIMEOUT_MS", "5000"))
 
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin")
 
 ADMIN_IDS_TG = os.getenv("ADMIN_IDS_TG", "")
 ADMIN_IDS_VK = os.getenv("ADMIN_IDS_VK", "")
+ADMIN_DIRECTORY_TTL_SECONDS = int(os.getenv("ADMIN_DIRECTORY_TTL_SECONDS", "300"))
+CATALOG_TTL_SECONDS = int(os.getenv("CATALOG_TTL_SECONDS", "300"))
 
 REMINDER_HOUR_MSK = int(os.getenv("REMINDER_HOUR_MSK", "10"))
+TELEGRAM_SEND_RATE_PER_SECOND = float(os.getenv("TELEGRAM_SEND_RATE_PER_SECOND", "25"))
+VK_SEND_RATE_PER_SECOND = float(os.getenv("VK_SEND_RATE_PER_SECOND", "15"))
+MESSAGE_DISPATCH_CONCURRENCY = int(os.getenv("MESSAGE_DISPATCH_CONCURRENCY", "16"))
+MESSAGE_DISPATCH_MAX_ATTEMPTS = int(os.getenv("MESSAGE_DISPATCH_MAX_ATTEMPTS", "4"))
 CALENDAR_CACHE_SYNC_INTERVAL_SECONDS = int(os.getenv("CALENDAR_CACHE_SYNC_INTERVAL_SECONDS", "300"))
+CALENDAR_CACHE_SYNC_JITTER_SECONDS = float(os.getenv("CALENDAR_CACHE_SYNC_JITTER_SECONDS", "30"))
+CALENDAR_FULL_SYNC_INTERVAL_SECONDS = int(os.getenv("CALENDAR_FULL_SYNC_INTERVAL_SECONDS", "86400"))
 CALENDAR_CACHE_PAST_DAYS = int(os.getenv("CALENDAR_CACHE_PAST_DAYS", "180"))
 CALENDAR_CACHE_FUTURE_DAYS = int(os.getenv("CALENDAR_CACHE_FUTURE_DAYS", "365"))
+CALENDAR_EXECUTOR_WORKERS = int(os.getenv("CALENDAR_EXECUTOR_WORKERS", "4"))
+CALENDAR_CALL_TIMEOUT_SECONDS = float(os.getenv("CALENDAR_CALL_TIMEOUT_SECONDS", "20"))
+GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+CALENDAR_OUTBOX_POLL_SECONDS = float(os.getenv("CALENDAR_OUTBOX_POLL_SECONDS", "5"))
+CALENDAR_OUTBOX_MAX_ATTEMPTS = int(os.getenv("CALENDAR_OUTBOX_MAX_ATTEMPTS", "8"))
+SLOT_HOLD_TTL_SECONDS = int(os.getenv("SLOT_HOLD_TTL_SECONDS", "900"))